@@ -0,0 +1,44 @@
+"""
+Monte Carlo de campañas de liquidación: tiempo de simular todas las campañas
+sobre todos los excedentes, frente a la matriz escenarios x SKUs directa.
+Uso (desde la raíz del repositorio): python -m benchmarks.bench_campanas
+"""
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_generador import medir
+from nexus.campanas import CAMPANAS, CHOQUE_DEMANDA, ELASTICIDAD, HORIZONTE_MESES, N_ESCENARIOS, precio_campana, simular_campanas
+from nexus.generador import generar_catalogo
+
+TAMANOS = [100_000, 500_000, 1_000_000]
+N_MATRIZ = 100_000  # La matriz directa solo se mide en el tamaño chico
+
+
+def simular_matriz(df, n_escenarios, rng):
+    """Referencia: unidades por (escenario, SKU) en una sola matriz."""
+    categorias = pd.Categorical(df['Categoria']).remove_unused_categories()
+    elasticidad = np.clip(rng.normal(*ELASTICIDAD, size=(n_escenarios, len(categorias.categories))), 0.1, None)
+    choque = rng.normal(0.0, CHOQUE_DEMANDA, n_escenarios)
+    costo, precio = df['Costo'].to_numpy(float), df['Precio'].to_numpy(float)
+    totales = {}
+    for campana in CAMPANAS:
+        promo = precio_campana(costo, precio, campana)
+        lift = np.exp(elasticidad[:, categorias.codes] * np.log(precio / promo) + choque[:, None])
+        unidades = np.minimum(df['Stock'].to_numpy(float), df['Demanda_Mes'].to_numpy(float) * HORIZONTE_MESES * lift)
+        totales[campana] = unidades @ promo
+    return totales
+
+
+if __name__ == "__main__":
+    print(f"{'SKUs':>10} | {'excedentes':>10} | {'agrupado (s)':>12} | {'matriz (s)':>10} | {'error máx':>9}")
+    for n in TAMANOS:
+        df = generar_catalogo(n, rng=np.random.default_rng(42))
+        excedentes = df[df['Estado'] == "🔵 Excedente"]
+        t_agrupado = medir(lambda: simular_campanas(excedentes, rng=np.random.default_rng(0)))
+        t_matriz, error = float('nan'), float('nan')
+        if n <= N_MATRIZ:
+            t_matriz = medir(lambda: simular_matriz(excedentes, N_ESCENARIOS, np.random.default_rng(0)), repeticiones=1)
+            sim = simular_campanas(excedentes, rng=np.random.default_rng(0))
+            ref = simular_matriz(excedentes, N_ESCENARIOS, np.random.default_rng(0))
+            error = max(np.abs(sim['campanas'][c]['Caja'].sum(axis=1) / ref[c] - 1).max() for c in CAMPANAS)
+        print(f"{n:>10,} | {len(excedentes):>10,} | {t_agrupado:>12.3f} | {t_matriz:>10.2f} | {error:>9.2e}")
@@ -0,0 +1,27 @@
+"""
+Reclasificación de estado de inventario tras un cambio de umbrales.
+Uso (desde la raíz del repositorio): python -m benchmarks.bench_clasificador
+"""
+import numpy as np
+
+from benchmarks.bench_generador import medir
+from nexus.clasificador import clasificar_abc, clasificar_estado, cobertura_logistica
+from nexus.compacto import compactar_catalogo
+from nexus.generador import generar_catalogo
+
+N_SKUS = 1_000_000
+UMBRALES_CATEGORIA = {
+    'Construcción': {'riesgo': 15, 'excedente': 90},
+    'Herramientas': {'excedente': 180},
+}
+
+if __name__ == "__main__":
+    df = compactar_catalogo(generar_catalogo(N_SKUS, rng=np.random.default_rng(42)))
+    stock, demanda = df['Stock'].to_numpy(), df['Demanda_Mes'].to_numpy()
+    dias = df['Dias_Inventario'].to_numpy()
+
+    print(f"Reclasificación de {N_SKUS:,} SKUs")
+    print(f"  umbrales globales      : {medir(lambda: clasificar_estado(stock, demanda, dias=dias, umbrales={'riesgo': 20})) * 1000:.1f} ms")
+    print(f"  umbrales por categoría : {medir(lambda: clasificar_estado(stock, demanda, df['Categoria'], dias=dias, umbrales_categoria=UMBRALES_CATEGORIA)) * 1000:.1f} ms")
+    print(f"  cobertura logística    : {medir(lambda: cobertura_logistica(stock, demanda)) * 1000:.1f} ms")
+    print(f"  segmento ABC           : {medir(lambda: clasificar_abc(demanda * df['Costo'].to_numpy())) * 1000:.1f} ms")
@@ -0,0 +1,33 @@
+"""
+Memoria y tiempos de filtrado del catálogo compacto vs. el original.
+Uso (desde la raíz del repositorio): python -m benchmarks.bench_compacto
+"""
+import numpy as np
+
+from benchmarks.bench_generador import medir
+from nexus.compacto import compactar_catalogo, filtrar_catalogo, reporte_memoria
+from nexus.generador import generar_catalogo
+
+N_SKUS = 1_000_000
+FILTRO_CAT = ['Acabados', 'Plomería']
+FILTRO_PROV = ['MegaTools']
+
+
+def filtrar_original(df):
+    """Filtro tal como lo hacía la página: copia completa + isin sobre texto."""
+    df = df.copy()
+    df = df[df['Categoria'].isin(FILTRO_CAT)]
+    return df[df['Proveedor'].isin(FILTRO_PROV)]
+
+
+if __name__ == "__main__":
+    crudo = generar_catalogo(N_SKUS, rng=np.random.default_rng(42))
+    compacto = compactar_catalogo(crudo)
+
+    print(f"Bytes por SKU ({N_SKUS:,} SKUs)")
+    print(reporte_memoria(crudo, compacto).to_string())
+    print()
+    print(f"Filtro original   : {medir(lambda: filtrar_original(crudo)):.3f} s")
+    print(f"Filtro por códigos: {medir(lambda: filtrar_catalogo(compacto, FILTRO_CAT, FILTRO_PROV)):.3f} s")
+    print(f"groupby original  : {medir(lambda: crudo.groupby('Categoria')['Valor_Inventario'].sum()):.3f} s")
+    print(f"groupby códigos   : {medir(lambda: compacto.groupby('Categoria', observed=True)['Valor_Inventario'].sum()):.3f} s")
@@ -0,0 +1,25 @@
+"""
+Consolidación de traslados en camiones por carril: tiempo del empaque FFD y
+camiones usados frente a la cota inferior (peso del carril / capacidad) y
+frente a un documento por línea.
+Uso (desde la raíz del repositorio): python -m benchmarks.bench_consolidacion
+"""
+import numpy as np
+
+from benchmarks.bench_generador import medir
+from nexus.consolidacion import VEHICULOS, consolidar_envios, minimo_camiones
+from nexus.generador import generar_red_tiendas
+from nexus.traslados import detalle_traslados, emparejar_traslados
+
+TAMANOS = [(2_000, 5), (20_000, 5), (5_000, 50)]
+
+if __name__ == "__main__":
+    print(f"{'SKUs x tiendas':>16} | {'líneas':>8} | {'vehículo':>22} | {'tiempo (s)':>10} | {'camiones':>8} | {'mínimo':>8} | {'ocupación':>9}")
+    for n_skus, n_tiendas in TAMANOS:
+        df = generar_red_tiendas(n_skus, n_tiendas, np.random.default_rng(42))
+        lineas = detalle_traslados(df, emparejar_traslados(df))
+        for vehiculo, capacidad in VEHICULOS.items():
+            t = medir(lambda: consolidar_envios(lineas, capacidad))
+            _, envios = consolidar_envios(lineas, capacidad)
+            print(f"{n_skus:>8,} x {n_tiendas:<5} | {len(lineas):>8,} | {vehiculo:>22} | {t:>10.3f} | {len(envios):>8,} | "
+                  f"{minimo_camiones(envios, capacidad):>8,} | {envios['Ocupacion'].mean():>9.0%}")
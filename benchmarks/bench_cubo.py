@@ -0,0 +1,41 @@
+"""
+Latencia de KPIs y agregados por filtro: escaneo de filas vs. cubo pre-agregado.
+Uso (desde la raíz del repositorio): python -m benchmarks.bench_cubo
+"""
+import numpy as np
+
+from benchmarks.bench_generador import medir
+from nexus.compacto import compactar_catalogo, filtrar_catalogo
+from nexus.cubo import agregar_cubo, construir_cubo, kpis_cubo, seleccionar_cubo
+from nexus.generador import generar_catalogo
+
+TAMANOS = [100_000, 1_000_000, 3_000_000]
+FILTRO_CAT = ['Acabados', 'Plomería', 'Eléctricos']
+FILTRO_PROV = ['MegaTools', 'DistriGlobal']
+
+
+def kpis_por_filas(df):
+    """KPIs y agregados de la página calculados sobre las filas filtradas."""
+    df = filtrar_catalogo(df, FILTRO_CAT, FILTRO_PROV)
+    df['Valor_Inventario'].sum()
+    df[df['Demanda_Mes'] > 0]['Dias_Inventario'].mean()
+    df.groupby('Categoria', observed=True).agg({'Utilidad_Mensual': 'sum', 'Valor_Inventario': 'sum', 'Margen_Pct': 'mean'})
+    df.groupby('Proveedor', observed=True).agg({'Lead_Time_Real': 'mean', 'Fill_Rate': 'mean', 'Valor_Inventario': 'sum'})
+    df.groupby(['Proveedor', 'Estado'], observed=True).size()
+
+
+def kpis_por_cubo(cubo):
+    """Los mismos resultados respondidos desde el cubo."""
+    sel = seleccionar_cubo(cubo, FILTRO_CAT, FILTRO_PROV)
+    kpis_cubo(sel)
+    agregar_cubo(sel, 'Categoria')
+    agregar_cubo(sel, 'Proveedor')
+    agregar_cubo(sel, ['Proveedor', 'Estado'])
+
+
+if __name__ == "__main__":
+    print(f"{'SKUs':>10} | {'filas (s)':>10} | {'cubo (s)':>9} | {'construir cubo (s)':>18}")
+    for n in TAMANOS:
+        df = compactar_catalogo(generar_catalogo(n, rng=np.random.default_rng(42)))
+        cubo = construir_cubo(df)
+        print(f"{n:>10,} | {medir(lambda: kpis_por_filas(df)):>10.3f} | {medir(lambda: kpis_por_cubo(cubo)):>9.4f} | {medir(lambda: construir_cubo(df), 1):>18.3f}")
@@ -0,0 +1,28 @@
+"""
+Tamaño de la figura (payload JSON) y tiempo de construcción de Frenos de Capital por SKU:
+un punto por SKU (WebGL) vs. densidad binada en el servidor.
+Uso (desde la raíz del repositorio): python -m benchmarks.bench_dispersion
+"""
+import numpy as np
+
+from benchmarks.bench_generador import medir
+from nexus.dispersion import binear_dispersion, figura_densidad, figura_puntos
+from nexus.generador import generar_catalogo
+
+TAMANOS = [10_000, 100_000, 1_000_000]
+
+
+def _densidad(df):
+    resumen, _ = binear_dispersion(df['Valor_Inventario'], df['Margen_Pct'])
+    return figura_densidad(resumen).to_json()
+
+
+if __name__ == "__main__":
+    print(f"{'SKUs':>10} | {'puntos (s)':>10} | {'puntos (MB)':>11} | {'densidad (s)':>12} | {'densidad (KB)':>13}")
+    for n in TAMANOS:
+        df = generar_catalogo(n, rng=np.random.default_rng(42))[['SKU', 'Categoria', 'Valor_Inventario', 'Margen_Pct']]
+        t_puntos = medir(lambda: figura_puntos(df).to_json(), repeticiones=1)
+        mb_puntos = len(figura_puntos(df).to_json()) / 1e6
+        t_densidad = medir(lambda: _densidad(df))
+        kb_densidad = len(_densidad(df)) / 1e3
+        print(f"{n:>10,} | {t_puntos:>10.3f} | {mb_puntos:>11.1f} | {t_densidad:>12.4f} | {kb_densidad:>13.1f}")
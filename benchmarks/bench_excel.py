@@ -0,0 +1,62 @@
+"""
+Exportación de órdenes grandes a Excel: escritor en streaming (constant_memory,
+formatos numéricos nativos) frente al camino anterior (moneda formateada a texto
+con apply y el DataFrame completo por pd.ExcelWriter). Tiempo y memoria pico
+se miden en corridas separadas (tracemalloc distorsiona el tiempo).
+Uso (desde la raíz del repositorio): python -m benchmarks.bench_excel
+"""
+import io
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from nexus.excel import escribir_excel, lotes_de
+
+TAMANOS = [50_000, 200_000]
+
+
+def orden_demo(n, rng):
+    """Orden con las columnas de exportación de Logística."""
+    return pd.DataFrame({
+        'SKU': [f"SKU-{i}" for i in rng.integers(1000, 99999, n)],
+        'Producto': 'Item Herramientas Profesional',
+        'Origen': 'Sede Principal',
+        'Destino': 'Norte',
+        'Cantidad': rng.integers(1, 200, n),
+        'Costo Unit.': rng.integers(5000, 250000, n).astype(float),
+        'Total Estimado': rng.integers(5000, 50_000_000, n).astype(float),
+    })
+
+
+def excel_anterior(df):
+    """Referencia: moneda como texto y libro completo en memoria."""
+    salida = io.BytesIO()
+    writer = pd.ExcelWriter(salida, engine='xlsxwriter')
+    temp = df.copy()
+    for col in ['Costo Unit.', 'Total Estimado']:
+        temp[col] = temp[col].apply(lambda x: f"${x:,.0f}")
+    temp.to_excel(writer, index=False, sheet_name='Reporte')
+    writer.close()
+    return salida.getvalue()
+
+
+def tiempo_y_pico(func):
+    t0 = time.perf_counter()
+    func()
+    tiempo = time.perf_counter() - t0
+    tracemalloc.start()
+    func()
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return tiempo, pico / 1e6
+
+
+if __name__ == "__main__":
+    print(f"{'líneas':>8} | {'streaming (s / MB pico)':>23} | {'anterior (s / MB pico)':>22} | {'filas/s streaming':>17}")
+    for n in TAMANOS:
+        df = orden_demo(n, np.random.default_rng(42))
+        t_s, m_s = tiempo_y_pico(lambda: escribir_excel(lotes_de(df)))
+        t_a, m_a = tiempo_y_pico(lambda: excel_anterior(df))
+        print(f"{n:>8,} | {t_s:>13.1f} / {m_s:>7.0f} | {t_a:>12.1f} / {m_a:>7.0f} | {n / t_s:>17,.0f}")
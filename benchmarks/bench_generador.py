@@ -0,0 +1,31 @@
+"""
+Benchmark del generador de catálogo de Estrategia.
+Uso (desde la raíz del repositorio): python -m benchmarks.bench_generador
+"""
+import os
+import time
+
+import numpy as np
+
+from nexus.generador import generar_catalogo, generar_catalogo_particionado
+
+TAMANOS = [10_000, 100_000, 1_000_000]
+
+
+def medir(func, repeticiones=3):
+    """Mejor tiempo (segundos) de varias ejecuciones."""
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        func()
+        mejor = min(mejor, time.perf_counter() - t0)
+    return mejor
+
+
+if __name__ == "__main__":
+    procesos = os.cpu_count() or 4
+    print(f"{'SKUs':>10} | {'1 proceso (s)':>14} | {f'{procesos} procesos (s)':>16}")
+    for n in TAMANOS:
+        t_serial = medir(lambda: generar_catalogo(n, rng=np.random.default_rng(42)))
+        t_particionado = medir(lambda: generar_catalogo_particionado(n, n_particiones=procesos, seed=42))
+        print(f"{n:>10,} | {t_serial:>14.3f} | {t_particionado:>16.3f}")
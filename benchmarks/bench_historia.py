@@ -0,0 +1,38 @@
+"""
+Historia particionada: costo de agregar un día y de consultar tendencias y rangos
+sobre dos años de snapshots diarios.
+Uso (desde la raíz del repositorio): python -m benchmarks.bench_historia
+"""
+import tempfile
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from benchmarks.bench_generador import medir
+from nexus.generador import generar_catalogo
+from nexus.historia import StoreHistoria, simular_historia, snapshot_estrategia
+
+N_SKUS = 20_000
+DIAS = 730
+
+if __name__ == "__main__":
+    df = generar_catalogo(N_SKUS, rng=np.random.default_rng(42))
+    hoy = date.today()
+    with tempfile.TemporaryDirectory() as ruta:
+        store = StoreHistoria(ruta, 'estrategia')
+        t0 = time.perf_counter()
+        simular_historia(store, df, dias=DIAS, hasta=hoy - timedelta(days=1))
+        print(f"Relleno de {DIAS} días x {N_SKUS:,} SKUs: {time.perf_counter() - t0:.1f} s")
+
+        snapshot = snapshot_estrategia(df)
+        t_dia = medir(lambda: store.guardar(hoy, snapshot), repeticiones=1)
+        t_kpis = medir(lambda: store.kpis(desde=hoy - timedelta(days=DIAS)))
+        t_rango = medir(lambda: store.leer_rango(hoy - timedelta(days=29), hoy, columnas=['Clave', 'Estado']))
+        t_todo = medir(lambda: store.leer_rango(hoy - timedelta(days=DIAS), hoy), repeticiones=1)
+
+        print(f"{'Operación':<42} | {'tiempo (s)':>10}")
+        print(f"{'Agregar el snapshot de un día':<42} | {t_dia:>10.3f}")
+        print(f"{'Tendencias 2 años (tabla diaria)':<42} | {t_kpis:>10.4f}")
+        print(f"{'Rango de 30 días (30 particiones)':<42} | {t_rango:>10.3f}")
+        print(f"{'Historia completa (todas las particiones)':<42} | {t_todo:>10.3f}")
@@ -0,0 +1,30 @@
+"""
+Barrido de sensibilidad de pesos de la licitación: un producto de matrices sobre
+toda la malla frente a re-licitar el catálogo una vez por punto de la malla.
+Uso (desde la raíz del repositorio): python -m benchmarks.bench_licitacion
+"""
+import numpy as np
+
+from benchmarks.bench_generador import medir
+from nexus.licitacion import CRITERIOS, OFERTAS_BASE, PESOS_BASE, barrido_pesos, licitar, malla_pesos, matriz_ofertas_fija
+
+TAMANOS = [10_000, 100_000]
+PUNTOS_BUCLE = 20  # Puntos de la malla que se miden con el bucle (se extrapola al total)
+
+
+def matriz_variable(n, rng):
+    """Ofertas distintas por SKU (precio y plazo con variación de ±5%)."""
+    base = matriz_ofertas_fija(n, OFERTAS_BASE)
+    return {'proveedores': base['proveedores'], **{c: base[c] * rng.choice([0.95, 1.0, 1.05], base[c].shape) for c in CRITERIOS}}
+
+
+if __name__ == "__main__":
+    malla = malla_pesos()
+    print(f"Malla: {len(malla):,} combinaciones de pesos")
+    print(f"{'SKUs':>9} | {'ofertas':>8} | {'barrido (s)':>11} | {'bucle licitar (s, est.)':>23}")
+    for n in TAMANOS:
+        for nombre, matriz in (('fijas', matriz_ofertas_fija(n, OFERTAS_BASE)), ('variables', matriz_variable(n, np.random.default_rng(42)))):
+            t_barrido = medir(lambda: barrido_pesos(matriz, malla), repeticiones=1)
+            pesos = [dict(zip(PESOS_BASE, p)) for p in malla[:PUNTOS_BUCLE]]
+            t_bucle = medir(lambda: [licitar(matriz, w) for w in pesos], repeticiones=1) * len(malla) / PUNTOS_BUCLE
+            print(f"{n:>9,} | {nombre:>8} | {t_barrido:>11.2f} | {t_bucle:>23.1f}")
@@ -0,0 +1,69 @@
+"""
+Importación de listas de precios: memoria pico y tiempo de la lectura en streaming por lotes
+(openpyxl read_only) frente a cargar el libro completo, y costo de re-importar.
+Uso (desde la raíz del repositorio): python -m benchmarks.bench_listas_precios
+"""
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import openpyxl
+
+from nexus.generador import generar_catalogo
+from nexus.listas_precios import StoreOfertas, escribir_lista_demo, leer_lista
+
+TAMANOS = [50_000, 100_000, 200_000]
+N_COMPLETO = 50_000  # La carga completa del libro solo se mide en el tamaño chico
+
+
+def tiempo_y_memoria(funcion):
+    """(segundos, MB pico de memoria Python): el tiempo se mide sin tracemalloc, que lo distorsiona."""
+    t0 = time.perf_counter()
+    funcion()
+    segundos = time.perf_counter() - t0
+    tracemalloc.start()
+    funcion()
+    pico = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return segundos, pico
+
+
+def cargar_completo(ruta):
+    libro = openpyxl.load_workbook(ruta)
+    filas = sum(1 for _ in libro.active.iter_rows(values_only=True))
+    libro.close()
+    return filas
+
+
+if __name__ == "__main__":
+    print(f"{'filas':>8} | {'MB xlsx':>7} | {'streaming (s / MB pico)':>23} | {'libro completo (s / MB pico)':>28} | {'re-import 1% (s)':>16} | {'idéntico (s)':>12}")
+    with tempfile.TemporaryDirectory() as ruta:
+        for n in TAMANOS:
+            df = generar_catalogo(n, rng=np.random.default_rng(42))
+            lista = os.path.join(ruta, f'lista_{n}.xlsx')
+            escribir_lista_demo(lista, df['SKU'], df['Costo'], 'MegaTools', np.random.default_rng(1))
+            store = StoreOfertas(os.path.join(ruta, f'store_{n}'))
+
+            t_stream, mb_stream = tiempo_y_memoria(lambda: sum(len(lote) for lote in leer_lista(lista)))
+            store.importar(lista, 'MegaTools')
+            t_full, mb_full = (float('nan'), float('nan'))
+            if n <= N_COMPLETO:
+                t_full, mb_full = tiempo_y_memoria(lambda: cargar_completo(lista))
+
+            # Nueva versión de la lista con el 1% de los precios cambiados
+            costos = df['Costo'].to_numpy().copy()
+            costos[: n // 100] *= 1.1
+            lista_v2 = os.path.join(ruta, f'lista_{n}_v2.xlsx')
+            escribir_lista_demo(lista_v2, df['SKU'], costos, 'MegaTools', np.random.default_rng(1))
+            t0 = time.perf_counter()
+            cambios = store.importar(lista_v2, 'MegaTools')
+            t_reimport = time.perf_counter() - t0
+            assert cambios['cambiadas'] == n // 100, cambios
+            t0 = time.perf_counter()
+            store.importar(lista_v2, 'MegaTools')
+            t_identico = time.perf_counter() - t0
+
+            mb_xlsx = os.path.getsize(lista) / 1e6
+            print(f"{n:>8,} | {mb_xlsx:>7.1f} | {t_stream:>10.1f} / {mb_stream:>10.0f} | {t_full:>13.1f} / {mb_full:>12.0f} | {t_reimport:>16.1f} | {t_identico:>12.3f}")
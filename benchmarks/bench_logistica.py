@@ -0,0 +1,58 @@
+"""
+Red de tiendas de Logística: tiempo del generador vectorizado y de la página
+(primera carga y rerun) a medida que crecen SKUs x tiendas.
+Uso (desde la raíz del repositorio): python -m benchmarks.bench_logistica
+Cada tamaño corre la página en un subproceso con su propio NEXUS_LOGISTICA_*.
+"""
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+from benchmarks.bench_generador import medir
+from nexus.generador import generar_red_tiendas
+
+TAMANOS_GENERADOR = [(10_000, 50), (100_000, 50), (100_000, 200)]
+TAMANOS_PAGINA = [(80, 5), (1_000, 20), (5_000, 50), (10_000, 50), (10_000, 100)]
+RERUNS = 3
+
+_SCRIPT_MEDICION = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file("Home.py", default_timeout=1800)
+t0 = time.perf_counter()
+at.switch_page("pages/2_Logistica.py").run()  # Primera carga: genera datos y llena caches
+primera = time.perf_counter() - t0
+tiempos = []
+for _ in range(int(sys.argv[1])):
+    t0 = time.perf_counter()
+    at.run()
+    tiempos.append(time.perf_counter() - t0)
+print(json.dumps([primera, min(tiempos)]))
+"""
+
+
+def medir_pagina(n_skus, n_tiendas):
+    """(primera carga, mejor rerun) en segundos de la página de Logística."""
+    env = dict(os.environ, NEXUS_LOGISTICA_SKUS=str(n_skus), NEXUS_LOGISTICA_TIENDAS=str(n_tiendas))
+    salida = subprocess.run(
+        [sys.executable, '-c', _SCRIPT_MEDICION, str(RERUNS)],
+        env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(salida.stdout.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    print(f"{'SKUs x tiendas':>16} | {'filas':>11} | {'generador (s)':>13} | {'MB':>7}")
+    for n_skus, n_tiendas in TAMANOS_GENERADOR:
+        t = medir(lambda: generar_red_tiendas(n_skus, n_tiendas, np.random.default_rng(42)), repeticiones=1)
+        mb = generar_red_tiendas(n_skus, n_tiendas, np.random.default_rng(42)).memory_usage(deep=True).sum() / 1e6
+        print(f"{f'{n_skus:,} x {n_tiendas}':>16} | {n_skus * n_tiendas:>11,} | {t:>13.2f} | {mb:>7.0f}")
+
+    print()
+    print(f"{'SKUs x tiendas':>16} | {'filas':>11} | {'primera carga (s)':>17} | {'rerun (s)':>9}")
+    for n_skus, n_tiendas in TAMANOS_PAGINA:
+        primera, rerun = medir_pagina(n_skus, n_tiendas)
+        print(f"{f'{n_skus:,} x {n_tiendas}':>16} | {n_skus * n_tiendas:>11,} | {primera:>17.2f} | {rerun:>9.2f}")
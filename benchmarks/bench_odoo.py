@@ -0,0 +1,40 @@
+"""
+Sincronización completa vs. incremental contra el servidor Odoo simulado.
+Uso (desde la raíz del repositorio): python -m benchmarks.bench_odoo
+"""
+import tempfile
+import time
+
+from nexus.odoo import ClienteOdoo, StoreParquet, sincronizar
+from nexus.odoo_catalogo import catalogo_estrategia
+from nexus.odoo_simulado import ServidorOdooSimulado, modelos_demo
+
+TAMANOS = [2_000, 10_000]
+FRACCION_CAMBIOS = 0.01
+
+
+def _sincronizar(servidor, store):
+    servidor.registros_servidos = 0
+    with ClienteOdoo(servidor.url, servidor.db, servidor.usuario, servidor.password) as cliente:
+        t0 = time.perf_counter()
+        sincronizar(cliente, store)
+        return time.perf_counter() - t0, servidor.registros_servidos
+
+
+if __name__ == "__main__":
+    print(f"{'Productos':>10} | {'completa (s)':>12} | {'registros':>9} | {'incremental (s)':>15} | {'registros':>9} | {'lectura (s)':>11}")
+    for n in TAMANOS:
+        with ServidorOdooSimulado(modelos_demo(n)) as servidor, tempfile.TemporaryDirectory() as ruta:
+            store = StoreParquet(ruta)
+            t_completa, r_completa = _sincronizar(servidor, store)
+
+            # Un 1% de los productos cambia de precio en el ERP
+            ids = list(range(1, n + 1, int(1 / FRACCION_CAMBIOS)))
+            servidor.escribir('product.product', ids, {'list_price': 123_456.5})
+            t_incr, r_incr = _sincronizar(servidor, store)
+
+            t0 = time.perf_counter()
+            catalogo = catalogo_estrategia(store)
+            t_lectura = time.perf_counter() - t0
+            assert (catalogo['Precio'] == 123_456.5).sum() == len(ids)
+            print(f"{n:>10,} | {t_completa:>12.3f} | {r_completa:>9,} | {t_incr:>15.3f} | {r_incr:>9,} | {t_lectura:>11.3f}")
@@ -0,0 +1,33 @@
+"""
+Optimizador de reposición: pedido de todo el catálogo con presupuesto y mínimos
+por proveedor (voraz vectorizado) frente al refinamiento MILP opcional.
+Uso (desde la raíz del repositorio): python -m benchmarks.bench_optimizador
+"""
+import numpy as np
+
+from benchmarks.bench_generador import medir
+from nexus.generador import generar_catalogo
+from nexus.licitacion import OFERTAS_BASE
+from nexus.optimizador import HAY_SCIPY, optimizar_compras
+
+TAMANOS = [10_000, 100_000, 500_000]
+N_MILP = 10_000  # El MILP se mide solo en el tamaño chico
+
+if __name__ == "__main__":
+    print(f"{'SKUs':>9} | {'candidatos':>10} | {'voraz (s)':>9} | {'MILP (s)':>8} | {'mejora MILP':>11} | {'$/peso marginal':>15}")
+    for n in TAMANOS:
+        df = generar_catalogo(n, rng=np.random.default_rng(42))
+        df = df[df['Demanda_Mes'] > df['Stock']]
+        # Proveedores de la licitación repartidos al azar para tener mínimos activos
+        proveedor = np.random.default_rng(7).choice(list(OFERTAS_BASE), len(df))
+        args = (df['Costo'].to_numpy(), (df['Precio'] - df['Costo']).to_numpy(), (df['Demanda_Mes'] - df['Stock']).to_numpy(), proveedor)
+        presupuesto = 0.3 * float(args[0] @ args[2])
+        minimos = {p: presupuesto * f for p, f in zip(OFERTAS_BASE, (0.05, 0.1, 0.2, 0.3))}
+
+        t_voraz = medir(lambda: optimizar_compras(*args, presupuesto, minimos))
+        plan = optimizar_compras(*args, presupuesto, minimos)
+        t_milp, mejora = float('nan'), float('nan')
+        if HAY_SCIPY and n <= N_MILP:
+            t_milp = medir(lambda: optimizar_compras(*args, presupuesto, minimos, refinar=True), repeticiones=1)
+            mejora = 100 * (optimizar_compras(*args, presupuesto, minimos, refinar=True)['valor'] / plan['valor'] - 1)
+        print(f"{n:>9,} | {len(df):>10,} | {t_voraz:>9.3f} | {t_milp:>8.2f} | {mejora:>10.3f}% | {plan['precio_sombra']:>15.3f}")
@@ -0,0 +1,44 @@
+"""
+Órdenes de compra en lote: Excel + PDF de 10-80 proveedores en un ZIP, en serie
+(un proveedor tras otro, como el botón por proveedor) frente al pool de procesos.
+El pool solo gana con más de una CPU (os.cpu_count() se imprime al inicio).
+Uso (desde la raíz del repositorio): python -m benchmarks.bench_ordenes
+"""
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_generador import medir
+from nexus.generador import generar_red_tiendas
+from nexus.ordenes import generar_ordenes
+from nexus.traslados import emparejar_traslados, traslado_por_fila
+
+warnings.filterwarnings("ignore", category=DeprecationWarning)  # Fuente 'Arial' -> Helvetica en fpdf2
+
+N_SKUS, N_TIENDAS = 5_000, 20
+PROVEEDORES = [10, 40, 80]
+
+
+def vista_compras(n_proveedores, rng):
+    """Red de tiendas con Sugerencia_Compra y el catálogo repartido entre `n_proveedores`."""
+    df = generar_red_tiendas(N_SKUS, N_TIENDAS, rng)
+    lineas = emparejar_traslados(df)
+    df['Sugerencia_Compra'] = (df['Necesidad_Total'] - traslado_por_fila(df, lineas)).clip(lower=0)
+    # Cada SKU (en todas sus tiendas) queda con un solo proveedor
+    nombres = np.array([f"PROVEEDOR {i:02d}" for i in range(n_proveedores)])
+    df['Proveedor'] = nombres[pd.factorize(df['SKU'])[0] % n_proveedores]
+    return df[df['Sugerencia_Compra'] > 0]
+
+
+if __name__ == "__main__":
+    print(f"CPUs: {os.cpu_count()}")
+    print(f"{'proveedores':>11} | {'líneas':>8} | {'serie (s)':>9} | {'pool (s)':>8} | {'ZIP (MB)':>8}")
+    for n in PROVEEDORES:
+        df = vista_compras(n, np.random.default_rng(42))
+        t_serie = medir(lambda: generar_ordenes(df, procesos=1), repeticiones=1)
+        t_pool = medir(lambda: generar_ordenes(df, procesos=max(os.cpu_count() or 1, 2)), repeticiones=1)
+        zip_lote, manifiesto = generar_ordenes(df, procesos=1)
+        assert manifiesto['Lineas'].sum() == len(df)
+        print(f"{n:>11} | {len(df):>8,} | {t_serie:>9.2f} | {t_pool:>8.2f} | {len(zip_lote) / 1e6:>8.1f}")
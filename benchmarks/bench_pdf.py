@@ -0,0 +1,65 @@
+"""
+Tablas PDF de órdenes: motor paginado (columnas preformateadas, anchos por contenido,
+pdf.text) frente al render anterior (iterrows y un pdf.cell por celda).
+Uso (desde la raíz del repositorio): python -m benchmarks.bench_pdf
+"""
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_generador import medir
+from nexus.pdf import PDFReport, tabla_pdf
+
+warnings.filterwarnings("ignore", category=DeprecationWarning)  # Fuente 'Arial' -> Helvetica en fpdf2
+
+TAMANOS = [500, 5_000, 20_000]
+
+
+def orden_demo(n, rng):
+    return pd.DataFrame({
+        'SKU': [f"HER-{i}" for i in rng.integers(1000, 9999, n)],
+        'Producto': [f"Item Herramientas Profesional {i}" for i in rng.integers(1000, 9999, n)],
+        'Cantidad': rng.integers(1, 500, n),
+        'Costo Unit.': rng.integers(5000, 250000, n).astype(float),
+        'Total Estimado': rng.integers(5000, 50_000_000, n).astype(float),
+    })
+
+
+def pdf_anterior(df):
+    """Referencia: el render de generar_pdf antes del motor de tablas."""
+    pdf = PDFReport()
+    pdf.add_page()
+    df_temp = df.copy()
+    for col in ['Costo Unit.', 'Total Estimado']:
+        df_temp[col] = df_temp[col].apply(lambda x: f"${x:,.0f}")
+    col_width = 190 / len(df_temp.columns)
+    pdf.set_font("Arial", 'B', 8)
+    for col in df_temp.columns:
+        pdf.cell(col_width, 7, str(col)[:15], 1, 0, 'C', True)
+    pdf.ln()
+    pdf.set_font("Arial", '', 8)
+    for _, row in df_temp.iterrows():
+        for col in df_temp.columns:
+            pdf.cell(col_width, 7, str(row[col])[:18], 1, 0, 'C')
+        pdf.ln()
+    return bytes(pdf.output())
+
+
+def pdf_tabla(df):
+    pdf = PDFReport()
+    pdf.add_page()
+    tabla_pdf(pdf, df)
+    return bytes(pdf.output())
+
+
+if __name__ == "__main__":
+    print(f"{'líneas':>7} | {'tabla (s)':>9} | {'anterior (s)':>12} | {'líneas/s tabla':>14} | {'páginas':>7}")
+    for n in TAMANOS:
+        df = orden_demo(n, np.random.default_rng(42))
+        t_tabla = medir(lambda: pdf_tabla(df))
+        t_anterior = medir(lambda: pdf_anterior(df), repeticiones=1)
+        pdf = PDFReport()
+        pdf.add_page()
+        tabla_pdf(pdf, df)
+        print(f"{n:>7,} | {t_tabla:>9.2f} | {t_anterior:>12.2f} | {n / t_tabla:>14,.0f} | {pdf.page_no():>7,}")
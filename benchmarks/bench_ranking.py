@@ -0,0 +1,22 @@
+"""
+Top-N por selección parcial vs. orden completo.
+Uso (desde la raíz del repositorio): python -m benchmarks.bench_ranking
+"""
+import numpy as np
+
+from benchmarks.bench_generador import medir
+from nexus.generador import generar_catalogo
+from nexus.ranking import top_n, top_n_por_grupo
+
+TAMANOS = [100_000, 1_000_000]
+N = 6
+
+if __name__ == "__main__":
+    print(f"{'SKUs':>10} | {'sort+head (s)':>13} | {'top_n (s)':>9} | {'groupby head (s)':>16} | {'top_n_por_grupo (s)':>19}")
+    for n in TAMANOS:
+        df = generar_catalogo(n, rng=np.random.default_rng(42))
+        t_sort = medir(lambda: df.sort_values('Utilidad_Mensual', ascending=False).head(N))
+        t_top = medir(lambda: top_n(df, 'Utilidad_Mensual', N))
+        t_grupo_sort = medir(lambda: df.sort_values('Utilidad_Mensual', ascending=False).groupby('Proveedor').head(N))
+        t_grupo_top = medir(lambda: top_n_por_grupo(df, 'Utilidad_Mensual', N, 'Proveedor'))
+        print(f"{n:>10,} | {t_sort:>13.4f} | {t_top:>9.4f} | {t_grupo_sort:>16.4f} | {t_grupo_top:>19.4f}")
@@ -0,0 +1,34 @@
+"""
+Ruteo multiparada de los traslados aprobados del día: tiempo de la construcción
+(ahorros + 2-opt) y de la búsqueda local, y kilómetros frente a viajes propios por carril.
+Uso (desde la raíz del repositorio): python -m benchmarks.bench_rutas
+"""
+import numpy as np
+
+from benchmarks.bench_generador import medir
+from nexus.generador import generar_red_tiendas
+from nexus.rutas import DEPOSITO_BASE, cargas_por_tienda, coordenadas_tiendas, distancia_directa, matriz_distancias, planificar_rutas
+from nexus.traslados import detalle_traslados, emparejar_traslados
+
+TAMANOS = [(50, 1_000), (200, 3_000), (400, 5_000)]  # (tiendas, líneas aprobadas en el día)
+N_SKUS = 500
+CAPACIDAD = 3_500
+
+if __name__ == "__main__":
+    print(f"{'tiendas':>7} | {'líneas':>7} | {'paradas':>7} | {'construcción (s)':>16} | {'+ búsqueda (s)':>14} | {'rutas':>5} | {'km construcción':>15} | {'km final':>9} | {'km por carril':>13}")
+    for n_tiendas, n_lineas in TAMANOS:
+        rng = np.random.default_rng(42)
+        df = generar_red_tiendas(N_SKUS, n_tiendas, rng)
+        lineas = detalle_traslados(df, emparejar_traslados(df))
+        lineas = lineas.iloc[rng.choice(len(lineas), min(n_lineas, len(lineas)), replace=False)]
+        lineas = lineas.assign(Peso_kg=lineas['Cantidad'] * lineas['Peso_Articulo'])
+        distancias = matriz_distancias(coordenadas_tiendas([str(t) for t in df['Almacen_Nombre'].cat.categories]))
+        cargas = cargas_por_tienda(lineas, DEPOSITO_BASE)
+
+        t_ahorros = medir(lambda: planificar_rutas(cargas, distancias, DEPOSITO_BASE, CAPACIDAD, limite_segundos=0))
+        t_final = medir(lambda: planificar_rutas(cargas, distancias, DEPOSITO_BASE, CAPACIDAD))
+        _, inicial = planificar_rutas(cargas, distancias, DEPOSITO_BASE, CAPACIDAD, limite_segundos=0)
+        paradas, rutas = planificar_rutas(cargas, distancias, DEPOSITO_BASE, CAPACIDAD)
+        assert (rutas['Carga_Max_kg'] <= CAPACIDAD + 1e-6).all()
+        print(f"{n_tiendas:>7,} | {len(lineas):>7,} | {len(paradas):>7,} | {t_ahorros:>16.2f} | {t_final:>14.2f} | {len(rutas):>5,} | "
+              f"{inicial['Distancia'].sum():>15,.0f} | {rutas['Distancia'].sum():>9,.0f} | {distancia_directa(lineas, distancias, DEPOSITO_BASE, CAPACIDAD):>13,.0f}")
@@ -0,0 +1,46 @@
+"""
+Tiempo de rerun de las páginas con pestañas clásicas vs. perezosas.
+Uso (desde la raíz del repositorio): python -m benchmarks.bench_tabs
+Cada modo corre en un subproceso para que el entorno (NEXUS_*) sea independiente.
+"""
+import json
+import os
+import subprocess
+import sys
+
+PAGINAS = {
+    'pages/1_Estrategia.py': {'NEXUS_N_SKUS': '1000000'},
+    'pages/2_Logistica.py': {},
+}
+RERUNS = 5
+
+_SCRIPT_MEDICION = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file("Home.py", default_timeout=600)
+at.switch_page(sys.argv[1]).run()  # Primera carga: genera datos y llena caches
+tiempos = []
+for _ in range(int(sys.argv[2])):
+    t0 = time.perf_counter()
+    at.run()
+    tiempos.append(time.perf_counter() - t0)
+print(json.dumps(min(tiempos)))
+"""
+
+
+def medir_rerun(pagina, entorno, perezosas):
+    """Mejor tiempo de rerun (s) de la página con caches ya calientes."""
+    env = dict(os.environ, **entorno, NEXUS_TABS_PEREZOSAS='1' if perezosas else '0')
+    salida = subprocess.run(
+        [sys.executable, '-c', _SCRIPT_MEDICION, pagina, str(RERUNS)],
+        env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(salida.stdout.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    print(f"{'Página':<24} | {'clásicas (s)':>12} | {'perezosas (s)':>13}")
+    for pagina, entorno in PAGINAS.items():
+        clasicas = medir_rerun(pagina, entorno, perezosas=False)
+        perezosas = medir_rerun(pagina, entorno, perezosas=True)
+        print(f"{pagina:<24} | {clasicas:>12.3f} | {perezosas:>13.3f}")
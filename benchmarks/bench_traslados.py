@@ -0,0 +1,29 @@
+"""
+Emparejamiento de traslados excedente -> necesidad: tiempo sobre toda la red de
+tiendas frente al apply por fila anterior (tope fijo de 12 unidades sin origen real).
+Uso (desde la raíz del repositorio): python -m benchmarks.bench_traslados
+"""
+import numpy as np
+
+from benchmarks.bench_generador import medir
+from nexus.generador import generar_red_tiendas
+from nexus.traslados import emparejar_traslados, traslado_por_fila
+
+TAMANOS = [(10_000, 50), (100_000, 50), (100_000, 200)]
+N_APPLY = 500_000  # El apply por fila solo se mide hasta este número de filas
+
+
+def traslado_apply(df):
+    """Referencia: el tope fijo por fila que usaba calcular_abastecimiento."""
+    return df.apply(lambda x: min(x['Necesidad_Total'], 12) if x['Necesidad_Total'] > 0 else 0, axis=1)
+
+
+if __name__ == "__main__":
+    print(f"{'SKUs x tiendas':>16} | {'filas':>11} | {'emparejar (s)':>13} | {'apply (s)':>9} | {'líneas':>10} | {'unidades':>12}")
+    for n_skus, n_tiendas in TAMANOS:
+        df = generar_red_tiendas(n_skus, n_tiendas, np.random.default_rng(42))
+        t_emparejar = medir(lambda: emparejar_traslados(df))
+        lineas = emparejar_traslados(df)
+        assert (traslado_por_fila(df, lineas) <= df['Necesidad_Total'].to_numpy()).all()
+        t_apply = medir(lambda: traslado_apply(df), repeticiones=1) if len(df) <= N_APPLY else float('nan')
+        print(f"{n_skus:>8,} x {n_tiendas:<5} | {len(df):>11,} | {t_emparejar:>13.2f} | {t_apply:>9.2f} | {len(lineas):>10,} | {int(lineas['Cantidad'].sum()):>12,}")
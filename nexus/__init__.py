@@ -0,0 +1 @@
+"""Motor de cálculo NEXUS PRO compartido por las páginas del portafolio."""
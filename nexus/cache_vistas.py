@@ -0,0 +1,91 @@
+"""Cache LRU, acotada por memoria, de las vistas filtradas de la barra lateral."""
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+def clave_filtros(categorias, proveedores, universo_cat=(), universo_prov=()):
+    """
+    Clave normalizada de una selección de filtros: el orden de selección no
+    importa y "todas seleccionadas" equivale a "sin filtro" (tupla vacía).
+    """
+    clave = []
+    for seleccion, universo in ((categorias, universo_cat), (proveedores, universo_prov)):
+        seleccion = tuple(sorted(set(seleccion or ())))
+        if universo and set(seleccion) >= set(universo):
+            seleccion = ()
+        clave.append(seleccion)
+    return tuple(clave)
+
+
+def tamano_bytes(obj):
+    """Estimación de memoria de una vista (DataFrames, arreglos y contenedores)."""
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, dict):
+        return sum(tamano_bytes(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sum(tamano_bytes(v) for v in obj)
+    return 64  # Escalares y objetos pequeños
+
+
+class CacheVistas:
+    """LRU con límite de entradas y de bytes; lleva contadores de aciertos y fallos."""
+
+    def __init__(self, max_entradas=32, max_bytes=256 * 1024 ** 2):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self._entradas = OrderedDict()  # clave -> (valor, bytes)
+        self.bytes_usados = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def __contains__(self, clave):
+        return clave in self._entradas
+
+    def obtener(self, clave, construir, medir=tamano_bytes):
+        """
+        Devuelve la vista de `clave`; si no está, la construye con `construir()`.
+        `medir(valor)` estima los bytes de la entrada (por defecto, `tamano_bytes`).
+        """
+        if clave in self._entradas:
+            self.hits += 1
+            self._entradas.move_to_end(clave)
+            return self._entradas[clave][0]
+
+        self.misses += 1
+        valor = construir()
+        tamano = medir(valor)
+        if tamano <= self.max_bytes:  # Una vista más grande que el límite no se guarda
+            self._entradas[clave] = (valor, tamano)
+            self.bytes_usados += tamano
+            self._desalojar()
+        return valor
+
+    def _desalojar(self):
+        """Saca las vistas menos usadas hasta respetar ambos límites."""
+        while self._entradas and (len(self._entradas) > self.max_entradas or self.bytes_usados > self.max_bytes):
+            _, (_, tamano) = self._entradas.popitem(last=False)
+            self.bytes_usados -= tamano
+
+    def limpiar(self):
+        self._entradas.clear()
+        self.bytes_usados = 0
+
+    def estadisticas(self):
+        total = self.hits + self.misses
+        return {
+            'entradas': len(self._entradas),
+            'bytes': self.bytes_usados,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
@@ -0,0 +1,94 @@
+"""
+Simulación Monte Carlo de campañas de liquidación de excedentes.
+
+Cada escenario sortea una elasticidad precio por categoría y un choque de demanda
+común. Las unidades vendidas en el horizonte son min(Stock, Demanda * H * choque * lift),
+con lift = (Precio / Precio_Promo) ** elasticidad. Los escenarios son compartidos por
+todas las campañas, así la comparación entre campañas no depende del azar.
+
+En vez de una matriz escenarios x SKUs, los SKUs se agrupan por categoría y nivel de
+descuento y se ordenan por log(Stock / Demanda): en cada escenario los SKUs que se
+agotan son un prefijo del orden, y los totales salen de sumas acumuladas con un
+searchsorted. Así miles de escenarios sobre cientos de miles de SKUs toman milisegundos.
+"""
+import numpy as np
+import pandas as pd
+
+CAMPANAS = {
+    'Liquidación (Costo + 5%)': ('Costo', 1.05),
+    'Gran Remate (PVP - 50%)': ('Precio', 0.50),
+}
+HORIZONTE_MESES = 3
+ELASTICIDAD = (1.8, 0.6)   # Media y desviación de la elasticidad precio por categoría
+CHOQUE_DEMANDA = 0.25      # Desviación del log del choque de demanda del escenario
+N_ESCENARIOS = 2000
+NIVELES_DESCUENTO = 32     # Agrupación del descuento (error del lift < 1% con elasticidad ~2)
+
+
+def precio_campana(costo, precio, campana):
+    """Precio promocional de la campaña; nunca por encima del precio actual."""
+    base, factor = CAMPANAS[campana]
+    return np.minimum((costo if base == 'Costo' else precio) * factor, precio)
+
+
+def simular_campanas(df, campanas=None, n_escenarios=N_ESCENARIOS, horizonte=HORIZONTE_MESES, rng=None):
+    """
+    Simula las campañas sobre todos los SKUs de `df` (Categoria, Costo, Precio, Stock, Demanda_Mes).
+
+    Devuelve {'categorias': [...], 'campanas': {campaña: {'Caja': arr, 'Margen_Perdido': arr}}}
+    con arreglos (escenarios x categorías): caja liberada por las ventas de la campaña y
+    margen cedido frente a vender esas unidades a precio lleno.
+    """
+    rng = rng or np.random.default_rng()
+    campanas = campanas or list(CAMPANAS)
+    categorias = pd.Categorical(df['Categoria']).remove_unused_categories()
+    codigos, n_cat = categorias.codes.astype(np.int64), len(categorias.categories)
+
+    costo = df['Costo'].to_numpy(dtype=np.float64)
+    precio = df['Precio'].to_numpy(dtype=np.float64)
+    stock = df['Stock'].to_numpy(dtype=np.float64)
+    demanda = df['Demanda_Mes'].to_numpy(dtype=np.float64) * horizonte
+    with np.errstate(divide='ignore', invalid='ignore'):
+        clave = np.nan_to_num(np.log(stock / demanda), nan=np.inf)  # Se agota si log(lift * choque) >= clave
+
+    # Escenarios comunes a todas las campañas
+    elasticidad = np.clip(rng.normal(*ELASTICIDAD, size=(n_escenarios, n_cat)), 0.1, None)
+    choque = rng.normal(0.0, CHOQUE_DEMANDA, n_escenarios)
+
+    resultado = {}
+    for campana in campanas:
+        promo = precio_campana(costo, precio, campana)
+        descuento = np.log(precio / promo)  # log(lift) = elasticidad * descuento
+        tope = descuento.max() if len(descuento) else 0.0
+        nivel = np.minimum((descuento / (tope or 1.0) * NIVELES_DESCUENTO).astype(np.int64), NIVELES_DESCUENTO - 1)
+        grupo = codigos * NIVELES_DESCUENTO + nivel
+        orden = np.lexsort((clave, grupo))
+        cortes = np.flatnonzero(np.diff(grupo[orden])) + 1
+
+        salidas = {'Caja': (np.zeros((n_escenarios, n_cat)), promo), 'Margen_Perdido': (np.zeros((n_escenarios, n_cat)), precio - promo)}
+        for idx in np.split(orden, cortes):
+            if not len(idx):
+                continue
+            cat = codigos[idx[0]]
+            log_lift = elasticidad[:, cat] * descuento[idx].mean() + choque
+            k = np.searchsorted(clave[idx], log_lift, side='right')  # Los k primeros se agotan
+            for salida, valor in salidas.values():
+                agotados = np.concatenate([[0.0], np.cumsum(stock[idx] * valor[idx])])
+                resto = np.concatenate([np.cumsum((demanda[idx] * valor[idx])[::-1])[::-1], [0.0]])
+                salida[:, cat] += agotados[k] + np.exp(log_lift) * resto[k]
+        resultado[campana] = {nombre: salida for nombre, (salida, _) in salidas.items()}
+    return {'categorias': list(categorias.categories), 'campanas': resultado}
+
+
+def resumen_campanas(simulacion, percentiles=(10, 50, 90)):
+    """Percentiles de caja liberada y margen cedido por campaña y categoría (más el TOTAL)."""
+    filas = []
+    for campana, metricas in simulacion['campanas'].items():
+        for i, categoria in enumerate(simulacion['categorias'] + ['TOTAL']):
+            fila = {'Campaña': campana, 'Categoria': categoria}
+            for nombre, matriz in metricas.items():
+                serie = matriz.sum(axis=1) if categoria == 'TOTAL' else matriz[:, i]
+                for p, v in zip(percentiles, np.percentile(serie, percentiles)):
+                    fila[f'{nombre}_P{p}'] = v
+            filas.append(fila)
+    return pd.DataFrame(filas)
@@ -0,0 +1,75 @@
+"""Clasificador vectorizado de estado de inventario, cobertura y segmento ABC."""
+import numpy as np
+import pandas as pd
+
+# Estados de inventario en orden de severidad (el índice es el código entero)
+ESTADOS = ["🔴 Quiebre", "🟠 Riesgo", "🟢 Óptimo", "🔵 Excedente"]
+QUIEBRE, RIESGO, OPTIMO, EXCEDENTE = range(len(ESTADOS))
+
+# Días de cobertura: < riesgo -> Riesgo (menos de un mes), > excedente -> Excedente (más de 4 meses)
+UMBRALES_ESTADO = {'riesgo': 25, 'excedente': 120}
+
+# Cortes de valor de movimiento mensual ($) para el segmento ABC: > 5M = A, > 1M = B
+CORTES_ABC = (1_000_000, 5_000_000)
+SEGMENTOS_ABC = np.array(['C', 'B', 'A'])
+
+DIAS_SIN_DEMANDA = 999.0
+
+
+def dias_cobertura(stock, demanda):
+    """Días de cobertura = (Stock / Demanda Mensual) * 30; sin demanda = 999."""
+    stock = np.asarray(stock, dtype=np.float64)
+    demanda = np.asarray(demanda, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(demanda > 0, stock / demanda * 30, DIAS_SIN_DEMANDA)
+
+
+def _umbral_por_fila(nombre, categorias, umbrales, umbrales_categoria):
+    """Umbral escalar, o arreglo por fila si hay umbrales específicos por categoría."""
+    base = umbrales[nombre]
+    if not umbrales_categoria or categorias is None:
+        return base
+    cat = pd.Categorical(categorias)
+    por_cat = np.array([umbrales_categoria.get(c, {}).get(nombre, base) for c in cat.categories], dtype=np.float64)
+    # Código -1 (categoría nula) usa el umbral base
+    return np.append(por_cat, base)[cat.codes]
+
+
+def clasificar_estado(stock, demanda, categorias=None, umbrales=None, umbrales_categoria=None, dias=None):
+    """
+    Código de estado (int8, índice en ESTADOS) para columnas completas.
+    `umbrales_categoria` = {'Categoria': {'riesgo': d, 'excedente': d}} sobreescribe
+    los umbrales globales para esa categoría.
+    """
+    umbrales = {**UMBRALES_ESTADO, **(umbrales or {})}
+    stock = np.asarray(stock)
+    dias = dias_cobertura(stock, demanda) if dias is None else np.asarray(dias)
+    riesgo = _umbral_por_fila('riesgo', categorias, umbrales, umbrales_categoria)
+    excedente = _umbral_por_fila('excedente', categorias, umbrales, umbrales_categoria)
+    return np.select(
+        [stock == 0, dias < riesgo, dias > excedente],
+        [QUIEBRE, RIESGO, EXCEDENTE],
+        default=OPTIMO
+    ).astype(np.int8)
+
+
+def etiquetas_estado(codigos):
+    """Etiquetas (con emoji) de los códigos de estado."""
+    return np.array(ESTADOS, dtype=object)[codigos]
+
+
+def cobertura_logistica(stock, demanda, meses_objetivo=1.5, meses_excedente=3):
+    """
+    Necesidad y excedente trasladable por fila (enteros):
+    necesidad = demanda * meses_objetivo - stock; excedente = stock - demanda * meses_excedente.
+    """
+    stock = np.asarray(stock, dtype=np.float64)
+    demanda = np.asarray(demanda, dtype=np.float64)
+    necesidad = np.maximum(0, demanda * meses_objetivo - stock)
+    excedente = np.maximum(0, stock - demanda * meses_excedente)
+    return necesidad.astype(np.int64), excedente.astype(np.int64)
+
+
+def clasificar_abc(valor_movimiento, cortes=CORTES_ABC):
+    """Segmento ABC por valor de movimiento con np.digitize (límites inclusivos por arriba)."""
+    return SEGMENTOS_ABC[np.digitize(valor_movimiento, cortes, right=True)]
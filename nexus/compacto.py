@@ -0,0 +1,65 @@
+"""Representación compacta (categórica y con tipos reducidos) del catálogo de Estrategia."""
+import numpy as np
+import pandas as pd
+
+from nexus.clasificador import ESTADOS
+
+COLUMNAS_CATEGORICAS = ['Categoria', 'Subcategoria', 'Proveedor']
+
+# Los montos en pesos se dejan en float64: las sumas sobre millones de SKUs
+# pierden precisión en float32. Ratios, días y puntajes sí se reducen.
+COLUMNAS_FLOAT32 = ['Margen_Pct', 'Dias_Inventario', 'Fill_Rate', 'Post_Venta']
+COLUMNAS_ENTERAS = ['Stock', 'Demanda_Mes', 'Lead_Time_Real']
+
+try:
+    import pyarrow  # noqa: F401
+    TIPO_TEXTO = "string[pyarrow]"  # Buffer contiguo en lugar de objetos Python
+except ImportError:
+    TIPO_TEXTO = object
+
+
+def compactar_catalogo(df):
+    """
+    Convierte el catálogo a su forma compacta:
+    categorías como `category` (códigos int8), Estado como enum ordenado,
+    enteros y ratios con el tipo más pequeño que los contiene.
+    """
+    df = df.copy()
+    for col in COLUMNAS_CATEGORICAS:
+        df[col] = df[col].astype('category')
+    df['Estado'] = pd.Categorical(df['Estado'], categories=ESTADOS, ordered=True)
+    for col in COLUMNAS_FLOAT32:
+        df[col] = df[col].astype(np.float32)
+    for col in COLUMNAS_ENTERAS:
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+    for col in ['SKU', 'Producto']:
+        df[col] = df[col].astype(TIPO_TEXTO)
+    return df
+
+
+def mascara_categorica(serie, valores):
+    """Máscara booleana de pertenencia evaluada sobre los códigos enteros."""
+    codigos = serie.cat.categories.get_indexer(list(valores))
+    return np.isin(serie.cat.codes.to_numpy(), codigos[codigos >= 0])
+
+
+def filtrar_catalogo(df, categorias=None, proveedores=None):
+    """Aplica los filtros globales con una sola selección (sin copiar si no hay filtros)."""
+    mascara = np.ones(len(df), dtype=bool)
+    if categorias:
+        mascara &= mascara_categorica(df['Categoria'], categorias)
+    if proveedores:
+        mascara &= mascara_categorica(df['Proveedor'], proveedores)
+    return df if mascara.all() else df[mascara]
+
+
+def reporte_memoria(antes, despues):
+    """Bytes por SKU de cada columna antes y después de compactar."""
+    n = max(len(antes), 1)
+    reporte = pd.DataFrame({
+        'Antes': antes.memory_usage(deep=True, index=False) / n,
+        'Despues': despues.memory_usage(deep=True, index=False) / n,
+    })
+    reporte.loc['TOTAL'] = reporte.sum()
+    reporte['Reduccion_Pct'] = (1 - reporte['Despues'] / reporte['Antes']) * 100
+    return reporte.round(1)
@@ -0,0 +1,102 @@
+"""
+Consolidación de traslados en envíos por carril (origen -> destino) y peso.
+
+Las líneas aprobadas se agrupan por carril y se empacan en vehículos de capacidad
+fija (kg) con First Fit Decreasing: cada pieza, de la más pesada a la más liviana,
+entra en el primer camión abierto del carril donde cabe. Una línea que no cabe
+en un camión se parte antes en tramos de unidades que sí caben (vectorizado).
+Las piezas de más de media capacidad no pueden compartir camión entre sí, así
+que cada una abre el suyo sin recorrer la lista; solo las livianas pasan por el
+bucle. FFD usa a lo sumo 11/9 del óptimo + 1 camiones por carril.
+"""
+import numpy as np
+import pandas as pd
+
+VEHICULOS = {
+    'Camioneta (1.5 t)': 1_500,
+    'Camión 350 (3.5 t)': 3_500,
+    'Camión Sencillo (8 t)': 8_000,
+    'Tractomula (32 t)': 32_000,
+}
+VEHICULO_BASE = 'Camión 350 (3.5 t)'
+CARRIL = ['Origen', 'Destino']
+
+
+def dividir_lineas(lineas, capacidad, cantidad='Cantidad', peso='Peso_Articulo'):
+    """
+    Parte cada línea cuyo peso supera la capacidad en tramos de unidades que caben
+    en un camión. Una unidad más pesada que el camión viaja sola (Sobrepeso=True).
+    """
+    q = lineas[cantidad].to_numpy(dtype=np.int64)
+    u = lineas[peso].to_numpy(dtype=np.float64)
+    por_camion = np.maximum(np.floor(capacidad / np.where(u > 0, u, 1.0)), 1).astype(np.int64)
+    partes = np.maximum(-(-q // por_camion), 1)
+    tramos = lineas.iloc[np.repeat(np.arange(len(lineas)), partes)].copy()
+
+    # Cantidad de cada tramo: por_camion salvo el último, que lleva el resto
+    ultimo = np.cumsum(partes) - 1
+    cant = np.repeat(por_camion, partes)
+    cant[ultimo] = q - (partes - 1) * por_camion
+    tramos[cantidad] = cant
+    tramos['Peso_kg'] = cant * np.repeat(u, partes)
+    tramos['Sobrepeso'] = tramos['Peso_kg'].to_numpy() > capacidad
+    return tramos
+
+
+def _ffd(pesos, capacidad):
+    """First Fit Decreasing sobre pesos ya ordenados de mayor a menor: camión (0..k-1) de cada pieza."""
+    camion = np.empty(len(pesos), dtype=np.int64)
+    # Las piezas de más de media capacidad abren cada una su camión
+    grandes = int(np.searchsorted(-pesos, -capacidad / 2, side='left'))
+    camion[:grandes] = np.arange(grandes)
+    restante = list(capacidad - pesos[:grandes])
+    for k in range(grandes, len(pesos)):
+        w = pesos[k]
+        for c, libre in enumerate(restante):
+            if libre >= w:
+                restante[c] = libre - w
+                camion[k] = c
+                break
+        else:
+            camion[k] = len(restante)
+            restante.append(capacidad - w)
+    return camion
+
+
+def consolidar_envios(lineas, capacidad, cantidad='Cantidad', peso='Peso_Articulo'):
+    """
+    Empaca las líneas (Origen, Destino, Cantidad, Peso_Articulo unitario, ...) en camiones
+    de `capacidad` kg por carril.
+
+    Devuelve (tramos, envios): los tramos de línea con su número de Envio y el resumen
+    por envío (carril, líneas, unidades, peso, ocupación).
+    """
+    tramos = dividir_lineas(lineas, capacidad, cantidad, peso)
+    carril = tramos.groupby(CARRIL, observed=True, sort=True).ngroup().to_numpy()
+    pesos = tramos['Peso_kg'].to_numpy(dtype=np.float64)
+    orden = np.lexsort((-pesos, carril))
+    cortes = np.flatnonzero(np.diff(carril[orden])) + 1
+
+    envio = np.empty(len(tramos), dtype=np.int64)
+    siguiente = 0
+    for idx in np.split(orden, cortes):
+        if not len(idx):
+            continue
+        local = _ffd(pesos[idx], capacidad)
+        envio[idx] = siguiente + local
+        siguiente += int(local.max()) + 1
+    tramos['Envio'] = envio + 1
+
+    envios = tramos.groupby('Envio', sort=True).agg(
+        Origen=('Origen', 'first'), Destino=('Destino', 'first'),
+        Lineas=(cantidad, 'size'), Unidades=(cantidad, 'sum'), Peso_kg=('Peso_kg', 'sum'),
+    ).reset_index()
+    envios['Capacidad_kg'] = float(capacidad)
+    envios['Ocupacion'] = envios['Peso_kg'] / capacidad
+    return tramos, envios
+
+
+def minimo_camiones(envios, capacidad):
+    """Cota inferior de camiones: ceil(peso del carril / capacidad) sumado sobre carriles."""
+    peso_carril = envios.groupby(CARRIL, observed=True)['Peso_kg'].sum().to_numpy()
+    return int(np.ceil(peso_carril / capacidad - 1e-9).sum())
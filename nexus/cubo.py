@@ -0,0 +1,92 @@
+"""Cubo pre-agregado Categoria x Proveedor x Estado para los KPIs de Estrategia."""
+import numpy as np
+import pandas as pd
+
+EJES = ['Categoria', 'Proveedor', 'Estado']
+
+# Medidas que se suman por celda (las medias se obtienen como suma / conteo)
+MEDIDAS_SUMA = ['Valor_Inventario', 'Utilidad_Mensual', 'Margen_Pct', 'Stock', 'Demanda_Mes', 'Lead_Time_Real', 'Fill_Rate']
+
+
+def construir_cubo(df):
+    """
+    Recorre el catálogo (compacto) una sola vez y acumula cada medida por celda.
+    Devuelve {'ejes': {eje: etiquetas}, 'medidas': {medida: arreglo (C, P, E)}}.
+    """
+    ejes = {eje: list(df[eje].cat.categories) for eje in EJES}
+    forma = tuple(len(etiquetas) for etiquetas in ejes.values())
+    celda = np.ravel_multi_index([df[eje].cat.codes.to_numpy() for eje in EJES], forma)
+    n_celdas = int(np.prod(forma))
+
+    def acumular(pesos=None, mascara=None):
+        idx = celda if mascara is None else celda[mascara]
+        if pesos is not None and mascara is not None:
+            pesos = pesos[mascara]
+        return np.bincount(idx, weights=pesos, minlength=n_celdas).reshape(forma)
+
+    medidas = {'Conteo': acumular()}
+    for medida in MEDIDAS_SUMA:
+        medidas[medida] = acumular(df[medida].to_numpy(dtype=np.float64))
+
+    # Días de inventario promedio: solo productos con demanda
+    con_demanda = df['Demanda_Mes'].to_numpy() > 0
+    medidas['Conteo_Con_Demanda'] = acumular(mascara=con_demanda)
+    medidas['Dias_Con_Demanda'] = acumular(df['Dias_Inventario'].to_numpy(dtype=np.float64), con_demanda)
+    return {'ejes': ejes, 'medidas': medidas}
+
+
+def seleccionar_cubo(cubo, categorias=None, proveedores=None):
+    """Sub-cubo de los filtros globales (lista vacía = todas), sin tocar filas."""
+    ejes = dict(cubo['ejes'])
+    indices = []
+    for eje, seleccion in (('Categoria', categorias), ('Proveedor', proveedores)):
+        etiquetas = pd.Index(ejes[eje])
+        idx = np.arange(len(etiquetas)) if not seleccion else etiquetas.get_indexer(list(seleccion))
+        idx = np.sort(idx[idx >= 0])  # Se conserva el orden del cubo
+        indices.append(idx)
+        ejes[eje] = list(etiquetas[idx])
+    seleccion = np.ix_(indices[0], indices[1], np.arange(len(ejes['Estado'])))
+    return {'ejes': ejes, 'medidas': {m: v[seleccion] for m, v in cubo['medidas'].items()}}
+
+
+def agregar_cubo(cubo, por):
+    """
+    Colapsa el cubo a los ejes de `por` (str o lista) y devuelve un DataFrame
+    con una columna por medida; solo las combinaciones con SKUs (observed=True).
+    """
+    por = [por] if isinstance(por, str) else list(por)
+    ejes_suma = tuple(i for i, eje in enumerate(EJES) if eje not in por)
+    orden = [EJES.index(eje) for eje in por]
+    columnas = {}
+    for medida, valores in cubo['medidas'].items():
+        agregado = valores.sum(axis=ejes_suma)
+        # Reordenar los ejes restantes según `por`
+        restantes = sorted(orden)
+        agregado = np.moveaxis(agregado, [restantes.index(i) for i in orden], range(len(orden)))
+        columnas[medida] = agregado.ravel()
+
+    indice = pd.MultiIndex.from_product([cubo['ejes'][eje] for eje in por], names=por)
+    resultado = pd.DataFrame(columnas, index=indice)
+    resultado = resultado[resultado['Conteo'] > 0]
+    if len(por) == 1:
+        resultado.index = resultado.index.get_level_values(0)
+    return resultado.reset_index()
+
+
+def kpis_cubo(cubo):
+    """KPIs globales de la selección a partir de las celdas del cubo."""
+    m = cubo['medidas']
+    estados = cubo['ejes']['Estado']
+    por_estado = {medida: m[medida].sum(axis=(0, 1)) for medida in ('Conteo', 'Valor_Inventario', 'Utilidad_Mensual')}
+    quiebre, excedente = estados.index("🔴 Quiebre"), estados.index("🔵 Excedente")
+    con_demanda = m['Conteo_Con_Demanda'].sum()
+    return {
+        'n_skus': int(m['Conteo'].sum()),
+        'total_inv': float(m['Valor_Inventario'].sum()),
+        'total_utilidad': float(m['Utilidad_Mensual'].sum()),
+        'dias_inv_avg': float(m['Dias_Con_Demanda'].sum() / con_demanda) if con_demanda > 0 else float('nan'),
+        'n_quiebres': int(por_estado['Conteo'][quiebre]),
+        'utilidad_quiebres': float(por_estado['Utilidad_Mensual'][quiebre]),
+        'n_excedentes': int(por_estado['Conteo'][excedente]),
+        'valor_excedentes': float(por_estado['Valor_Inventario'][excedente]),
+    }
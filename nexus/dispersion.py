@@ -0,0 +1,86 @@
+"""
+Dispersión Capital vs. Margen a nivel SKU con costo acotado en el navegador.
+
+Hasta UMBRAL_PUNTOS se dibujan los SKUs como puntos WebGL (scattergl); por encima,
+la densidad se agrega en el servidor en una rejilla fija (histograma 2D), de modo
+que el tamaño de la figura no depende del tamaño del catálogo.
+"""
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+UMBRAL_PUNTOS = 20_000
+BINS_CAPITAL, BINS_MARGEN = 60, 40
+
+
+def _bordes(valores, n_bins):
+    bajo, alto = float(np.nanmin(valores)), float(np.nanmax(valores))
+    if alto <= bajo:
+        alto = bajo + 1.0
+    return np.linspace(bajo, alto, n_bins + 1)
+
+
+def _indice_bin(valores, bordes):
+    return np.clip(np.searchsorted(bordes, valores, side='right') - 1, 0, len(bordes) - 2)
+
+
+def binear_dispersion(capital, margen, bins_capital=BINS_CAPITAL, bins_margen=BINS_MARGEN):
+    """
+    Histograma 2D de (capital, margen); el capital se bina en log10 porque abarca
+    varios órdenes de magnitud (los ceros caen en el primer bin).
+    Devuelve (resumen de bins no vacíos, código de bin por fila para el detalle).
+    """
+    capital = np.asarray(capital, dtype=np.float64)
+    margen = np.nan_to_num(np.asarray(margen, dtype=np.float64))
+    log_capital = np.log10(np.maximum(capital, 1.0))
+    bordes_x, bordes_y = _bordes(log_capital, bins_capital), _bordes(margen, bins_margen)
+
+    codigo = (_indice_bin(log_capital, bordes_x) * bins_margen + _indice_bin(margen, bordes_y)).astype(np.int32)
+    n_celdas = bins_capital * bins_margen
+    conteo = np.bincount(codigo, minlength=n_celdas)
+    suma_capital = np.bincount(codigo, weights=capital, minlength=n_celdas)
+
+    ocupados = np.flatnonzero(conteo)
+    bx, by = np.divmod(ocupados, bins_margen)
+    resumen = pd.DataFrame({
+        'Bin': ocupados,
+        'Capital_Min': 10 ** bordes_x[bx],
+        'Capital_Max': 10 ** bordes_x[bx + 1],
+        'Margen_Min': bordes_y[by],
+        'Margen_Max': bordes_y[by + 1],
+        'Conteo': conteo[ocupados],
+        'Valor_Inventario': suma_capital[ocupados],
+    })
+    return resumen, codigo
+
+
+def figura_puntos(df_skus):
+    """Un punto WebGL por SKU, coloreado por categoría."""
+    fig = px.scatter(
+        df_skus, x='Valor_Inventario', y='Margen_Pct', color='Categoria', hover_name='SKU',
+        render_mode='webgl', log_x=True, color_discrete_sequence=px.colors.qualitative.Pastel
+    )
+    fig.update_traces(marker=dict(size=5, opacity=0.7))
+    fig.update_layout(plot_bgcolor='rgba(0,0,0,0)', xaxis_title="Dinero Atrapado ($)", yaxis_title="Margen (%)", height=350, showlegend=False)
+    return fig
+
+
+def figura_densidad(resumen):
+    """Una celda por bin no vacío (a lo sumo BINS_CAPITAL x BINS_MARGEN marcadores), seleccionable."""
+    fig = go.Figure(go.Scattergl(
+        x=np.sqrt(resumen['Capital_Min'] * resumen['Capital_Max']),
+        y=(resumen['Margen_Min'] + resumen['Margen_Max']) / 2,
+        mode='markers',
+        marker=dict(
+            symbol='square', size=9, color=np.log10(resumen['Conteo']), colorscale='Blues',
+            colorbar=dict(title="SKUs", tickvals=[0, 1, 2, 3, 4, 5], ticktext=['1', '10', '100', '1k', '10k', '100k'])
+        ),
+        customdata=resumen[['Conteo', 'Valor_Inventario']],
+        hovertemplate="%{customdata[0]:,} SKUs<br>Capital: $%{customdata[1]:,.0f}<extra></extra>",
+    ))
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)', xaxis_title="Dinero Atrapado ($)", yaxis_title="Margen (%)",
+        xaxis_type='log', height=350, showlegend=False, clickmode='event+select'
+    )
+    return fig
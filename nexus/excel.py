@@ -0,0 +1,125 @@
+"""
+Exportación a Excel en streaming para órdenes grandes (compras y traslados).
+
+xlsxwriter en modo constant_memory escribe cada fila al disco apenas se completa,
+así la memoria no crece con el número de líneas. Las filas llegan en lotes de
+DataFrames (un DataFrame o cualquier iterador de lotes) y se escriben con
+write_number / write_string por columna, sin formatear a texto: moneda, enteros
+y decimales usan formatos numéricos nativos de columna, de modo que el proveedor
+puede sumar y filtrar en su Excel. Si las líneas superan el máximo de filas de
+una hoja, siguen en una hoja nueva con el mismo encabezado.
+"""
+import io
+
+import numpy as np
+import pandas as pd
+import xlsxwriter
+
+TAMANO_LOTE = 50_000
+MAX_FILAS_HOJA = 1_048_575  # Filas de datos por hoja (el límite de Excel menos el encabezado)
+ANCHO_MAX = 50
+
+FORMATO_MONEDA = '"$"#,##0'
+FORMATO_ENTERO = '#,##0'
+FORMATO_DECIMAL = '#,##0.00'
+PALABRAS_MONEDA = ('Costo', 'Precio', 'Valor', 'Total', 'Gasto')
+FORMATO_ENCABEZADO = {'bold': True, 'fg_color': '#2E86C1', 'font_color': 'white', 'border': 1}
+
+
+def lotes_de(df, tamano=TAMANO_LOTE):
+    """Rebanadas consecutivas de `df` (vistas, sin copiar)."""
+    for inicio in range(0, len(df), tamano):
+        yield df.iloc[inicio:inicio + tamano]
+
+
+def formato_columna(nombre, dtype):
+    """Formato numérico nativo según el nombre (moneda) o el tipo (entero / decimal); None para texto."""
+    if not pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_bool_dtype(dtype):
+        return None
+    if any(p.lower() in str(nombre).lower() for p in PALABRAS_MONEDA):
+        return FORMATO_MONEDA
+    return FORMATO_ENTERO if pd.api.types.is_integer_dtype(dtype) else FORMATO_DECIMAL
+
+
+def _ancho(nombre, serie):
+    """Ancho de columna: encabezado o percentil 95 del largo del texto del primer lote."""
+    muestra = serie.head(1000).astype(str).str.len()
+    largo = float(np.percentile(muestra, 95)) if len(muestra) else 0.0
+    return min(max(len(str(nombre)), largo + 2, 8), ANCHO_MAX)
+
+
+def _escritores(hoja, lote):
+    """Función de escritura por columna: números nativos, texto o NaN como celda vacía."""
+    escritores = []
+    for columna in lote.columns:
+        serie = lote[columna]
+        if pd.api.types.is_bool_dtype(serie.dtype):
+            escritores.append(hoja.write_boolean)
+        elif pd.api.types.is_numeric_dtype(serie.dtype):
+            # Enteros numpy no tienen NaN; float y enteros anulables (Int64) sí
+            escritores.append(hoja.write_number if serie.dtype.kind in 'iu' and not isinstance(serie.dtype, pd.api.extensions.ExtensionDtype) else _numero_o_vacio(hoja))
+        else:
+            escritores.append(_texto_o_vacio(hoja))
+    return escritores
+
+
+def _numero_o_vacio(hoja):
+    def escribir(fila, col, valor):
+        if valor is not None and valor is not pd.NA and valor == valor:  # NaN / NA quedan vacíos
+            hoja.write_number(fila, col, valor)
+    return escribir
+
+
+def _texto_o_vacio(hoja):
+    def escribir(fila, col, valor):
+        if valor is not None and valor == valor:
+            hoja.write_string(fila, col, str(valor))
+    return escribir
+
+
+def escribir_excel(lotes, destino=None, hoja='Reporte', formatos=None):
+    """
+    Escribe los lotes (un DataFrame o un iterador de DataFrames con las mismas columnas)
+    en un libro xlsx en constant_memory. `formatos` = {columna: formato Excel} reemplaza
+    los automáticos. Devuelve los bytes del libro si `destino` es None.
+    """
+    lotes = iter([lotes]) if isinstance(lotes, pd.DataFrame) else iter(lotes)
+    primero = next(lotes, None)
+    salida = destino if destino is not None else io.BytesIO()
+    libro = xlsxwriter.Workbook(salida, {'constant_memory': True})
+    encabezado = libro.add_format(FORMATO_ENCABEZADO)
+
+    columnas = list(primero.columns) if primero is not None else []
+    formatos_col = []
+    for columna in columnas:
+        num_format = (formatos or {}).get(columna) or formato_columna(columna, primero[columna].dtype)
+        formatos_col.append(libro.add_format({'num_format': num_format}) if num_format else None)
+    anchos = [_ancho(c, primero[c]) for c in columnas]
+
+    def nueva_hoja(numero):
+        ws = libro.add_worksheet(hoja if numero == 1 else f"{hoja} ({numero})"[:31])
+        # Formatos de columna antes de cualquier fila: en constant_memory las filas no se reescriben
+        for c, (ancho, fmt) in enumerate(zip(anchos, formatos_col)):
+            ws.set_column(c, c, ancho, fmt)
+        ws.write_row(0, 0, [str(c) for c in columnas], encabezado)
+        ws.freeze_panes(1, 0)
+        return ws
+
+    n_hoja, ws, fila = 1, nueva_hoja(1), 1
+    escritores = _escritores(ws, primero) if primero is not None else []
+    lote = primero
+    while lote is not None:
+        for valores in zip(*(lote[c].tolist() for c in columnas)):
+            if fila > MAX_FILAS_HOJA:
+                ws.autofilter(0, 0, fila - 1, len(columnas) - 1)
+                n_hoja += 1
+                ws, fila = nueva_hoja(n_hoja), 1
+                escritores = _escritores(ws, lote)
+            for c, valor in enumerate(valores):
+                escritores[c](fila, c, valor)
+            fila += 1
+        lote = next(lotes, None)
+    if columnas:
+        ws.autofilter(0, 0, max(fila - 1, 1), len(columnas) - 1)
+    libro.close()
+    return salida.getvalue() if destino is None else None
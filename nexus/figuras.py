@@ -0,0 +1,57 @@
+"""Memoización de figuras Plotly entre reruns, por hash del contenido de sus datos."""
+import hashlib
+import json
+import threading
+
+import numpy as np
+import pandas as pd
+
+from nexus.cache_vistas import CacheVistas, tamano_bytes
+
+# Una sola cache por proceso: las figuras son de solo lectura y se comparten entre sesiones
+_CACHE_FIGURAS = CacheVistas(max_entradas=256, max_bytes=128 * 1024 ** 2)
+_LOCK = threading.Lock()
+
+BYTES_BASE_FIGURA = 20_000  # Layout, plantilla y trazas vacías
+
+
+def hash_datos(datos):
+    """Hash estable del contenido (valores, columnas y tipos) de los datos de una figura."""
+    h = hashlib.blake2b(digest_size=16)
+    if isinstance(datos, pd.Series):
+        datos = datos.to_frame()
+    if isinstance(datos, pd.DataFrame):
+        h.update(pd.util.hash_pandas_object(datos, index=True).to_numpy().tobytes())
+        h.update(repr(list(zip(map(str, datos.columns), map(str, datos.dtypes)))).encode())
+    elif isinstance(datos, np.ndarray):
+        h.update(np.ascontiguousarray(datos).tobytes())
+        h.update(str((datos.dtype, datos.shape)).encode())
+    else:
+        h.update(json.dumps(datos, sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+
+def figura_cacheada(constructor, datos, **opciones):
+    """
+    Devuelve `constructor(datos, **opciones)` reutilizando la figura ya construida
+    si los datos y las opciones no cambiaron. El constructor debe dejar la figura
+    completa (incluyendo update_layout/update_traces): la figura en cache no se modifica.
+    """
+    clave = (
+        constructor.__code__.co_filename,
+        constructor.__qualname__,
+        hash_datos(datos),
+        json.dumps(opciones, sort_keys=True, default=str),
+    )
+    with _LOCK:
+        return _CACHE_FIGURAS.obtener(
+            clave,
+            lambda: constructor(datos, **opciones),
+            medir=lambda _fig: tamano_bytes(datos) * 2 + BYTES_BASE_FIGURA,
+        )
+
+
+def estadisticas_figuras():
+    """Contadores de la cache de figuras del proceso."""
+    with _LOCK:
+        return _CACHE_FIGURAS.estadisticas()
@@ -0,0 +1,209 @@
+"""Generadores vectorizados: catálogo de Estrategia y red de tiendas de Logística."""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from nexus.clasificador import SEGMENTOS_ABC, clasificar_abc, clasificar_estado, cobertura_logistica, dias_cobertura, etiquetas_estado
+
+# ==============================================================================
+# --- PARÁMETROS POR DEFECTO DEL CATÁLOGO ---
+# ==============================================================================
+CATEGORIAS = {
+    'Herramientas': ['Taladros', 'Pulidoras', 'Sierras', 'Kits Manuales'],
+    'Construcción': ['Cementos', 'Aditivos', 'Impermeabilizantes', 'Estucos'],
+    'Acabados': ['Pintura Tipo 1', 'Esmaltes', 'Brochas', 'Rodillos'],
+    'Eléctricos': ['Cableado', 'Tomas', 'Iluminación LED', 'Tableros'],
+    'Plomería': ['Tubos PVC', 'Grifería', 'Accesorios', 'Pegamentos']
+}
+
+# Rangos (min, max) de las métricas de evaluación de cada proveedor
+PERFILES_PROVEEDOR = {
+    'DistriGlobal': {'lead_time': (2, 5), 'fill_rate': (0.95, 1.0), 'post_venta': (8, 10)},
+    'FerreAbastos': {'lead_time': (5, 15), 'fill_rate': (0.85, 0.98), 'post_venta': (6, 9)},
+    'MegaTools': {'lead_time': (10, 25), 'fill_rate': (0.70, 0.90), 'post_venta': (4, 7)},
+    'Importados SA': {'lead_time': (5, 15), 'fill_rate': (0.85, 0.98), 'post_venta': (6, 9)},
+}
+
+COLUMNAS = [
+    'SKU', 'Producto', 'Categoria', 'Subcategoria', 'Proveedor', 'Costo', 'Precio',
+    'Margen_Pct', 'Utilidad_Mensual', 'Stock', 'Demanda_Mes', 'Valor_Inventario',
+    'Dias_Inventario', 'Lead_Time_Real', 'Fill_Rate', 'Post_Venta', 'Estado'
+]
+
+
+def _rango_perfil(perfiles, metrica):
+    """Arreglos (min, max) de una métrica, en el orden de los proveedores."""
+    bajos = np.array([p[metrica][0] for p in perfiles.values()], dtype=float)
+    altos = np.array([p[metrica][1] for p in perfiles.values()], dtype=float)
+    return bajos, altos
+
+
+def generar_catalogo(n_skus, categorias=None, perfiles=None, rng=None, inicio=0, total=None):
+    """
+    Construye el catálogo de SKUs con operaciones sobre arreglos completos.
+    `inicio`/`total` ubican el bloque dentro de un catálogo mayor (particiones),
+    de modo que categorías y códigos SKU no dependen de cómo se particione.
+    """
+    categorias = categorias or CATEGORIAS
+    perfiles = perfiles or PERFILES_PROVEEDOR
+    rng = rng if rng is not None else np.random.default_rng(42)
+    total = total or n_skus
+
+    # Categorías en bloques iguales (como los 30 SKUs por categoría originales)
+    nombres_cat = list(categorias)
+    idx_global = np.arange(inicio, inicio + n_skus)
+    cat_idx = (idx_global * len(nombres_cat)) // max(total, 1)
+
+    # Subcategoría: aleatoria dentro de la lista de su categoría
+    n_sub = np.array([len(categorias[c]) for c in nombres_cat])
+    desplaz = np.concatenate(([0], np.cumsum(n_sub)[:-1]))
+    todas_sub = np.array([s for c in nombres_cat for s in categorias[c]], dtype=object)
+    sub_idx = desplaz[cat_idx] + (rng.random(n_skus) * n_sub[cat_idx]).astype(np.int64)
+
+    # Economía del producto
+    costo = rng.uniform(5000, 250000, n_skus)
+    margen = rng.uniform(0.15, 0.55, n_skus)  # Margen bruto
+    precio = costo * (1 + margen)
+    demanda = rng.poisson(25, n_skus)
+    stock = (demanda * rng.uniform(0, 5, n_skus)).astype(np.int64)
+
+    # Métricas del proveedor según su perfil
+    nombres_prov = np.array(list(perfiles), dtype=object)
+    prov_idx = rng.integers(0, len(nombres_prov), n_skus)
+    lt_bajo, lt_alto = _rango_perfil(perfiles, 'lead_time')
+    fr_bajo, fr_alto = _rango_perfil(perfiles, 'fill_rate')
+    pv_bajo, pv_alto = _rango_perfil(perfiles, 'post_venta')
+    lead_time = rng.integers(lt_bajo[prov_idx].astype(np.int64), lt_alto[prov_idx].astype(np.int64))
+    fill_rate = rng.uniform(fr_bajo[prov_idx], fr_alto[prov_idx])
+    post_venta = rng.uniform(pv_bajo[prov_idx], pv_alto[prov_idx])
+
+    # Días de cobertura y estado (Quiebre / Riesgo / Óptimo / Excedente)
+    dias = dias_cobertura(stock, demanda)
+    estado = etiquetas_estado(clasificar_estado(stock, demanda, dias=dias))
+
+    prefijos = np.array([c[:3].upper() for c in nombres_cat], dtype=object)
+    subcat = pd.Series(todas_sub[sub_idx])
+    sku = pd.Series(prefijos[cat_idx]) + "-" + pd.Series(idx_global + 1).astype(str).str.zfill(len(str(total)))
+    producto = subcat + " Pro " + pd.Series(rng.integers(100, 1000, n_skus)).astype(str)
+
+    return pd.DataFrame({
+        'SKU': sku,
+        'Producto': producto,
+        'Categoria': np.array(nombres_cat, dtype=object)[cat_idx],
+        'Subcategoria': subcat,
+        'Proveedor': nombres_prov[prov_idx],
+        'Costo': costo,
+        'Precio': precio,
+        'Margen_Pct': margen,
+        'Utilidad_Mensual': (precio - costo) * demanda,
+        'Stock': stock,
+        'Demanda_Mes': demanda,
+        'Valor_Inventario': stock * costo,
+        'Dias_Inventario': dias,
+        'Lead_Time_Real': lead_time,
+        'Fill_Rate': fill_rate,
+        'Post_Venta': post_venta,
+        'Estado': estado
+    }, columns=COLUMNAS)
+
+
+def _generar_particion(args):
+    """Punto de entrada de cada proceso: genera un bloque del catálogo."""
+    inicio, n, total, categorias, perfiles, semilla = args
+    return generar_catalogo(n, categorias, perfiles, np.random.default_rng(semilla), inicio, total)
+
+
+def generar_catalogo_particionado(n_skus, n_particiones=4, categorias=None, perfiles=None, seed=42, procesos=None):
+    """
+    Genera catálogos grandes repartiendo particiones entre procesos.
+    Cada partición recibe su propio flujo aleatorio (SeedSequence.spawn), así
+    el resultado es reproducible para una misma semilla y número de particiones.
+    """
+    n_particiones = max(1, min(n_particiones, n_skus))
+    limites = np.linspace(0, n_skus, n_particiones + 1).astype(np.int64)
+    semillas = np.random.SeedSequence(seed).spawn(n_particiones)
+    tareas = [
+        (int(limites[i]), int(limites[i + 1] - limites[i]), n_skus, categorias, perfiles, semillas[i])
+        for i in range(n_particiones)
+    ]
+
+    if procesos == 1 or n_particiones == 1:
+        partes = [_generar_particion(t) for t in tareas]
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            partes = list(pool.map(_generar_particion, tareas))
+    return pd.concat(partes, ignore_index=True)
+
+
+# ==============================================================================
+# --- RED DE TIENDAS (PÁGINA DE LOGÍSTICA) ---
+# ==============================================================================
+TIENDAS_BASE = ['Sede Principal', 'Norte', 'Sur', 'Occidente', 'Outlet']
+CATEGORIAS_LOGISTICA = ['Herramientas', 'Construcción', 'Eléctricos', 'Pinturas', 'Seguridad Ind.']
+PROVEEDORES_LOGISTICA = ['DISTRIBUIDORA GLOBAL', 'IMPORTADOS S.A.', 'ACEROS DEL CARIBE', 'HERRAMIENTAS PRO', 'ELECTRO-MUNDO']
+MARCAS_LOGISTICA = ['Makita', 'Bosch', '3M', 'Pintuco', 'Schneider']
+
+COLUMNAS_LOGISTICA = [
+    'SKU', 'Descripcion', 'Categoria', 'Marca_Nombre', 'Proveedor', 'Almacen_Nombre', 'Stock',
+    'Costo_Promedio_UND', 'Precio_Venta', 'Peso_Articulo', 'Demanda_Mes', 'Necesidad_Total',
+    'Excedente_Trasladable', 'Stock_En_Transito', 'Segmento_ABC'
+]
+
+
+def nombres_tiendas(n_tiendas):
+    """Las 5 sedes del demo y, para redes más grandes, 'Tienda 006', 'Tienda 007', ..."""
+    extra = [f"Tienda {i:03d}" for i in range(len(TIENDAS_BASE) + 1, n_tiendas + 1)]
+    return (TIENDAS_BASE + extra)[:n_tiendas]
+
+
+def generar_red_tiendas(n_skus=80, n_tiendas=5, rng=None):
+    """
+    Maestro de Logística en formato largo (una fila por SKU x tienda), sin bucles:
+    los atributos del SKU (categoría, marca, proveedor, costo, peso) se sortean una vez
+    y se repiten por tienda; stock y demanda se sortean en una matriz SKU x tienda.
+    Los textos quedan como categóricas, así 100k SKUs x 200 tiendas caben en memoria.
+    """
+    rng = rng or np.random.default_rng()
+    categorias = np.array(CATEGORIAS_LOGISTICA, dtype=object)
+
+    # Atributos por SKU
+    cat_idx = rng.integers(0, len(categorias), n_skus)
+    numero = pd.Series(np.arange(1001, 1001 + n_skus)).astype(str)
+    prefijos = np.array([c[:3].upper() for c in categorias], dtype=object)
+    sku = pd.Series(prefijos[cat_idx]) + "-" + numero
+    descripcion = "Item " + pd.Series(categorias[cat_idx]) + " Profesional " + numero
+    marca_idx = rng.integers(0, len(MARCAS_LOGISTICA), n_skus)
+    prov_idx = rng.integers(0, len(PROVEEDORES_LOGISTICA), n_skus)
+    costo = rng.integers(5000, 250000, n_skus)
+    peso = np.round(rng.uniform(0.5, 10.0, n_skus), 2)
+
+    # Por celda SKU x tienda; escenarios forzados del demo: 15% quiebre y 10% excedente
+    demanda = rng.integers(0, 60, (n_skus, n_tiendas), dtype=np.int32)
+    stock = rng.integers(0, 120, (n_skus, n_tiendas), dtype=np.int32)
+    stock[rng.random((n_skus, n_tiendas), dtype=np.float32) < 0.15] = 0
+    stock[rng.random((n_skus, n_tiendas), dtype=np.float32) < 0.10] = 300
+    stock, demanda = stock.ravel(), demanda.ravel()
+
+    por_sku = np.repeat(np.arange(n_skus, dtype=np.int32), n_tiendas)
+    df = pd.DataFrame({
+        'SKU': pd.Categorical.from_codes(por_sku, sku),
+        'Descripcion': pd.Categorical.from_codes(por_sku, descripcion),
+        'Categoria': pd.Categorical.from_codes(cat_idx[por_sku], CATEGORIAS_LOGISTICA),
+        'Marca_Nombre': pd.Categorical.from_codes(marca_idx[por_sku], MARCAS_LOGISTICA),
+        'Proveedor': pd.Categorical.from_codes(prov_idx[por_sku], PROVEEDORES_LOGISTICA),
+        'Almacen_Nombre': pd.Categorical.from_codes(np.tile(np.arange(n_tiendas, dtype=np.int32), n_skus), nombres_tiendas(n_tiendas)),
+        'Stock': stock,
+        'Costo_Promedio_UND': costo[por_sku],
+        'Precio_Venta': costo[por_sku] * 1.4,
+        'Peso_Articulo': peso[por_sku].astype(np.float32),
+        'Demanda_Mes': demanda,
+        'Stock_En_Transito': np.zeros(len(stock), dtype=np.int32),
+    })
+
+    # Reglas de negocio: cobertura ideal 1.5 meses, excedente sobre 3 meses; ABC por valor de movimiento
+    necesidad, excedente = cobertura_logistica(stock, demanda, meses_objetivo=1.5, meses_excedente=3)
+    df['Necesidad_Total'] = necesidad.astype(np.int32)
+    df['Excedente_Trasladable'] = excedente.astype(np.int32)
+    df['Segmento_ABC'] = pd.Categorical(clasificar_abc(demanda * df['Costo_Promedio_UND'].to_numpy()), categories=sorted(SEGMENTOS_ABC))
+    return df[COLUMNAS_LOGISTICA]
@@ -0,0 +1,231 @@
+"""
+Historia de inventario: snapshots diarios en Parquet particionado por fecha.
+
+Estructura en disco (una carpeta por origen: 'estrategia', 'logistica'):
+    <ruta>/<origen>/fecha=YYYY-MM-DD/snapshot.parquet   filas por SKU (o SKU x tienda)
+    <ruta>/<origen>/kpis_diarios.parquet                 una fila por fecha x grupo
+    <ruta>/<origen>/estado_claves.parquet                días en quiebre 30/90 por clave
+
+Al llegar un snapshot solo se agrega ese día; las ventanas móviles (30/90 días)
+se actualizan sobre la tabla diaria, que es pequeña (fechas x grupos). Las
+consultas por rango abren únicamente las particiones de ese rango.
+"""
+import os
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from nexus.clasificador import EXCEDENTE, QUIEBRE, clasificar_estado
+
+RUTA_HISTORIA = os.environ.get("NEXUS_HISTORIA", "data/historia")
+VENTANAS = (30, 90)
+COLUMNAS_SNAPSHOT = ['Clave', 'Grupo', 'Stock', 'Demanda_Mes', 'Valor_Inventario', 'Estado']
+
+
+# ==============================================================================
+# --- ADAPTADORES: FRAME DEL TABLERO -> SNAPSHOT NORMALIZADO ---
+# ==============================================================================
+def snapshot_estrategia(df):
+    """Catálogo de Estrategia -> snapshot (grupo = Categoría; Estado como código int8)."""
+    return pd.DataFrame({
+        'Clave': df['SKU'].astype(str).to_numpy(),
+        'Grupo': df['Categoria'].astype(str).to_numpy(),
+        'Stock': df['Stock'].to_numpy(np.int64),
+        'Demanda_Mes': df['Demanda_Mes'].to_numpy(np.int64),
+        'Valor_Inventario': df['Valor_Inventario'].to_numpy(np.float64),
+        'Estado': clasificar_estado(df['Stock'], df['Demanda_Mes']),
+    })
+
+
+def snapshot_logistica(df):
+    """Maestro de Logística -> snapshot (clave = SKU@tienda; grupo = tienda)."""
+    return pd.DataFrame({
+        'Clave': (df['SKU'].astype(str) + '@' + df['Almacen_Nombre'].astype(str)).to_numpy(),
+        'Grupo': df['Almacen_Nombre'].astype(str).to_numpy(),
+        'Stock': df['Stock'].to_numpy(np.int64),
+        'Demanda_Mes': df['Demanda_Mes'].to_numpy(np.int64),
+        'Valor_Inventario': (df['Stock'] * df['Costo_Promedio_UND']).to_numpy(np.float64),
+        'Estado': clasificar_estado(df['Stock'], df['Demanda_Mes']),
+    })
+
+
+# ==============================================================================
+# --- AGREGADOS Y VENTANAS MÓVILES ---
+# ==============================================================================
+def agregado_diario(snapshot, fecha):
+    """KPIs de un día por grupo (una pasada sobre el snapshot)."""
+    quiebre = snapshot['Estado'] == QUIEBRE
+    excedente = snapshot['Estado'] == EXCEDENTE
+    diario = snapshot.assign(
+        Quiebres=quiebre.astype(np.int64),
+        Excedentes=excedente.astype(np.int64),
+        Valor_Excedente=snapshot['Valor_Inventario'].where(excedente, 0.0),
+    ).groupby('Grupo', observed=True).agg(
+        SKUs=('Clave', 'size'), Stock=('Stock', 'sum'), Demanda_Mes=('Demanda_Mes', 'sum'),
+        Valor_Inventario=('Valor_Inventario', 'sum'), Quiebres=('Quiebres', 'sum'),
+        Excedentes=('Excedentes', 'sum'), Valor_Excedente=('Valor_Excedente', 'sum'),
+    ).reset_index()
+    diario.insert(0, 'Fecha', pd.Timestamp(fecha))
+    return diario
+
+
+def ventanas_moviles(diario):
+    """
+    Columnas móviles por grupo sobre la tabla diaria (ventanas en días calendario):
+    Rotacion_N (días de cobertura con stock y demanda de la ventana), Dias_Quiebre_N
+    (SKU-días en quiebre) y Valor_Excedente_N (promedio diario).
+    """
+    diario = diario.sort_values(['Grupo', 'Fecha']).reset_index(drop=True)
+    grupos = diario.set_index('Fecha').groupby('Grupo', observed=True, sort=False)
+    for n in VENTANAS:
+        suma = grupos[['Stock', 'Demanda_Mes', 'Quiebres']].rolling(f'{n}D').sum().reset_index(drop=True)
+        demanda = suma['Demanda_Mes'].where(suma['Demanda_Mes'] > 0)
+        diario[f'Rotacion_{n}'] = (suma['Stock'] / demanda * 30).to_numpy()
+        diario[f'Dias_Quiebre_{n}'] = suma['Quiebres'].to_numpy()
+        diario[f'Valor_Excedente_{n}'] = grupos['Valor_Excedente'].rolling(f'{n}D').mean().reset_index(drop=True).to_numpy()
+    return diario
+
+
+# ==============================================================================
+# --- ALMACÉN PARTICIONADO ---
+# ==============================================================================
+class StoreHistoria:
+    """Snapshots diarios de un origen ('estrategia' o 'logistica')."""
+
+    def __init__(self, ruta=RUTA_HISTORIA, origen='estrategia'):
+        self.ruta = os.path.join(ruta, origen)
+        os.makedirs(self.ruta, exist_ok=True)
+        self._ruta_kpis = os.path.join(self.ruta, 'kpis_diarios.parquet')
+        self._ruta_estado = os.path.join(self.ruta, 'estado_claves.parquet')
+
+    def _ruta_particion(self, fecha):
+        return os.path.join(self.ruta, f"fecha={pd.Timestamp(fecha):%Y-%m-%d}", 'snapshot.parquet')
+
+    def fechas(self):
+        """Fechas con snapshot, leídas de los nombres de carpeta (sin abrir archivos)."""
+        return sorted(
+            date.fromisoformat(d.split('=', 1)[1])
+            for d in os.listdir(self.ruta) if d.startswith('fecha=')
+        )
+
+    def tiene(self, fecha):
+        return os.path.exists(self._ruta_particion(fecha))
+
+    @staticmethod
+    def _escribir(df, destino):
+        temporal = destino + '.tmp'
+        df.to_parquet(temporal, index=False)
+        os.replace(temporal, destino)
+
+    # --- Escritura ---
+    def guardar(self, fecha, snapshot):
+        """
+        Escribe la partición del día y actualiza, de forma incremental, los KPIs
+        diarios/móviles y los días en quiebre por clave.
+        """
+        fecha = pd.Timestamp(fecha).date()
+        destino = self._ruta_particion(fecha)
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        snapshot = snapshot[COLUMNAS_SNAPSHOT]
+        self._escribir(snapshot, destino)
+
+        # Tabla diaria: se reemplaza el día y se recalculan solo las filas cuyas ventanas lo contienen
+        dia = pd.Timestamp(fecha)
+        nuevo = agregado_diario(snapshot, fecha)
+        diario = self.kpis()
+        if diario.empty:
+            diario = ventanas_moviles(nuevo)
+        else:
+            diario = diario[diario['Fecha'] != dia]
+            inicio = dia - pd.Timedelta(days=max(VENTANAS) - 1)
+            recalculo = ventanas_moviles(pd.concat([diario.loc[diario['Fecha'] >= inicio, nuevo.columns], nuevo], ignore_index=True))
+            diario = pd.concat([diario[diario['Fecha'] < dia], recalculo[recalculo['Fecha'] >= dia]], ignore_index=True)
+        self._escribir(diario.sort_values(['Fecha', 'Grupo'], ignore_index=True), self._ruta_kpis)
+
+        self._actualizar_estado_claves(fecha, snapshot)
+
+    def _actualizar_estado_claves(self, fecha, snapshot):
+        """
+        Días en quiebre por clave en las últimas 30/90 fechas. Si el día llega en orden
+        (sigue a la última fecha registrada) se suma el día nuevo y se resta el que
+        sale de cada ventana leyendo solo esas dos particiones; si no (hueco, reescritura
+        o relleno de un día pasado), se recalcula a la última fecha desde las particiones
+        del rango.
+        """
+        estado = pd.read_parquet(self._ruta_estado) if os.path.exists(self._ruta_estado) else None
+        ultima = pd.Timestamp(estado['Hasta'].iloc[0]).date() if estado is not None and len(estado) else None
+        en_quiebre = pd.Series((snapshot['Estado'] == QUIEBRE).astype(np.int64).to_numpy(), index=snapshot['Clave'])
+
+        if ultima is not None and fecha == ultima + timedelta(days=1):
+            estado = estado.set_index('Clave')
+            claves = estado.index.union(en_quiebre.index)
+            estado = estado.reindex(claves, fill_value=0)
+            for n in VENTANAS:
+                columna = f'Dias_Quiebre_{n}'
+                estado[columna] += en_quiebre.reindex(claves, fill_value=0)
+                saliente = fecha - timedelta(days=n)
+                if self.tiene(saliente):
+                    viejo = pd.read_parquet(self._ruta_particion(saliente), columns=['Clave', 'Estado'])
+                    estado[columna] -= (viejo.set_index('Clave')['Estado'] == QUIEBRE).astype(np.int64).reindex(claves, fill_value=0)
+            estado = estado.reset_index(names='Clave')
+            hasta = fecha
+        elif ultima is not None and fecha <= ultima - timedelta(days=max(VENTANAS)):
+            return  # Relleno anterior a todas las ventanas: el estado no cambia
+        else:
+            hasta = max(fecha, ultima) if ultima is not None else fecha
+            estado = None
+            for n in VENTANAS:
+                rango = self.leer_rango(hasta - timedelta(days=n - 1), hasta, columnas=['Clave', 'Estado'])
+                conteo = (rango['Estado'] == QUIEBRE).groupby(rango['Clave']).sum().rename(f'Dias_Quiebre_{n}')
+                estado = conteo.to_frame() if estado is None else estado.join(conteo, how='outer')
+            estado = estado.fillna(0).astype(np.int64).reset_index(names='Clave')
+        estado['Hasta'] = pd.Timestamp(hasta)
+        self._escribir(estado, self._ruta_estado)
+
+    # --- Lectura ---
+    def kpis(self, desde=None, hasta=None, grupos=None):
+        """Tabla diaria con ventanas móviles (no toca los snapshots)."""
+        if not os.path.exists(self._ruta_kpis):
+            return pd.DataFrame()
+        filtros = []
+        if desde is not None:
+            filtros.append(('Fecha', '>=', pd.Timestamp(desde)))
+        if hasta is not None:
+            filtros.append(('Fecha', '<=', pd.Timestamp(hasta)))
+        if grupos:
+            filtros.append(('Grupo', 'in', list(grupos)))
+        return pd.read_parquet(self._ruta_kpis, filters=filtros or None)
+
+    def dias_quiebre(self):
+        """Días en quiebre (30/90) por clave a la última fecha registrada."""
+        if not os.path.exists(self._ruta_estado):
+            return pd.DataFrame(columns=['Clave'] + [f'Dias_Quiebre_{n}' for n in VENTANAS])
+        return pd.read_parquet(self._ruta_estado)
+
+    def leer_rango(self, desde, hasta, columnas=None):
+        """Filas de los snapshots entre dos fechas (inclusive), abriendo solo esas particiones."""
+        desde, hasta = pd.Timestamp(desde).date(), pd.Timestamp(hasta).date()
+        partes = [
+            pd.read_parquet(self._ruta_particion(f), columns=columnas).assign(Fecha=pd.Timestamp(f))
+            for f in self.fechas() if desde <= f <= hasta
+        ]
+        return pd.concat(partes, ignore_index=True) if partes else pd.DataFrame(columns=(columnas or COLUMNAS_SNAPSHOT) + ['Fecha'])
+
+
+def simular_historia(store, df, dias=730, hasta=None, rng=None, adaptador=snapshot_estrategia):
+    """Rellena `dias` snapshots diarios con un paseo aleatorio del stock (demos y benchmarks)."""
+    rng = rng if rng is not None else np.random.default_rng(42)
+    hasta = pd.Timestamp(hasta or date.today()).date()
+    base = adaptador(df)
+    stock = base['Stock'].to_numpy(np.float64)
+    demanda = np.maximum(base['Demanda_Mes'].to_numpy(np.float64), 1)
+    costo_unit = np.where(stock > 0, base['Valor_Inventario'] / np.maximum(stock, 1), 0)
+    for i in range(dias, 0, -1):
+        # Consumo diario ~ demanda/30 y reposición periódica que a veces llega tarde
+        stock = np.maximum(0, stock - rng.poisson(demanda / 30))
+        repone = rng.random(len(stock)) < 0.05
+        stock = np.where(repone, stock + demanda * rng.uniform(1, 4, len(stock)), stock)
+        dia = base.assign(Stock=stock.astype(np.int64), Valor_Inventario=stock * costo_unit)
+        dia['Estado'] = clasificar_estado(dia['Stock'], dia['Demanda_Mes'])
+        store.guardar(hasta - timedelta(days=i - 1), dia)
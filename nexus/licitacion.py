@@ -0,0 +1,169 @@
+"""Motor de licitación de proveedores sobre una matriz SKU x Proveedor."""
+import numpy as np
+import pandas as pd
+
+# Ofertas de referencia por proveedor (fijas para mantener la consistencia del demo)
+OFERTAS_BASE = {
+    'DistriGlobal': {'factor_precio': 1.05, 'tiempo': 3, 'fill': 0.98, 'post': 9.0},   # Más caro (mejor calidad/servicio)
+    'FerreAbastos': {'factor_precio': 1.00, 'tiempo': 7, 'fill': 0.92, 'post': 8.0},   # Promedio
+    'MegaTools': {'factor_precio': 0.90, 'tiempo': 20, 'fill': 0.80, 'post': 5.0},     # Muy barato (peor calidad/servicio)
+    'Importados SA': {'factor_precio': 0.95, 'tiempo': 10, 'fill': 0.90, 'post': 7.0},
+}
+
+# Ponderación del cliente: 80% Precio, 10% Tiempo, 5% Fill Rate, 5% Postventa
+PESOS_BASE = {'precio': 0.80, 'tiempo': 0.10, 'fill': 0.05, 'post': 0.05}
+
+CRITERIOS = ['factor_precio', 'tiempo', 'fill', 'post']
+
+ELEMENTOS_BLOQUE = 4_000_000  # Celdas perfil x punto por bloque del barrido de pesos (~32 MB)
+
+
+def matriz_ofertas_fija(n_skus, ofertas=None):
+    """
+    Matriz de ofertas con la misma oferta de cada proveedor para todos los SKUs.
+    Devuelve {'proveedores': [...], criterio: arreglo (n_skus, n_proveedores)};
+    se usan vistas con broadcast, por lo que no ocupa memoria por SKU.
+    """
+    ofertas = ofertas or OFERTAS_BASE
+    matriz = {'proveedores': list(ofertas)}
+    for criterio in CRITERIOS:
+        fila = np.array([o[criterio] for o in ofertas.values()], dtype=float)
+        matriz[criterio] = np.broadcast_to(fila, (n_skus, len(fila)))
+    return matriz
+
+
+def scores_criterios(matriz):
+    """Score 0-100 de cada oferta en cada criterio, arreglo (n_skus, n_proveedores, 4)."""
+    # Precio: menor es mejor (costo / precio ofertado = 1 / factor)
+    score_precio = 100.0 / matriz['factor_precio']
+    # Tiempo: 3 días = 91, 20 días = 40
+    score_tiempo = np.maximum(0.0, 100.0 - matriz['tiempo'] * 3)
+    score_fill = matriz['fill'] * 100
+    score_post = matriz['post'] * 10  # Post venta es sobre 10
+    return np.stack([score_precio, score_tiempo, score_fill, score_post], axis=-1)
+
+
+def puntuar_ofertas(matriz, pesos=None):
+    """Score 0-100 de cada oferta, arreglo (n_skus, n_proveedores). Sin oferta -> -inf."""
+    pesos = pesos or PESOS_BASE
+    scores = scores_criterios(matriz) @ np.array([pesos[p] for p in PESOS_BASE], dtype=float)
+    return np.where(np.isnan(scores), -np.inf, scores)
+
+
+def licitar(matriz, pesos=None, index=None):
+    """
+    Licitación de todo el catálogo en una sola pasada de NumPy.
+    Devuelve por SKU el ganador, el segundo lugar y el margen de puntaje entre ambos.
+    """
+    scores = puntuar_ofertas(matriz, pesos)
+    proveedores = np.array(matriz['proveedores'], dtype=object)
+    n, k = scores.shape
+    filas = np.arange(n)
+
+    if k == 1:
+        top1 = top2 = np.zeros(n, dtype=np.int64)
+        score_2 = np.full(n, -np.inf)
+    else:
+        # Los dos mejores por fila sin ordenar toda la fila (kth=1 deja el mejor en la posición 0)
+        mejores = np.argpartition(-scores, 1, axis=1)
+        top1, top2 = mejores[:, 0], mejores[:, 1]
+        score_2 = scores[filas, top2]
+    score_1 = scores[filas, top1]
+
+    resultado = pd.DataFrame({
+        'Mejor_Opcion_IA': proveedores[top1],
+        'Segunda_Opcion': proveedores[top2],
+        'Score_Ganador': score_1,
+        'Margen_Score': np.where(np.isfinite(score_2), score_1 - score_2, np.nan),
+    }, index=index)
+    # Sin oferta válida no hay recomendación
+    resultado.loc[~np.isfinite(score_1), 'Mejor_Opcion_IA'] = None
+    resultado.loc[~np.isfinite(score_2), 'Segunda_Opcion'] = None
+    return resultado
+
+
+# --- Sensibilidad a los pesos ---
+
+def malla_pesos(paso=0.05):
+    """Combinaciones de pesos (precio, tiempo, fill, post) que suman 1, con el paso dado."""
+    n = int(round(1 / paso))
+    a, b, c = np.meshgrid(np.arange(n + 1), np.arange(n + 1), np.arange(n + 1), indexing='ij')
+    validos = a + b + c <= n
+    enteros = np.column_stack([a[validos], b[validos], c[validos], n - (a + b + c)[validos]])
+    return enteros / n
+
+
+def _perfiles_unicos(filas):
+    """Código de fila única (factorize columna a columna, exacto y O(n)) y la primera fila de cada código."""
+    codigo = np.zeros(len(filas), dtype=np.int64)
+    for columna in filas.T:
+        valores, unicos = pd.factorize(columna, use_na_sentinel=False)
+        codigo, _ = pd.factorize(codigo * len(unicos) + valores)
+    _, primeros = np.unique(codigo, return_index=True)
+    return codigo, primeros
+
+
+def _perfiles(matriz):
+    """Scores por criterio de cada perfil de ofertas único (n_perfiles, proveedores, 4) y el perfil de cada SKU."""
+    criterios = scores_criterios(matriz)
+    perfil, primeros = _perfiles_unicos(criterios.reshape(len(criterios), int(np.prod(criterios.shape[1:]))))
+    return criterios[primeros], perfil
+
+
+def _ganadores_por_bloque(perfiles, malla):
+    """Ganador (-1 = sin oferta) por perfil y punto de la malla, en bloques de perfiles de tamaño acotado."""
+    paso = max(1, ELEMENTOS_BLOQUE // len(malla))
+    for inicio in range(0, len(perfiles), paso):
+        bloque = perfiles[inicio:inicio + paso]
+        mejor = np.full((len(bloque), len(malla)), -np.inf)
+        ganador = np.full(mejor.shape, -1, dtype=np.int16)
+        for j in range(bloque.shape[1]):
+            # El score es lineal en los pesos: (perfiles x 4) @ (4 x puntos), un producto por proveedor
+            scores = bloque[:, j, :] @ malla.T
+            gana = scores > mejor  # NaN (sin oferta) nunca gana; empate -> el primero
+            mejor[gana] = scores[gana]
+            ganador[gana] = j
+        yield ganador
+
+
+def regiones_ganadoras(matriz, malla=None):
+    """
+    Ganador de cada perfil de ofertas en cada punto de la malla de pesos.
+    Los SKUs con ofertas idénticas se puntúan una sola vez.
+    Devuelve (ganador (n_perfiles, n_puntos), perfil de cada SKU (n_skus,)); -1 = sin oferta.
+    """
+    malla = malla_pesos() if malla is None else malla
+    perfiles, perfil = _perfiles(matriz)
+    return np.concatenate(list(_ganadores_por_bloque(perfiles, malla))), perfil
+
+
+def barrido_pesos(matriz, malla=None, index=None):
+    """
+    Fracción de la malla de pesos en la que gana cada proveedor, por SKU
+    (DataFrame SKU x proveedor; 1.0 = gana con cualquier ponderación).
+    """
+    malla = malla_pesos() if malla is None else malla
+    perfiles, perfil = _perfiles(matriz)
+    k = len(matriz['proveedores'])
+    if not len(perfil):  # Vista sin SKUs: barrido vacío
+        return pd.DataFrame(np.empty((0, k)), index=index, columns=matriz['proveedores'])
+    fraccion = np.concatenate([
+        np.stack([(ganador == j).mean(axis=1) for j in range(k)], axis=1)
+        for ganador in _ganadores_por_bloque(perfiles, malla)
+    ])
+    return pd.DataFrame(fraccion[perfil], index=index, columns=matriz['proveedores'])
+
+
+def resumen_regiones(matriz, malla=None):
+    """
+    Región de cada proveedor para el primer perfil de ofertas: fracción de la malla
+    y pesos promedio (centroide) de los puntos donde gana.
+    """
+    malla = malla_pesos() if malla is None else malla
+    ganador, _ = regiones_ganadoras(matriz, malla)
+    filas = []
+    for j, proveedor in enumerate(matriz['proveedores']):
+        gana = ganador[0] == j
+        centro = malla[gana].mean(axis=0) if gana.any() else np.full(4, np.nan)
+        filas.append({'Proveedor': proveedor, 'Region_Pct': 100 * gana.mean(), **{f'Peso_{c}': v for c, v in zip(PESOS_BASE, centro)}})
+    return pd.DataFrame(filas)
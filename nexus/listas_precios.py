@@ -0,0 +1,379 @@
+"""
+Listas de precios de proveedores (Excel) -> tabla de ofertas SKU x Proveedor.
+
+Los libros se leen con openpyxl en modo read_only (streaming de filas) por lotes y
+cada lote se compara contra lo guardado apenas llega, así en memoria nunca hay más
+que un lote de filas (más unos pocos números por SKU). Cada proveedor queda en su
+propio Parquet; al re-importar solo se aplican las filas nuevas, cambiadas o retiradas
+(hash por fila) y un archivo idéntico al último importado ni siquiera se lee.
+
+Uso: NEXUS_OFERTAS=data/ofertas python -m nexus.listas_precios lista.xlsx "MegaTools"
+"""
+import hashlib
+import itertools
+import json
+import os
+import re
+import sys
+import unicodedata
+
+import numpy as np
+import openpyxl
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from nexus.licitacion import OFERTAS_BASE
+
+RUTA_OFERTAS = os.environ.get("NEXUS_OFERTAS", "data/ofertas")
+TAMANO_LOTE = 20_000
+FILAS_ENCABEZADO = 20  # El encabezado se busca en las primeras filas de la hoja
+
+# Nombres de columna aceptados (sin tildes, en minúscula) para cada campo de la oferta
+ALIAS_COLUMNAS = {
+    'SKU': ['sku', 'codigo', 'cod', 'referencia', 'ref', 'codigo producto', 'item'],
+    'Precio': ['precio', 'precio unitario', 'precio neto', 'costo', 'valor unitario', 'precio lista'],
+    'Tiempo': ['tiempo', 'tiempo entrega', 'dias entrega', 'lead time', 'plazo'],
+    'Fill': ['fill', 'fill rate', 'cumplimiento', 'nivel servicio'],
+    'Post': ['post', 'post venta', 'postventa', 'servicio post venta'],
+}
+CAMPOS_OFERTA = ['Precio', 'Tiempo', 'Fill', 'Post']
+COLUMNAS_OFERTAS = ['SKU', 'Proveedor'] + CAMPOS_OFERTA + ['Hash', 'Actualizado']
+ESQUEMA_OFERTAS = pa.schema(
+    [('SKU', pa.string()), ('Proveedor', pa.string())] + [(c, pa.float64()) for c in CAMPOS_OFERTA]
+    + [('Hash', pa.uint64()), ('Actualizado', pa.timestamp('us'))]
+)
+ESQUEMA_CAMBIOS = ESQUEMA_OFERTAS.append(pa.field('Fila', pa.int64()))  # Parquet temporal de la importación
+
+
+def _texto_plano(valor):
+    texto = unicodedata.normalize('NFKD', str(valor)).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[\s_]+', ' ', texto).strip().lower()
+
+
+def normalizar_sku(serie):
+    """Códigos SKU comparables: 123.0 -> '123', mayúsculas y separadores unificados a '-'."""
+    serie = pd.Series(serie, dtype=object)
+    enteros = serie.map(lambda v: isinstance(v, float) and v.is_integer())
+    serie = serie.where(~enteros, serie[enteros].map(lambda v: str(int(v))))
+    return (serie.astype(str).str.strip().str.upper()
+            .str.replace(r'[\s_./]+', '-', regex=True).str.strip('-')
+            .replace({'': None, 'NONE': None, 'NAN': None}))
+
+
+def _ubicar_encabezado(fila):
+    """Posición de cada campo en la fila de encabezado (None si la fila no es el encabezado)."""
+    nombres = [_texto_plano(v) if v is not None else '' for v in fila]
+    posiciones = {}
+    for campo, alias in ALIAS_COLUMNAS.items():
+        for i, nombre in enumerate(nombres):
+            if nombre in alias:
+                posiciones[campo] = i
+                break
+    return posiciones if {'SKU', 'Precio'} <= posiciones.keys() else None
+
+
+def leer_lista(archivo, hoja=None, lote=TAMANO_LOTE):
+    """
+    Genera lotes (DataFrame SKU, Precio, Tiempo, Fill, Post) de un libro Excel,
+    leyendo las filas en streaming. `archivo` puede ser una ruta o un objeto tipo archivo.
+    """
+    libro = openpyxl.load_workbook(archivo, read_only=True, data_only=True)
+    try:
+        hoja = libro[hoja] if hoja else libro.active
+        filas = hoja.iter_rows(values_only=True)
+        posiciones = None
+        for fila in itertools.islice(filas, FILAS_ENCABEZADO):
+            posiciones = _ubicar_encabezado(fila)
+            if posiciones:
+                break
+        if not posiciones:
+            raise ValueError(f"No se encontró un encabezado con columnas de SKU y Precio en las primeras {FILAS_ENCABEZADO} filas")
+
+        while True:
+            bloque = list(itertools.islice(filas, lote))
+            if not bloque:
+                break
+            df = pd.DataFrame({
+                campo: [f[i] if i < len(f) else None for f in bloque] for campo, i in posiciones.items()
+            })
+            yield normalizar_ofertas(df)
+    finally:
+        libro.close()  # read_only mantiene el archivo abierto hasta cerrar el libro
+
+
+def normalizar_ofertas(df):
+    """SKU normalizado, campos numéricos (fill en fracción) y sin filas sin SKU o precio."""
+    salida = pd.DataFrame({'SKU': normalizar_sku(df['SKU'])})
+    for campo in CAMPOS_OFERTA:
+        salida[campo] = pd.to_numeric(df[campo], errors='coerce') if campo in df else np.nan
+    salida['Fill'] = salida['Fill'].where(salida['Fill'] <= 1, salida['Fill'] / 100)  # 92 -> 0.92
+    return salida[salida['SKU'].notna() & (salida['Precio'] > 0)].reset_index(drop=True)
+
+
+def hash_archivo(archivo, bloque=1 << 20):
+    """SHA-1 del contenido, leído por bloques (ruta u objeto tipo archivo)."""
+    digest = hashlib.sha1()
+    if hasattr(archivo, 'read'):
+        archivo.seek(0)
+        for trozo in iter(lambda: archivo.read(bloque), b''):
+            digest.update(trozo)
+        archivo.seek(0)
+    else:
+        with open(archivo, 'rb') as f:
+            for trozo in iter(lambda: f.read(bloque), b''):
+                digest.update(trozo)
+    return digest.hexdigest()
+
+
+class StoreOfertas:
+    """Un Parquet por proveedor con sus ofertas vigentes + registro de importaciones."""
+
+    def __init__(self, ruta=RUTA_OFERTAS):
+        self.ruta = ruta
+        os.makedirs(ruta, exist_ok=True)
+        self._ruta_registro = os.path.join(ruta, '_importaciones.json')
+
+    def ruta_proveedor(self, proveedor):
+        """Parquet del proveedor (nombre sin tildes ni símbolos: dos nombres pueden coincidir)."""
+        return os.path.join(self.ruta, re.sub(r'\W+', '_', _texto_plano(proveedor)) + '.parquet')
+
+    def registro(self):
+        if not os.path.exists(self._ruta_registro):
+            return {}
+        with open(self._ruta_registro, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _guardar_registro(self, registro):
+        temporal = self._ruta_registro + '.tmp'
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(registro, f, indent=2, ensure_ascii=False)
+        os.replace(temporal, self._ruta_registro)
+
+    def proveedores(self):
+        return sorted(self.registro())
+
+    def leer(self, proveedor):
+        ruta = self.ruta_proveedor(proveedor)
+        if not os.path.exists(ruta):
+            return pd.DataFrame(columns=COLUMNAS_OFERTAS)
+        return pd.read_parquet(ruta)
+
+    def tabla(self):
+        """Todas las ofertas vigentes, indexadas por (SKU, Proveedor)."""
+        partes = [self.leer(p) for p in self.proveedores()]
+        tabla = pd.concat(partes, ignore_index=True) if partes else pd.DataFrame(columns=COLUMNAS_OFERTAS)
+        return tabla.set_index(['SKU', 'Proveedor']).sort_index()
+
+    def importar(self, archivo, proveedor, hoja=None, lote=TAMANO_LOTE):
+        """
+        Importa la lista de precios de un proveedor. Devuelve
+        {'nuevas', 'cambiadas', 'retiradas', 'sin_cambio'} (filas) u {'omitido': True}
+        si el archivo es idéntico al último importado.
+
+        Cada lote se compara contra los hashes guardados apenas llega y sus filas nuevas
+        o cambiadas van a un Parquet temporal. En memoria queda un lote y, por SKU, solo
+        números (hash del SKU y fila de su última aparición, que es la que vale si se repite).
+        """
+        firma = hash_archivo(archivo)
+        registro = self.registro()
+        if registro.get(proveedor, {}).get('hash_archivo') == firma:
+            return {'omitido': True}
+
+        destino = self.ruta_proveedor(proveedor)
+        otro = next((p for p in registro if p != proveedor and self.ruta_proveedor(p) == destino), None)
+        if otro is not None:  # 'Mega-Tools' y 'Mega Tools' caerían en el mismo Parquet
+            raise ValueError(f"'{proveedor}' y '{otro}' comparten el archivo {os.path.basename(destino)}; use el nombre ya registrado o uno distinto")
+        previo = pd.read_parquet(destino, columns=['SKU', 'Hash']) if os.path.exists(destino) else pd.DataFrame({'SKU': [], 'Hash': []})
+        claves = _clave_sku(previo['SKU'])
+        orden = np.argsort(claves)  # Guardadas ordenadas por clave para buscarlas con searchsorted
+        claves, hash_previo = claves[orden], previo['Hash'].to_numpy(dtype=np.uint64)[orden]
+        del previo
+        ultima = np.full(len(claves), -1, dtype=np.int64)  # Fila de la última aparición en la lista (-1: retirada)
+        hash_lista = np.zeros(len(claves), dtype=np.uint64)
+        claves_nuevas, filas_nuevas = [], []
+
+        ahora = pd.Timestamp.now()
+        temporal = destino + '.cambios.tmp'
+        escritor, filas = None, 0
+        try:
+            for df in leer_lista(archivo, hoja, lote):
+                if not len(df):
+                    continue
+                df = df.assign(Fila=np.arange(filas, filas + len(df)), Proveedor=proveedor, Actualizado=ahora)
+                filas += len(df)
+                df = df.drop_duplicates('SKU', keep='last')
+                df['Hash'] = _hash_ofertas(df)
+                clave, fila, hashes = _clave_sku(df['SKU']), df['Fila'].to_numpy(), df['Hash'].to_numpy()
+
+                pos = _buscar(claves, clave)
+                conocida = pos >= 0
+                ultima[pos[conocida]] = fila[conocida]
+                hash_lista[pos[conocida]] = hashes[conocida]
+                claves_nuevas.append(clave[~conocida])
+                filas_nuevas.append(fila[~conocida])
+
+                distinta = ~conocida
+                distinta[conocida] = hash_previo[pos[conocida]] != hashes[conocida]
+                if distinta.any():
+                    escritor = escritor or pq.ParquetWriter(temporal, ESQUEMA_CAMBIOS)
+                    escritor.write_table(_tabla_arrow(df[distinta], ESQUEMA_CAMBIOS))
+            if escritor is not None:
+                escritor.close()
+            if not filas:  # Solo encabezado, o ninguna fila con SKU y precio válido
+                raise ValueError("La lista no tiene filas con SKU y precio")
+
+            # SKUs nuevos: una clave por SKU con la fila de su última aparición
+            clave_nueva, fila_nueva = np.concatenate(claves_nuevas), np.concatenate(filas_nuevas)
+            orden_nuevas = np.lexsort((fila_nueva, clave_nueva))
+            clave_nueva, fila_nueva = clave_nueva[orden_nuevas], fila_nueva[orden_nuevas]
+            ultimas = np.ones(len(clave_nueva), dtype=bool)
+            ultimas[:-1] = clave_nueva[1:] != clave_nueva[:-1]
+            clave_nueva, fila_nueva = clave_nueva[ultimas], fila_nueva[ultimas]
+
+            vista = ultima >= 0
+            cambiadas = vista & (hash_lista != hash_previo)
+            resultado = {'nuevas': len(clave_nueva), 'cambiadas': int(cambiadas.sum()),
+                         'retiradas': int((~vista).sum()), 'sin_cambio': int((vista & ~cambiadas).sum())}
+            if escritor is not None or resultado['retiradas']:
+                conservar = np.empty(len(claves), dtype=bool)
+                conservar[orden] = vista & ~cambiadas  # De vuelta al orden del archivo guardado
+                todas = np.concatenate([claves, clave_nueva])
+                orden_todas = np.argsort(todas)
+                self._reescribir(destino, conservar, temporal if escritor is not None else None,
+                                 todas[orden_todas], np.concatenate([ultima, fila_nueva])[orden_todas], lote)
+        finally:
+            if escritor is not None:
+                escritor.close()
+            if os.path.exists(temporal):
+                os.remove(temporal)
+
+        registro[proveedor] = {'hash_archivo': firma, 'filas': int(vista.sum()) + len(clave_nueva), 'importado': ahora.isoformat(timespec='seconds')}
+        self._guardar_registro(registro)
+        return resultado
+
+    def _reescribir(self, destino, conservar, cambios, claves, ultima, lote):
+        """
+        Nuevo Parquet del proveedor, lote a lote: las filas guardadas marcadas en `conservar`
+        (mantienen su fecha de actualización) y, de `cambios`, solo la última aparición de
+        cada SKU (`ultima`: fila de la última aparición de cada clave ordenada de `claves`).
+        """
+        escritor = pq.ParquetWriter(destino + '.tmp', ESQUEMA_OFERTAS)
+        try:
+            if conservar.any():
+                inicio = 0
+                for bloque in pq.ParquetFile(destino).iter_batches(batch_size=lote):
+                    tabla = pa.Table.from_batches([bloque])
+                    escritor.write_table(_tabla_arrow(tabla.filter(conservar[inicio:inicio + len(tabla)]), ESQUEMA_OFERTAS))
+                    inicio += len(tabla)
+            if cambios is not None:
+                for bloque in pq.ParquetFile(cambios).iter_batches(batch_size=lote):
+                    df = bloque.to_pandas()
+                    escritor.write_table(_tabla_arrow(df[ultima[_buscar(claves, _clave_sku(df['SKU']))] == df['Fila'].to_numpy()], ESQUEMA_OFERTAS))
+        finally:
+            escritor.close()
+        os.replace(destino + '.tmp', destino)
+
+
+def _clave_sku(skus, lote=TAMANO_LOTE):
+    """
+    Hash de 64 bits de cada SKU: índice compacto de la importación (no guarda los textos).
+    Va por tramos porque el hash convierte los textos a objetos Python.
+    """
+    skus = pd.Series(skus)
+    tramos = [pd.util.hash_pandas_object(skus.iloc[i:i + lote], index=False).to_numpy() for i in range(0, len(skus), lote)]
+    return np.concatenate(tramos) if tramos else np.zeros(0, dtype=np.uint64)
+
+
+def _buscar(claves, buscadas):
+    """Posición de cada clave buscada en `claves` (ordenadas), -1 si no está."""
+    if not len(claves):
+        return np.full(len(buscadas), -1, dtype=np.int64)
+    pos = np.minimum(np.searchsorted(claves, buscadas), len(claves) - 1)
+    return np.where(claves[pos] == buscadas, pos, -1)
+
+
+def _hash_ofertas(df):
+    """Hash por fila de los campos de la oferta (en float64, igual en todos los lotes)."""
+    return pd.util.hash_pandas_object(df[CAMPOS_OFERTA].astype(np.float64), index=False).to_numpy()
+
+
+def _tabla_arrow(datos, esquema):
+    """DataFrame o tabla Arrow con las columnas y tipos de `esquema`."""
+    if isinstance(datos, pd.DataFrame):
+        datos = pa.Table.from_pandas(datos[esquema.names], preserve_index=False)
+    return datos.select(esquema.names).cast(esquema)
+
+
+# ==============================================================================
+# --- OFERTAS PARA LA LICITACIÓN ---
+# ==============================================================================
+def version_ofertas(ruta):
+    """Cambia con cada importación (mtime del registro); sirve de clave de cache."""
+    registro = os.path.join(ruta, '_importaciones.json')
+    return os.path.getmtime(registro) if os.path.exists(registro) else None
+
+
+def indexar_ofertas(tabla):
+    """
+    Tabla (SKU, Proveedor) -> índice de SKUs y un arreglo (SKUs x proveedores) por campo.
+    Es lo que se guarda en cache: cada consulta de la licitación es un get_indexer + take.
+    """
+    proveedores = list(tabla.index.get_level_values('Proveedor').unique())
+    pivotes = {campo: tabla[campo].unstack('Proveedor').reindex(columns=proveedores) for campo in CAMPOS_OFERTA}
+    indice = {'proveedores': proveedores, 'skus': pivotes['Precio'].index}
+    indice.update({campo: p.to_numpy(dtype=np.float64) for campo, p in pivotes.items()})
+    return indice
+
+
+def matriz_ofertas(indice, skus, costos):
+    """
+    Matriz de licitación (formato de matriz_ofertas_fija) con las ofertas reales:
+    factor_precio = precio ofertado / costo actual. Tiempo, fill y post venta que
+    la lista no trae se toman de la oferta de referencia del proveedor; un SKU
+    sin oferta de un proveedor queda en NaN (no participa).
+    """
+    filas = indice['skus'].get_indexer(normalizar_sku(skus))
+    sin_oferta = filas < 0
+
+    def tomar(campo):
+        valores = indice[campo].take(np.where(sin_oferta, 0, filas), axis=0)
+        valores[sin_oferta] = np.nan
+        return valores
+
+    precio = tomar('Precio')
+    referencia = {
+        campo: np.array([OFERTAS_BASE.get(p, {}).get(clave, np.nan) for p in indice['proveedores']])
+        for campo, clave in (('Tiempo', 'tiempo'), ('Fill', 'fill'), ('Post', 'post'))
+    }
+    matriz = {'proveedores': indice['proveedores'],
+              'factor_precio': precio / np.asarray(costos, dtype=np.float64)[:, None]}
+    for campo, clave in (('Tiempo', 'tiempo'), ('Fill', 'fill'), ('Post', 'post')):
+        valores = tomar(campo)
+        valores = np.where(np.isnan(valores), referencia[campo], valores)
+        matriz[clave] = np.where(np.isnan(precio), np.nan, valores)
+    return matriz
+
+
+# ==============================================================================
+# --- LISTAS DE DEMOSTRACIÓN ---
+# ==============================================================================
+def escribir_lista_demo(ruta, skus, costos, proveedor, rng=None):
+    """Lista de precios de ejemplo (xlsxwriter en constant_memory) alrededor de la oferta de referencia."""
+    import xlsxwriter
+
+    rng = rng or np.random.default_rng()
+    oferta = OFERTAS_BASE.get(proveedor, {'factor_precio': 1.0, 'tiempo': 10, 'fill': 0.9, 'post': 7.0})
+    precios = np.round(np.asarray(costos) * oferta['factor_precio'] * rng.uniform(0.93, 1.07, len(costos)), 0)
+    libro = xlsxwriter.Workbook(ruta, {'constant_memory': True})
+    hoja = libro.add_worksheet('Lista')
+    hoja.write_row(0, 0, [f'Lista de precios {proveedor}'])
+    hoja.write_row(2, 0, ['Código', 'Descripción', 'Precio Unitario', 'Días Entrega', 'Fill Rate'])
+    for i, (sku, precio) in enumerate(zip(skus, precios), start=3):
+        hoja.write_row(i, 0, [sku, f'Producto {sku}', precio, oferta['tiempo'], oferta['fill'] * 100])
+    libro.close()
+
+
+if __name__ == "__main__":
+    archivo, proveedor = sys.argv[1], sys.argv[2]
+    print(StoreOfertas().importar(archivo, proveedor))
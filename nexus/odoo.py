@@ -0,0 +1,285 @@
+"""
+Conector incremental Odoo ERP -> almacén local en Parquet.
+
+Se habla con la API externa de Odoo por JSON-RPC (/jsonrpc, execute_kw) usando
+una sesión HTTP con pool de conexiones keep-alive. Cada modelo se descarga en
+lotes de search_read paginados por (write_date, id), de modo que cada
+sincronización solo trae lo que cambió desde la anterior.
+
+Uso (cron): NEXUS_ODOO_URL=... NEXUS_ODOO_DB=... NEXUS_ODOO_USUARIO=... \
+            NEXUS_ODOO_PASSWORD=... python -m nexus.odoo
+"""
+import itertools
+import json
+import os
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+RUTA_STORE = os.environ.get("NEXUS_ODOO_STORE", "data/odoo")
+TAMANO_LOTE = 2000
+
+# Modelos sincronizados: campos y dominio base (sin rutas con punto, para filtrar en servidor
+# solo por campos propios; las ubicaciones se resuelven localmente con stock.location)
+MODELOS = {
+    'product.product': {
+        'campos': ['default_code', 'name', 'categ_id', 'product_tmpl_id', 'standard_price', 'list_price', 'weight', 'active'],
+        'many2one': ['categ_id', 'product_tmpl_id'],
+        'dominio': [],
+        'contexto': {'active_test': False},  # Los archivados también llegan (active=False)
+    },
+    'product.supplierinfo': {
+        'campos': ['partner_id', 'product_tmpl_id', 'product_id', 'price', 'delay', 'min_qty', 'sequence'],
+        'many2one': ['partner_id', 'product_tmpl_id', 'product_id'],
+        'dominio': [],
+    },
+    'stock.location': {
+        'campos': ['complete_name', 'usage', 'active'],
+        'dominio': [],
+        'contexto': {'active_test': False},
+    },
+    'stock.quant': {
+        'campos': ['product_id', 'location_id', 'quantity', 'reserved_quantity'],
+        'many2one': ['product_id', 'location_id'],
+        'dominio': [],
+        'reconciliar': True,  # Odoo borra quants en cero: se depuran por ids vigentes
+    },
+    'stock.move': {
+        'campos': ['product_id', 'location_id', 'location_dest_id', 'product_uom_qty', 'date', 'state'],
+        'many2one': ['product_id', 'location_id', 'location_dest_id'],
+        'dominio': [('state', '=', 'done')],
+        'dias_historia': 90,  # Solo se sincroniza la ventana reciente (demanda mensual)
+    },
+}
+
+
+class ErrorOdoo(RuntimeError):
+    """Error devuelto por el servidor Odoo en una llamada JSON-RPC."""
+
+
+# ==============================================================================
+# --- CLIENTE JSON-RPC CON POOL KEEP-ALIVE ---
+# ==============================================================================
+class ClienteOdoo:
+    """Cliente JSON-RPC de Odoo que reutiliza conexiones HTTP entre llamadas."""
+
+    def __init__(self, url, db, usuario, password, pool=4, timeout=120, reintentos=3):
+        self.url = url.rstrip('/') + '/jsonrpc'
+        self.db, self.usuario, self.password = db, usuario, password
+        self.timeout = timeout
+        self.sesion = requests.Session()
+        adaptador = HTTPAdapter(
+            pool_connections=1, pool_maxsize=pool,
+            max_retries=Retry(total=reintentos, backoff_factor=0.5, status_forcelist=[502, 503, 504], allowed_methods=None)
+        )
+        self.sesion.mount('http://', adaptador)
+        self.sesion.mount('https://', adaptador)
+        self._ids = itertools.count(1)
+        self._uid = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def cerrar(self):
+        self.sesion.close()
+
+    def _llamar(self, servicio, metodo, *args):
+        payload = {
+            'jsonrpc': '2.0', 'method': 'call', 'id': next(self._ids),
+            'params': {'service': servicio, 'method': metodo, 'args': list(args)},
+        }
+        respuesta = self.sesion.post(self.url, json=payload, timeout=self.timeout)
+        respuesta.raise_for_status()
+        datos = respuesta.json()
+        if datos.get('error'):
+            error = datos['error']
+            raise ErrorOdoo(error.get('data', {}).get('message') or error.get('message', 'Error Odoo'))
+        return datos['result']
+
+    @property
+    def uid(self):
+        if self._uid is None:
+            self._uid = self._llamar('common', 'login', self.db, self.usuario, self.password)
+            if not self._uid:
+                raise ErrorOdoo(f"Autenticación rechazada para {self.usuario}@{self.db}")
+        return self._uid
+
+    def execute_kw(self, modelo, metodo, args, kwargs=None):
+        return self._llamar('object', 'execute_kw', self.db, self.uid, self.password, modelo, metodo, args, kwargs or {})
+
+    def search_read(self, modelo, dominio, campos, limit=TAMANO_LOTE, order='id asc', contexto=None):
+        kwargs = {'fields': campos, 'limit': limit, 'order': order}
+        if contexto:
+            kwargs['context'] = contexto
+        return self.execute_kw(modelo, 'search_read', [dominio], kwargs)
+
+    def search_ids(self, modelo, dominio, contexto=None):
+        kwargs = {'context': contexto} if contexto else {}
+        return self.execute_kw(modelo, 'search', [dominio], kwargs)
+
+
+# ==============================================================================
+# --- ALMACÉN LOCAL PARQUET ---
+# ==============================================================================
+class StoreParquet:
+    """Una tabla Parquet por modelo + marcas de agua (write_date, id) de la última sincronización."""
+
+    def __init__(self, ruta=RUTA_STORE):
+        self.ruta = ruta
+        os.makedirs(ruta, exist_ok=True)
+        self._ruta_marcas = os.path.join(ruta, '_sincronizacion.json')
+
+    def ruta_modelo(self, modelo):
+        return os.path.join(self.ruta, modelo.replace('.', '_') + '.parquet')
+
+    def existe(self, modelo):
+        return os.path.exists(self.ruta_modelo(modelo))
+
+    def leer(self, modelo, columnas=None):
+        if not self.existe(modelo):
+            return pd.DataFrame(columns=columnas or ['id'])
+        return pd.read_parquet(self.ruta_modelo(modelo), columns=columnas)
+
+    def _escribir(self, modelo, df):
+        # Escritura atómica: nunca queda un Parquet a medio escribir para los tableros
+        destino = self.ruta_modelo(modelo)
+        temporal = destino + '.tmp'
+        df.to_parquet(temporal, index=False)
+        os.replace(temporal, destino)
+
+    def upsert(self, modelo, df_nuevo):
+        """Inserta o reemplaza registros por `id`."""
+        if df_nuevo.empty:
+            return
+        actual = self.leer(modelo)
+        if not actual.empty:
+            actual = actual[~actual['id'].isin(df_nuevo['id'])]
+            df_nuevo = pd.concat([actual, df_nuevo], ignore_index=True)
+        self._escribir(modelo, df_nuevo.sort_values('id', ignore_index=True))
+
+    def conservar_ids(self, modelo, ids_vigentes):
+        """Elimina los registros locales que ya no existen en Odoo. Devuelve cuántos salieron."""
+        actual = self.leer(modelo)
+        vigentes = actual['id'].isin(ids_vigentes)
+        if vigentes.all():
+            return 0
+        self._escribir(modelo, actual[vigentes].reset_index(drop=True))
+        return int((~vigentes).sum())
+
+    def marcas(self):
+        if not os.path.exists(self._ruta_marcas):
+            return {}
+        with open(self._ruta_marcas, encoding='utf-8') as f:
+            return json.load(f)
+
+    def marca_agua(self, modelo):
+        marca = self.marcas().get(modelo)
+        return tuple(marca) if marca else None
+
+    def guardar_marca_agua(self, modelo, write_date, ultimo_id):
+        marcas = self.marcas()
+        marcas[modelo] = [write_date, ultimo_id]
+        temporal = self._ruta_marcas + '.tmp'
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(marcas, f, indent=2)
+        os.replace(temporal, self._ruta_marcas)
+
+
+# ==============================================================================
+# --- SINCRONIZACIÓN INCREMENTAL ---
+# ==============================================================================
+def normalizar_registros(registros, many2one=()):
+    """
+    search_read -> DataFrame: los many2one [id, nombre] se separan en `campo` (id)
+    y `campo_nombre`; el False de Odoo en campos vacíos pasa a None.
+
+    Los campos de `many2one` salen siempre como Int64 (False -> <NA>) aunque el lote
+    no traiga ningún id, para que todos los lotes del almacén tengan el mismo tipo.
+    """
+    df = pd.DataFrame.from_records(registros)
+    for col in list(df.columns):
+        valores = df[col]
+        if col in many2one:
+            df[col] = pd.array(valores.map(lambda v: v[0] if isinstance(v, list) else None).tolist(), dtype='Int64')
+            df[col + '_nombre'] = valores.map(lambda v: v[1] if isinstance(v, list) else None).astype(object)
+            continue
+        if valores.dtype != object:
+            continue
+        es_m2o = valores.map(lambda v: isinstance(v, list) and len(v) == 2)
+        if es_m2o.any():
+            df[col] = valores.map(lambda v: v[0] if isinstance(v, list) else None).astype('Int64')
+            df[col + '_nombre'] = valores.map(lambda v: v[1] if isinstance(v, list) else None)
+        elif valores.map(lambda v: isinstance(v, str)).any():
+            df[col] = valores.map(lambda v: None if v is False else v)
+    return df
+
+
+def _dominio_desde_marca(marca):
+    """Paginación por clave (write_date, id): registros estrictamente posteriores a la marca."""
+    if not marca:
+        return []
+    write_date, ultimo_id = marca
+    return ['|', ('write_date', '>', write_date), '&', ('write_date', '=', write_date), ('id', '>', ultimo_id)]
+
+
+def sincronizar_modelo(cliente, store, modelo, config=None, lote=TAMANO_LOTE):
+    """
+    Descarga los registros de `modelo` modificados desde la última marca de agua y
+    los aplica al almacén. Devuelve el número de registros recibidos.
+    """
+    config = config or MODELOS[modelo]
+    campos = list(dict.fromkeys(config['campos'] + ['write_date']))
+    dominio_base = [tuple(t) if isinstance(t, list) else t for t in config.get('dominio', [])]
+    if config.get('dias_historia'):
+        desde = (datetime.now() - timedelta(days=config['dias_historia'])).strftime('%Y-%m-%d %H:%M:%S')
+        dominio_base.append(('date', '>=', desde))
+
+    marca = store.marca_agua(modelo)
+    lotes = []
+    while True:
+        registros = cliente.search_read(
+            modelo, _dominio_desde_marca(marca) + dominio_base, campos,
+            limit=lote, order='write_date asc, id asc', contexto=config.get('contexto')
+        )
+        if not registros:
+            break
+        lotes.append(normalizar_registros(registros, config.get('many2one', ())))
+        marca = (registros[-1]['write_date'], registros[-1]['id'])
+        if len(registros) < lote:
+            break
+
+    recibidos = sum(len(df) for df in lotes)
+    if lotes:
+        store.upsert(modelo, pd.concat(lotes, ignore_index=True))
+        store.guardar_marca_agua(modelo, *marca)
+
+    if config.get('reconciliar') and store.existe(modelo):
+        ids_vigentes = cliente.search_ids(modelo, dominio_base, contexto=config.get('contexto'))
+        store.conservar_ids(modelo, ids_vigentes)
+    return recibidos
+
+
+def sincronizar(cliente, store, modelos=None, lote=TAMANO_LOTE):
+    """Sincroniza todos los modelos configurados. Devuelve {modelo: (registros, segundos)}."""
+    resumen = {}
+    for modelo in (modelos or MODELOS):
+        t0 = time.perf_counter()
+        recibidos = sincronizar_modelo(cliente, store, modelo, MODELOS.get(modelo), lote)
+        resumen[modelo] = (recibidos, time.perf_counter() - t0)
+    return resumen
+
+
+if __name__ == "__main__":
+    with ClienteOdoo(
+        os.environ["NEXUS_ODOO_URL"], os.environ["NEXUS_ODOO_DB"],
+        os.environ["NEXUS_ODOO_USUARIO"], os.environ["NEXUS_ODOO_PASSWORD"]
+    ) as cliente:
+        for modelo, (recibidos, segundos) in sincronizar(cliente, StoreParquet()).items():
+            print(f"{modelo:<22} {recibidos:>9,} registros  {segundos:6.2f} s")
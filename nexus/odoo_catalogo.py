@@ -0,0 +1,141 @@
+"""
+Lectura del almacén Parquet sincronizado desde Odoo con el esquema de cada tablero.
+
+- catalogo_estrategia: una fila por producto (mismas columnas que generador.COLUMNAS).
+- maestro_logistica: una fila por producto x tienda (ubicación interna).
+La demanda mensual sale de los movimientos hechos hacia clientes en los últimos 30 días.
+"""
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from nexus.clasificador import clasificar_abc, clasificar_estado, cobertura_logistica, dias_cobertura, etiquetas_estado
+from nexus.generador import COLUMNAS, PERFILES_PROVEEDOR
+
+DIAS_DEMANDA = 30
+# Odoo no registra fill rate ni calificación postventa: se usa el punto medio del perfil
+FILL_RATE_DEFECTO, POST_VENTA_DEFECTO = 0.9, 7.0
+# Columnas leídas explícitamente: un modelo sin registros (sin Parquet) llega igual con su esquema
+COLUMNAS_PRODUCTO = ['id', 'default_code', 'name', 'categ_id_nombre', 'product_tmpl_id', 'standard_price', 'list_price', 'weight', 'active']
+COLUMNAS_PROVEEDOR = ['product_tmpl_id', 'partner_id_nombre', 'delay', 'sequence', 'price']
+
+
+def _ultimo_segmento(ruta):
+    """'All / Ferretería / Herramientas' -> 'Herramientas'."""
+    return ruta.str.rsplit(' / ', n=1).str[-1]
+
+
+def _productos(store):
+    productos = store.leer('product.product', COLUMNAS_PRODUCTO)
+    return productos[productos['active'].fillna(True).astype(bool)]
+
+
+def _ubicaciones(store, uso):
+    ubic = store.leer('stock.location', ['id', 'complete_name', 'usage'])
+    return ubic[ubic['usage'] == uso]
+
+
+def _demanda(store, por, hoy=None):
+    """Unidades despachadas a clientes en los últimos DIAS_DEMANDA días, agrupadas por `por`."""
+    movimientos = store.leer('stock.move')
+    if movimientos.empty:
+        return pd.Series(dtype=np.float64)
+    desde = ((hoy or datetime.now()) - timedelta(days=DIAS_DEMANDA)).strftime('%Y-%m-%d %H:%M:%S')
+    clientes = _ubicaciones(store, 'customer')['id']
+    ventas = movimientos[
+        (movimientos['state'] == 'done') & (movimientos['date'] >= desde)
+        & movimientos['location_dest_id'].isin(clientes)
+    ]
+    return ventas.groupby(por)['product_uom_qty'].sum()
+
+
+def _stock(store, por):
+    quants = store.leer('stock.quant', ['product_id', 'location_id', 'quantity'])
+    internas = _ubicaciones(store, 'internal')['id']
+    return quants[quants['location_id'].isin(internas)].groupby(por)['quantity'].sum()
+
+
+def _proveedor_principal(store):
+    """Proveedor preferido por plantilla: menor secuencia y, a igualdad, menor precio."""
+    info = store.leer('product.supplierinfo', COLUMNAS_PROVEEDOR).sort_values(['product_tmpl_id', 'sequence', 'price'])
+    return info.drop_duplicates('product_tmpl_id').set_index('product_tmpl_id')
+
+
+def catalogo_estrategia(store, hoy=None):
+    """Catálogo de Estrategia (sin compactar) a partir del almacén Odoo."""
+    prod = _productos(store).set_index('id')
+    prov = _proveedor_principal(store).reindex(prod['product_tmpl_id'].to_numpy())
+    proveedor = prov['partner_id_nombre'].fillna('Sin Proveedor').to_numpy()
+
+    costo = prod['standard_price'].to_numpy(dtype=np.float64)
+    precio = prod['list_price'].to_numpy(dtype=np.float64)
+    demanda = _demanda(store, 'product_id', hoy).reindex(prod.index, fill_value=0).round().to_numpy(np.int64)
+    stock = _stock(store, 'product_id').reindex(prod.index, fill_value=0).clip(lower=0).round().to_numpy(np.int64)
+    dias = dias_cobertura(stock, demanda)
+
+    perfiles = {n: {m: sum(r) / 2 for m, r in p.items()} for n, p in PERFILES_PROVEEDOR.items()}
+    ruta_cat = prod['categ_id_nombre'].fillna('Sin Categoría')
+    segmentos = ruta_cat.str.split(' / ')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        margen = np.where(costo > 0, precio / costo - 1, 0.0)
+
+    return pd.DataFrame({
+        'SKU': prod['default_code'].fillna(prod.index.to_series().map('ODOO-{}'.format)).to_numpy(),
+        'Producto': prod['name'].to_numpy(),
+        'Categoria': segmentos.map(lambda s: s[1] if len(s) > 1 else s[0]).to_numpy(),
+        'Subcategoria': _ultimo_segmento(ruta_cat).to_numpy(),
+        'Proveedor': proveedor,
+        'Costo': costo,
+        'Precio': precio,
+        'Margen_Pct': margen,
+        'Utilidad_Mensual': (precio - costo) * demanda,
+        'Stock': stock,
+        'Demanda_Mes': demanda,
+        'Valor_Inventario': stock * costo,
+        'Dias_Inventario': dias,
+        'Lead_Time_Real': prov['delay'].fillna(0).to_numpy(np.int64),
+        'Fill_Rate': [perfiles.get(p, {}).get('fill_rate', FILL_RATE_DEFECTO) for p in proveedor],
+        'Post_Venta': [perfiles.get(p, {}).get('post_venta', POST_VENTA_DEFECTO) for p in proveedor],
+        'Estado': etiquetas_estado(clasificar_estado(stock, demanda, dias=dias)),
+    }, columns=COLUMNAS)
+
+
+def maestro_logistica(store, columnas, hoy=None):
+    """Maestro de Logística (producto x tienda) a partir del almacén Odoo."""
+    prod = _productos(store).set_index('id')
+    prov = _proveedor_principal(store)
+    tiendas = _ubicaciones(store, 'internal').set_index('id')['complete_name']
+
+    # Todas las combinaciones producto x tienda (una tienda sin quant tiene stock 0)
+    malla = pd.MultiIndex.from_product([prod.index, tiendas.index], names=['product_id', 'location_id'])
+    stock = _stock(store, ['product_id', 'location_id']).reindex(malla, fill_value=0).clip(lower=0).round()
+    demanda = _demanda(store, ['product_id', 'location_id'], hoy).reindex(malla, fill_value=0).round()
+    df = malla.to_frame(index=False)
+    p = prod.loc[df['product_id']]
+    costo = p['standard_price'].to_numpy(dtype=np.float64)
+
+    df = pd.DataFrame({
+        'SKU': p['default_code'].where(p['default_code'].notna(), 'ODOO-' + p.index.astype(str)).to_numpy(),  # Como en catalogo_estrategia
+        'Descripcion': p['name'].to_numpy(),
+        'Categoria': _ultimo_segmento(p['categ_id_nombre'].fillna('Sin Categoría')).to_numpy(),
+        'Marca_Nombre': 'Sin Marca',  # Odoo estándar no tiene marca en product.product
+        'Proveedor': prov['partner_id_nombre'].reindex(p['product_tmpl_id'].to_numpy()).fillna('Sin Proveedor').to_numpy(),
+        'Almacen_Nombre': tiendas.loc[df['location_id']].to_numpy(),
+        'Stock': stock.to_numpy(np.int64),
+        'Costo_Promedio_UND': costo,
+        'Precio_Venta': p['list_price'].to_numpy(dtype=np.float64),
+        'Peso_Articulo': p['weight'].to_numpy(dtype=np.float64),
+        'Demanda_Mes': demanda.to_numpy(np.int64),
+        'Stock_En_Transito': 0,
+    })
+    df['Necesidad_Total'], df['Excedente_Trasladable'] = cobertura_logistica(df['Stock'], df['Demanda_Mes'], meses_objetivo=1.5, meses_excedente=3)
+    df['Segmento_ABC'] = clasificar_abc(df['Demanda_Mes'] * df['Costo_Promedio_UND'])
+    return df[columnas]
+
+
+def version_store(ruta):
+    """Marca de la última sincronización (mtime); sirve de clave de caché en los tableros."""
+    marcas = os.path.join(ruta, '_sincronizacion.json')
+    return os.path.getmtime(marcas) if os.path.exists(marcas) else None
@@ -0,0 +1,235 @@
+"""
+Servidor Odoo simulado (JSON-RPC en memoria) para probar el conector sin un ERP real.
+
+Implementa lo que usa nexus.odoo: common.login y object.execute_kw con
+search_read / search / search_count / write, dominios en notación prefija
+('&', '|', '!') y orden por varios campos.
+"""
+import json
+import operator
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+_OPERADORES = {
+    '=': operator.eq, '!=': operator.ne,
+    '>': operator.gt, '>=': operator.ge, '<': operator.lt, '<=': operator.le,
+    'in': lambda a, b: a in b, 'not in': lambda a, b: a not in b,
+}
+
+
+def _valor_campo(registro, campo):
+    valor = registro.get(campo, False)
+    return valor[0] if isinstance(valor, list) else valor  # many2one -> id
+
+
+def evaluar_dominio(dominio, registro):
+    """Evalúa un dominio Odoo (notación prefija, AND implícito) sobre un registro."""
+    pila = []
+    for termino in reversed(dominio):
+        if termino == '!':
+            pila.append(not pila.pop())
+        elif termino in ('&', '|'):
+            a, b = pila.pop(), pila.pop()
+            pila.append((a and b) if termino == '&' else (a or b))
+        else:
+            campo, op, valor = termino
+            pila.append(_OPERADORES[op](_valor_campo(registro, campo), valor))
+    return all(pila)
+
+
+def _ordenar(registros, orden):
+    for parte in reversed([p.strip() for p in (orden or 'id').split(',')]):
+        campo, _, sentido = parte.partition(' ')
+        registros.sort(key=lambda r: _valor_campo(r, campo), reverse=sentido.lower() == 'desc')
+    return registros
+
+
+class ServidorOdooSimulado:
+    """Servidor HTTP local con `modelos` = {modelo: [registros]}; cada registro con id y write_date."""
+
+    def __init__(self, modelos, db='demo', usuario='admin', password='admin'):
+        self.modelos = {m: {r['id']: dict(r) for r in regs} for m, regs in modelos.items()}
+        self.db, self.usuario, self.password = db, usuario, password
+        self.llamadas = 0
+        self.registros_servidos = 0
+        self._reloj = datetime.now().replace(microsecond=0)
+        self._lock = threading.Lock()
+        self._http = None
+
+    # --- Ciclo de vida ---
+    def iniciar(self):
+        servidor = self
+
+        class _Manejador(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Keep-alive, como Odoo detrás de un proxy
+
+            def do_POST(self):
+                cuerpo = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                try:
+                    respuesta = {'jsonrpc': '2.0', 'id': cuerpo.get('id'), 'result': servidor._despachar(cuerpo['params'])}
+                except Exception as e:
+                    respuesta = {'jsonrpc': '2.0', 'id': cuerpo.get('id'), 'error': {'message': 'Odoo Server Error', 'data': {'message': str(e)}}}
+                datos = json.dumps(respuesta).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(datos)))
+                self.end_headers()
+                self.wfile.write(datos)
+
+            def log_message(self, *args):
+                pass
+
+        self._http = ThreadingHTTPServer(('127.0.0.1', 0), _Manejador)
+        threading.Thread(target=self._http.serve_forever, daemon=True).start()
+        return self
+
+    def detener(self):
+        if self._http:
+            self._http.shutdown()
+            self._http.server_close()
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *exc):
+        self.detener()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._http.server_address[1]}"
+
+    # --- Mutaciones (simulan usuarios editando en el ERP) ---
+    def _ahora(self):
+        self._reloj += timedelta(seconds=1)
+        return self._reloj.strftime('%Y-%m-%d %H:%M:%S')
+
+    def escribir(self, modelo, ids, valores):
+        with self._lock:
+            marca = self._ahora()
+            for i in ids:
+                self.modelos[modelo][i].update(valores, write_date=marca)
+        return True
+
+    def eliminar(self, modelo, ids):
+        with self._lock:
+            for i in ids:
+                self.modelos[modelo].pop(i, None)
+
+    # --- JSON-RPC ---
+    def _despachar(self, params):
+        self.llamadas += 1
+        servicio, metodo, args = params['service'], params['method'], params['args']
+        if servicio == 'common' and metodo == 'login':
+            db, usuario, password = args
+            return 2 if (db, usuario, password) == (self.db, self.usuario, self.password) else False
+        if servicio == 'object' and metodo == 'execute_kw':
+            db, uid, password, modelo, metodo_modelo, margs, kwargs = args
+            if password != self.password:
+                raise PermissionError("Access Denied")
+            return self._execute_kw(modelo, metodo_modelo, margs, kwargs or {})
+        raise ValueError(f"Servicio no soportado: {servicio}.{metodo}")
+
+    def _buscar(self, modelo, dominio, kwargs):
+        contexto = kwargs.get('context', {})
+        # Como Odoo: sin active_test=False los archivados se ocultan (si el modelo tiene `active`)
+        solo_activos = contexto.get('active_test', True) and 'active' not in {t[0] for t in dominio if isinstance(t, (list, tuple))}
+        with self._lock:
+            registros = [
+                r for r in self.modelos[modelo].values()
+                if (not solo_activos or r.get('active', True)) and evaluar_dominio(dominio, r)
+            ]
+        registros = _ordenar(registros, kwargs.get('order'))
+        offset = kwargs.get('offset', 0)
+        limite = kwargs.get('limit')
+        return registros[offset:offset + limite if limite else None]
+
+    def _execute_kw(self, modelo, metodo, args, kwargs):
+        if modelo not in self.modelos:
+            raise KeyError(f"Modelo desconocido: {modelo}")
+        if metodo == 'search_read':
+            campos = kwargs.get('fields')
+            encontrados = self._buscar(modelo, args[0] if args else [], kwargs)
+            self.registros_servidos += len(encontrados)
+            if not campos:
+                return encontrados
+            return [{'id': r['id'], **{c: r.get(c, False) for c in campos}} for r in encontrados]
+        if metodo == 'search':
+            return [r['id'] for r in self._buscar(modelo, args[0], kwargs)]
+        if metodo == 'search_count':
+            return len(self._buscar(modelo, args[0], kwargs))
+        if metodo == 'write':
+            return self.escribir(modelo, args[0], args[1])
+        raise ValueError(f"Método no soportado: {metodo}")
+
+
+# ==============================================================================
+# --- DATOS DE DEMOSTRACIÓN ---
+# ==============================================================================
+def modelos_demo(n_productos=1000, n_tiendas=4, seed=42):
+    """Base Odoo sintética con productos, proveedores, ubicaciones, quants y movimientos de venta."""
+    from nexus.generador import CATEGORIAS, PERFILES_PROVEEDOR
+
+    rng = np.random.default_rng(seed)
+    base = datetime.now().replace(microsecond=0) - timedelta(days=1)
+    marca = base.strftime('%Y-%m-%d %H:%M:%S')
+    categorias = list(CATEGORIAS)
+    proveedores = list(PERFILES_PROVEEDOR)
+
+    ubicaciones = [{'id': 1, 'complete_name': 'Partners/Customers', 'usage': 'customer', 'active': True, 'write_date': marca}]
+    ubicaciones += [
+        {'id': 10 + t, 'complete_name': f"T{t + 1}/Stock", 'usage': 'internal', 'active': True, 'write_date': marca}
+        for t in range(n_tiendas)
+    ]
+    internas = [u for u in ubicaciones if u['usage'] == 'internal']
+
+    cat_idx = rng.integers(0, len(categorias), n_productos)
+    costos = rng.uniform(5000, 500000, n_productos).round(0)
+    margenes = rng.uniform(0.15, 0.45, n_productos)
+    productos = [
+        {
+            'id': i + 1, 'default_code': f"{categorias[c][:3].upper()}-{i + 1:04d}",
+            'name': f"{rng.choice(CATEGORIAS[categorias[c]])} Ref-{i + 1}",
+            'categ_id': [c + 1, f"All / {categorias[c]}"], 'product_tmpl_id': [i + 1, f"Plantilla {i + 1}"],
+            'standard_price': float(costos[i]), 'list_price': float(round(costos[i] * (1 + margenes[i]), 0)),
+            'weight': round(float(rng.uniform(0.2, 25)), 2), 'active': True, 'write_date': marca,
+        }
+        for i, c in enumerate(cat_idx.tolist())
+    ]
+
+    prov_idx = rng.integers(0, len(proveedores), n_productos)
+    proveedores_info = [
+        {
+            'id': i + 1, 'partner_id': [p + 1, proveedores[p]], 'product_tmpl_id': [i + 1, f"Plantilla {i + 1}"],
+            'product_id': False, 'price': productos[i]['standard_price'],
+            'delay': int(rng.integers(*PERFILES_PROVEEDOR[proveedores[p]]['lead_time'])),
+            'min_qty': 1.0, 'sequence': 1, 'write_date': marca,
+        }
+        for i, p in enumerate(prov_idx.tolist())
+    ]
+
+    quants, movimientos = [], []
+    demanda = rng.integers(0, 120, (n_productos, len(internas)))
+    stock = rng.integers(0, 400, (n_productos, len(internas)))
+    for i in range(n_productos):
+        for t, ubic in enumerate(internas):
+            producto = [i + 1, productos[i]['name']]
+            if stock[i, t] > 0:
+                quants.append({
+                    'id': len(quants) + 1, 'product_id': producto, 'location_id': [ubic['id'], ubic['complete_name']],
+                    'quantity': float(stock[i, t]), 'reserved_quantity': 0.0, 'write_date': marca,
+                })
+            if demanda[i, t] > 0:
+                fecha = (base - timedelta(days=int(rng.integers(0, 30)))).strftime('%Y-%m-%d %H:%M:%S')
+                movimientos.append({
+                    'id': len(movimientos) + 1, 'product_id': producto,
+                    'location_id': [ubic['id'], ubic['complete_name']], 'location_dest_id': [1, 'Partners/Customers'],
+                    'product_uom_qty': float(demanda[i, t]), 'date': fecha, 'state': 'done', 'write_date': marca,
+                })
+
+    return {
+        'product.product': productos, 'product.supplierinfo': proveedores_info,
+        'stock.location': ubicaciones, 'stock.quant': quants, 'stock.move': movimientos,
+    }
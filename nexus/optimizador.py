@@ -0,0 +1,192 @@
+"""
+Optimizador de reposición con presupuesto para todo el catálogo.
+
+Cada SKU aporta `valor` por unidad comprada (utilidad mensual recuperada) hasta
+`cantidad` unidades, a `costo` por unidad. Sin mínimos es una mochila fraccionaria:
+el orden por valor/costo es óptimo y se resuelve con un argsort y un cumsum.
+Los pedidos mínimos por proveedor se resuelven con una reparación voraz
+(excluir o completar al mínimo a cada proveedor que quede por debajo) y,
+si SciPy está instalado, con un refinamiento MILP opcional.
+"""
+import numpy as np
+import pandas as pd
+
+try:
+    from scipy.optimize import Bounds, LinearConstraint, milp
+    from scipy.sparse import csr_matrix, hstack
+    HAY_SCIPY = True
+except ImportError:
+    HAY_SCIPY = False
+
+MINIMO_PEDIDO_BASE = 1_000_000  # Pedido mínimo por proveedor ($) si no se indica otro
+PASO_PRESUPUESTO = 1_000_000    # "Cada millón adicional" para el valor marginal
+
+
+def _llenar(orden, costo, valor, cantidad, prov, presupuesto, permitido, forzados, minimos):
+    """
+    Llenado voraz: primero cada proveedor forzado hasta su mínimo (sus mejores SKUs),
+    luego el presupuesto restante en el orden global valor/costo.
+    Devuelve las unidades por SKU o None si los mínimos forzados no caben.
+    """
+    x = np.zeros(len(costo), dtype=np.int64)
+    restante = float(presupuesto)
+    for p in forzados:
+        idx = orden[prov[orden] == p]
+        acumulado = np.cumsum(cantidad[idx] * costo[idx])
+        k = int(np.searchsorted(acumulado, minimos[p], side='left'))
+        if k >= len(idx):
+            return None
+        x[idx[:k]] = cantidad[idx[:k]]
+        previo = acumulado[k - 1] if k else 0.0
+        x[idx[k]] = int(np.ceil((minimos[p] - previo) / costo[idx[k]]))
+        restante -= float(acumulado[k - 1] if k else 0.0) + x[idx[k]] * costo[idx[k]]
+    if restante < 0:
+        return None
+
+    idx = orden[permitido[prov[orden]]]
+    pendiente = cantidad[idx] - x[idx]
+    acumulado = np.cumsum(pendiente * costo[idx])
+    k = int(np.searchsorted(acumulado, restante, side='right'))
+    x[idx[:k]] += pendiente[:k]
+    if k < len(idx):
+        sobrante = restante - (acumulado[k - 1] if k else 0.0)
+        x[idx[k]] += min(int(sobrante // costo[idx[k]]), pendiente[k])
+    return x
+
+
+def _precio_sombra(orden, costo, valor, cantidad, x, permitido, prov):
+    """Valor por peso del primer SKU que quedó incompleto (utilidad marginal del presupuesto)."""
+    idx = orden[permitido[prov[orden]]]
+    incompletos = idx[x[idx] < cantidad[idx]]
+    return float(valor[incompletos[0]] / costo[incompletos[0]]) if len(incompletos) else 0.0
+
+
+def _resolver(costo, valor, cantidad, prov, n_prov, presupuesto, minimos, orden):
+    """Llenado voraz + reparación de mínimos por proveedor."""
+    permitido = np.ones(n_prov, dtype=bool)
+    forzados = []
+    disponible = np.bincount(prov, weights=cantidad * costo, minlength=n_prov)
+    permitido &= disponible >= minimos  # Quien no alcanza su mínimo ni comprándole todo, queda fuera
+    x = _llenar(orden, costo, valor, cantidad, prov, presupuesto, permitido, forzados, minimos)
+
+    if x is None:  # Presupuesto negativo: no se compra nada
+        return np.zeros(len(costo), dtype=np.int64), permitido, forzados
+
+    # n_prov + 1 rondas: cada ronda decide al menos un proveedor y la última verifica la anterior
+    for _ in range(n_prov + 1):
+        gasto = np.bincount(prov, weights=x * costo, minlength=n_prov)
+        violadores = [p for p in np.flatnonzero((gasto > 0) & (gasto < minimos - 1e-6)) if p not in forzados]
+        if not violadores:
+            break
+        lam = _precio_sombra(orden, costo, valor, cantidad, x, permitido, prov)
+        valor_prov = np.bincount(prov, weights=x * valor, minlength=n_prov)
+        for p in violadores:
+            # Excluir: se pierde su valor, pero su gasto se reinvierte al precio sombra
+            perdida_excluir = valor_prov[p] - lam * gasto[p]
+            # Completar: el gasto faltante va a sus siguientes mejores SKUs en vez de al margen global
+            idx = orden[(prov[orden] == p)]
+            pendiente_costo = np.cumsum((cantidad[idx] - x[idx]) * costo[idx])
+            pendiente_valor = np.cumsum((cantidad[idx] - x[idx]) * valor[idx])
+            falta = minimos[p] - gasto[p]
+            k = min(int(np.searchsorted(pendiente_costo, falta)), len(idx) - 1)
+            perdida_completar = lam * falta - pendiente_valor[k] * (falta / max(pendiente_costo[k], 1e-9))
+            if perdida_completar < perdida_excluir:
+                forzados.append(p)
+            else:
+                permitido[p] = False
+        nuevo = _llenar(orden, costo, valor, cantidad, prov, presupuesto, permitido, forzados, minimos)
+        while nuevo is None and forzados:  # Los forzados no caben: se excluyen desde el último
+            permitido[forzados.pop()] = False
+            nuevo = _llenar(orden, costo, valor, cantidad, prov, presupuesto, permitido, forzados, minimos)
+        if nuevo is None:
+            break
+        x = nuevo
+    return x, permitido, forzados
+
+
+def _refinar_milp(costo, valor, cantidad, prov, n_prov, presupuesto, minimos, limite_segundos):
+    """MILP exacto (x continuo por SKU, y binario por proveedor) con HiGHS; None si no termina."""
+    n = len(costo)
+    c = np.concatenate([-valor, np.zeros(n_prov)])
+    filas = np.arange(n)
+    # sum c_i x_i <= B
+    fila_presupuesto = csr_matrix(np.concatenate([costo, np.zeros(n_prov)])[None, :])
+    # sum_{i en p} c_i x_i - m_p y_p >= 0
+    por_prov = hstack([csr_matrix((costo, (prov, filas)), shape=(n_prov, n)), csr_matrix(-np.diag(minimos))])
+    # x_i - q_i y_p(i) <= 0
+    enlace = hstack([csr_matrix((np.ones(n), (filas, filas)), shape=(n, n)), csr_matrix((-cantidad.astype(float), (filas, prov)), shape=(n, n_prov))])
+    restricciones = [
+        LinearConstraint(fila_presupuesto, -np.inf, presupuesto),
+        LinearConstraint(por_prov.tocsr(), 0, np.inf),
+        LinearConstraint(enlace.tocsr(), -np.inf, 0),
+    ]
+    res = milp(
+        c, constraints=restricciones,
+        integrality=np.concatenate([np.zeros(n), np.ones(n_prov)]),
+        bounds=Bounds(np.zeros(n + n_prov), np.concatenate([cantidad.astype(float), np.ones(n_prov)])),
+        options={'time_limit': limite_segundos, 'disp': False},
+    )
+    if res.x is None:
+        return None
+    return np.floor(res.x[:n] + 1e-6).astype(np.int64)
+
+
+def optimizar_compras(costo, valor, cantidad, proveedor, presupuesto, minimos=None, refinar=False, limite_segundos=10):
+    """
+    Unidades a comprar por SKU que maximizan `valor` con gasto <= presupuesto y
+    gasto por proveedor = 0 o >= su mínimo. `minimos` = {proveedor: $}.
+
+    Devuelve un dict con 'cantidad' (unidades por SKU), 'valor', 'gasto',
+    'precio_sombra' (utilidad recuperada por peso adicional) y 'proveedores'
+    (resumen por proveedor). `refinar=True` intenta mejorar la solución con MILP (SciPy).
+    """
+    costo = np.asarray(costo, dtype=np.float64)
+    valor = np.asarray(valor, dtype=np.float64)
+    cantidad = np.maximum(np.asarray(cantidad, dtype=np.int64), 0)
+    cantidad = np.where((costo > 0) & (valor > 0), cantidad, 0)
+    prov_cat = pd.Categorical(proveedor)
+    prov, nombres = prov_cat.codes.astype(np.int64), list(prov_cat.categories)
+    minimos_arr = np.array([(minimos or {}).get(p, MINIMO_PEDIDO_BASE) for p in nombres], dtype=np.float64)
+
+    # Orden global por valor/costo (una sola vez)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.where(costo > 0, valor / costo, 0.0)
+    orden = np.argsort(-ratio, kind='stable')
+    orden = orden[cantidad[orden] > 0]
+
+    x, permitido, forzados = _resolver(costo, valor, cantidad, prov, len(nombres), presupuesto, minimos_arr, orden)
+    metodo = 'voraz'
+    if refinar and HAY_SCIPY and len(orden):
+        x_milp = _refinar_milp(costo, valor, cantidad, prov, len(nombres), presupuesto, minimos_arr, limite_segundos)
+        if x_milp is not None and x_milp @ valor > x @ valor:
+            # Al redondear unidades hacia abajo un proveedor puede quedar justo bajo su mínimo
+            gasto_milp = np.bincount(prov, weights=x_milp * costo, minlength=len(nombres))
+            if np.all((gasto_milp == 0) | (gasto_milp >= minimos_arr - 1e-6)):
+                x, metodo = x_milp, 'milp'
+
+    gasto = np.bincount(prov, weights=x * costo, minlength=len(nombres))
+    proveedores = pd.DataFrame({
+        'Proveedor': nombres,
+        'SKUs': np.bincount(prov, weights=(x > 0), minlength=len(nombres)).astype(np.int64),
+        'Gasto': gasto,
+        'Utilidad_Recuperada': np.bincount(prov, weights=x * valor, minlength=len(nombres)),
+        'Minimo': minimos_arr,
+        'Estado': np.where(gasto > 0, 'Incluido', np.where(permitido, 'Sin compra', 'Excluido (bajo mínimo)')),
+    })
+    proveedores.loc[proveedores.index.isin(forzados), 'Estado'] = 'Completado al mínimo'
+    return {
+        'cantidad': x,
+        'valor': float(x @ valor),
+        'gasto': float(x @ costo),
+        'precio_sombra': _precio_sombra(orden, costo, valor, cantidad, x, permitido, prov),
+        'proveedores': proveedores,
+        'metodo': metodo,
+    }
+
+
+def curva_presupuesto(costo, valor, cantidad, proveedor, presupuestos, minimos=None):
+    """Utilidad recuperada para cada presupuesto de la lista (retorno de cada millón extra)."""
+    return pd.DataFrame({
+        'Presupuesto': presupuestos,
+        'Utilidad_Recuperada': [optimizar_compras(costo, valor, cantidad, proveedor, b, minimos)['valor'] for b in presupuestos],
+    })
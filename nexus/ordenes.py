@@ -0,0 +1,92 @@
+"""
+Órdenes de compra en lote: una orden (Excel + PDF) por proveedor para toda la vista.
+
+Las líneas con Sugerencia_Compra > 0 se parten por proveedor y cada proveedor
+genera sus dos documentos en un proceso del pool (FPDF y xlsxwriter son Python
+puro y no sueltan el GIL, así que los hilos no paralelizan). Los documentos se
+escriben al ZIP apenas llegan, junto con un manifiesto CSV con las líneas,
+unidades, total y archivos de cada proveedor. Los proveedores más grandes se
+despachan primero para que no queden solos al final del lote.
+"""
+import io
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from nexus.excel import escribir_excel
+from nexus.pdf import documento_tabla
+
+COLUMNAS_ORDEN = {
+    'SKU': 'SKU', 'Descripcion': 'Producto', 'Almacen_Nombre': 'Tienda', 'Stock': 'Stock Actual',
+    'Sugerencia_Compra': 'Cant. Sugerida', 'Costo_Promedio_UND': 'Costo Unit.',
+}
+COLUMNAS_MANIFIESTO = ['Proveedor', 'Lineas', 'Unidades', 'Total', 'Excel', 'PDF']
+MANIFIESTO = 'manifiesto.csv'
+
+
+def lineas_orden(df, proveedor='Proveedor', cantidad='Sugerencia_Compra'):
+    """Líneas a comprar (cantidad > 0) con las columnas de la orden, por proveedor y de mayor a menor valor."""
+    compra = df[df[cantidad] > 0]
+    lineas = compra[list(COLUMNAS_ORDEN)].rename(columns=COLUMNAS_ORDEN)
+    lineas['Total Estimado'] = lineas['Cant. Sugerida'] * lineas['Costo Unit.']
+    lineas.insert(0, 'Proveedor', compra[proveedor].astype(str).to_numpy())
+    orden = np.lexsort((-lineas['Total Estimado'].to_numpy(dtype=np.float64), lineas['Proveedor'].to_numpy()))
+    return lineas.iloc[orden].reset_index(drop=True)
+
+
+def nombre_archivo(proveedor):
+    """Nombre seguro para archivo: letras, números, guion y guion bajo."""
+    return re.sub(r'[^\w\-]+', '_', str(proveedor)).strip('_') or 'Proveedor'
+
+
+def _documentos_proveedor(args):
+    """Punto de entrada de cada proceso: Excel y PDF de la orden de un proveedor."""
+    proveedor, lineas = args
+    return escribir_excel(lineas, hoja='Orden_Compra'), documento_tabla(lineas, f"ORDEN DE COMPRA - {proveedor}")
+
+
+def generar_ordenes(df, procesos=None, proveedor='Proveedor', cantidad='Sugerencia_Compra'):
+    """
+    Genera las órdenes de todos los proveedores de `df` en un solo ZIP
+    (OC_<proveedor>.xlsx, OC_<proveedor>.pdf y manifiesto.csv).
+
+    `procesos` = 1 (o una sola CPU) las genera en el proceso actual.
+    Devuelve (bytes del ZIP, manifiesto como DataFrame).
+    """
+    lineas = lineas_orden(df, proveedor, cantidad)
+    grupos = [(p, g.drop(columns='Proveedor').reset_index(drop=True)) for p, g in lineas.groupby('Proveedor', sort=True)]
+
+    manifiesto, usados = [], set()
+    for p, g in grupos:
+        base = nombre_archivo(p)
+        nombre, k = base, 2
+        while nombre.lower() in usados:  # Proveedores distintos con el mismo nombre de archivo
+            nombre, k = f"{base}_{k}", k + 1
+        usados.add(nombre.lower())
+        manifiesto.append((p, len(g), int(g['Cant. Sugerida'].sum()), float(g['Total Estimado'].sum()), f"OC_{nombre}.xlsx", f"OC_{nombre}.pdf"))
+    manifiesto = pd.DataFrame(manifiesto, columns=COLUMNAS_MANIFIESTO)
+
+    # Los más grandes primero; cada par de documentos entra al ZIP apenas llega
+    despacho = sorted(range(len(grupos)), key=lambda i: -len(grupos[i][1]))
+    procesos = procesos or os.cpu_count() or 1
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as zf:
+        if procesos == 1 or len(grupos) <= 1:
+            documentos = map(_documentos_proveedor, (grupos[i] for i in despacho))
+            pool = None
+        else:
+            pool = ProcessPoolExecutor(max_workers=min(procesos, len(grupos)))
+            documentos = pool.map(_documentos_proveedor, [grupos[i] for i in despacho])
+        try:
+            for i, (excel, pdf) in zip(despacho, documentos):
+                zf.writestr(manifiesto.at[i, 'Excel'], excel, compress_type=zipfile.ZIP_STORED)  # xlsx ya viene comprimido
+                zf.writestr(manifiesto.at[i, 'PDF'], pdf)
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+        zf.writestr(MANIFIESTO, manifiesto.to_csv(index=False).encode('utf-8-sig'))
+    return output.getvalue(), manifiesto
@@ -0,0 +1,268 @@
+"""
+Reportes PDF (FPDF) compartidos por las páginas: base corporativa, reporte ejecutivo
+y tablas paginadas para órdenes de compra y traslado.
+
+Las tablas se preparan por columna (formato, anchos de texto con la tabla de anchos
+de la fuente, recorte) con numpy y se dibujan con pdf.text y líneas de la grilla:
+FPDF.cell por celda es ~10x más lento y dominaba órdenes de miles de líneas.
+"""
+import io
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from fpdf import FPDF
+
+from nexus.excel import PALABRAS_MONEDA
+
+ALTO_FILA = 6
+TAMANO_FUENTE_TABLA = 8
+RELLENO_CELDA = 1.5  # mm a cada lado del texto
+ANCHO_MIN_TEXTO = 25.0
+COLOR_ENCABEZADO = (232, 244, 253)
+COLOR_CEBRA = (248, 249, 250)
+
+
+def texto_pdf(texto):
+    """Las fuentes base de FPDF son latin-1: se descartan emojis y símbolos fuera de rango."""
+    return str(texto).encode('latin-1', 'ignore').decode('latin-1').strip()
+
+
+class PDFReport(FPDF):
+    """Clase personalizada para el PDF."""
+    titulo_reporte = 'NEXUS PRO - Reporte Operativo'
+
+    def header(self):
+        self.set_font('Arial', 'B', 15)
+        self.set_text_color(46, 134, 193) # Azul corporativo
+        self.cell(0, 10, self.titulo_reporte, 0, 1, 'C')
+        self.ln(5)
+    def footer(self):
+        self.set_y(-15)
+        self.set_font('Arial', 'I', 8)
+        self.set_text_color(128)
+        self.cell(0, 10, f'Pagina {self.page_no()}', 0, 0, 'C')
+
+
+def formatear_columna(nombre, serie):
+    """Textos de una columna (moneda $ con miles, enteros con miles, decimales) y si va a la derecha."""
+    if pd.api.types.is_bool_dtype(serie.dtype) or not pd.api.types.is_numeric_dtype(serie.dtype):
+        textos = serie.astype(object).where(serie.notna(), '').astype(str)
+        return textos.str.encode('latin-1', 'ignore').str.decode('latin-1').to_numpy(dtype=object), False
+    valores = serie.to_numpy(dtype=np.float64, na_value=np.nan)
+    if any(p.lower() in str(nombre).lower() for p in PALABRAS_MONEDA):
+        patron = "${:,.0f}"
+    elif pd.api.types.is_integer_dtype(serie.dtype) or np.all(np.isnan(valores) | (valores == np.round(valores))):
+        patron = "{:,.0f}"
+    else:
+        patron = "{:,.1f}"
+    return np.array([patron.format(v) if v == v else '' for v in valores.tolist()], dtype=object), True
+
+
+def _anchos_texto(textos, tabla_anchos, tamano):
+    """Ancho (mm) de cada texto y acumulados por carácter, con la tabla de anchos de la fuente."""
+    largos = np.fromiter((len(t) for t in textos), dtype=np.int64, count=len(textos))
+    codigos = np.frombuffer(''.join(textos).encode('latin-1'), dtype=np.uint8)
+    acumulado = np.concatenate([[0.0], np.cumsum(tabla_anchos[codigos] * tamano / 1000)])
+    fin = np.cumsum(largos)
+    inicio = fin - largos
+    return acumulado[fin] - acumulado[inicio], acumulado, inicio, largos
+
+
+def _recortar(textos, disponible, acumulado, inicio, largos):
+    """Recorta con '..' los textos que no caben en `disponible` mm (conteo vectorizado de caracteres que caben)."""
+    dueno = np.repeat(np.arange(len(textos)), largos)
+    caben = (acumulado[1:] - acumulado[inicio][dueno]) <= disponible + 1e-6
+    n_caben = np.bincount(dueno, weights=caben, minlength=len(textos)).astype(np.int64)
+    largos_rec = np.flatnonzero(n_caben < largos)
+    if len(largos_rec):
+        textos = textos.copy()
+        for i in largos_rec.tolist():
+            textos[i] = textos[i][:max(n_caben[i] - 2, 0)] + '..'
+    return textos
+
+
+def tabla_pdf(pdf, df, ancho_total=None, alto_fila=ALTO_FILA, tamano_fuente=TAMANO_FUENTE_TABLA):
+    """
+    Dibuja `df` como tabla desde la posición actual, paginando con el encabezado repetido.
+
+    El ancho natural de cada columna es su texto más ancho (o el encabezado); si no
+    caben, las columnas de texto más anchas ceden primero, hasta su mediana. Los números
+    se alinean a la derecha y los textos largos se recortan al ancho de su columna.
+    """
+    ancho_total = ancho_total or pdf.w - pdf.l_margin - pdf.r_margin
+    columnas = [texto_pdf(c) for c in df.columns]
+    pdf.set_font('Arial', '', tamano_fuente)
+    tabla_normal = _tabla_anchos(pdf)
+    tam = pdf.font_size
+    pdf.set_font('Arial', 'B', tamano_fuente)
+    tabla_negrita = _tabla_anchos(pdf)
+
+    textos, derecha, naturales, minimos = [], [], [], []
+    for nombre, encabezado in zip(df.columns, columnas):
+        t, der = formatear_columna(nombre, df[nombre])
+        anchos, *_ = _anchos_texto(t, tabla_normal, tam)
+        ancho_encabezado = _anchos_texto(np.array([encabezado], dtype=object), tabla_negrita, tam)[0][0]
+        mediana = float(np.median(anchos)) if len(anchos) else 0.0
+        natural = max(float(anchos.max()) if len(anchos) else 0.0, ancho_encabezado) + 2 * RELLENO_CELDA
+        textos.append(t)
+        derecha.append(der)
+        naturales.append(natural)
+        # Los textos pueden ceder hasta su mediana (sin bajar del encabezado ni pasar de ANCHO_MIN_TEXTO)
+        minimos.append(natural if der else min(max(mediana, ancho_encabezado) + 2 * RELLENO_CELDA, natural, ANCHO_MIN_TEXTO))
+
+    # Ajuste al ancho disponible: los números conservan su ancho; las columnas de texto más
+    # anchas se topan a un mismo nivel (sin bajar de su mínimo) y las angostas quedan intactas
+    naturales, minimos = np.array(naturales), np.array(minimos)
+    if naturales.sum() > ancho_total:
+        bajo, alto = 0.0, float(naturales.max())
+        for _ in range(50):
+            nivel = (bajo + alto) / 2
+            bajo, alto = (nivel, alto) if np.maximum(np.minimum(naturales, nivel), minimos).sum() < ancho_total else (bajo, nivel)
+        naturales = np.maximum(np.minimum(naturales, alto), minimos)
+    anchos_col = naturales * (ancho_total / naturales.sum())  # Reparte el sobrante (o encoge todo si no alcanzó)
+
+    # Recorte por columna al ancho final (y ancho de cada texto para alinear a la derecha)
+    anchos_texto = []
+    for c, t in enumerate(textos):
+        anchos, acumulado, inicio, largos = _anchos_texto(t, tabla_normal, tam)
+        disponible = anchos_col[c] - 2 * RELLENO_CELDA
+        if (anchos > disponible + 1e-6).any():
+            textos[c] = _recortar(t, disponible, acumulado, inicio, largos)
+            anchos = _anchos_texto(textos[c], tabla_normal, tam)[0]
+        anchos_texto.append(anchos)
+    encabezados = []
+    for c, nombre in enumerate(columnas):
+        unico = np.array([nombre], dtype=object)
+        _, acumulado, inicio, largos = _anchos_texto(unico, tabla_negrita, tam)
+        encabezados.append(_recortar(unico, anchos_col[c] - 2 * RELLENO_CELDA, acumulado, inicio, largos)[0])
+
+    x0 = pdf.l_margin
+    bordes = x0 + np.concatenate([[0.0], np.cumsum(anchos_col)])
+    base = alto_fila * 0.68  # Línea base del texto dentro de la fila
+    auto, margen = pdf.auto_page_break, pdf.b_margin
+    pdf.set_auto_page_break(False)
+    fila, n = 0, len(df)
+    while True:
+        y = pdf.get_y()
+        caben = max(int((pdf.h - margen - y) / alto_fila) - 1, 0)
+        if caben == 0 and n:
+            pdf.add_page()
+            continue
+        hasta = min(fila + caben, n)
+        # Encabezado
+        pdf.set_fill_color(*COLOR_ENCABEZADO)
+        pdf.rect(x0, y, ancho_total, alto_fila, 'F')
+        pdf.set_font('Arial', 'B', tamano_fuente)
+        pdf.set_text_color(0)
+        for c, enc in enumerate(encabezados):
+            pdf.text(bordes[c] + RELLENO_CELDA, y + base, enc)
+        # Cebra y grilla
+        pdf.set_fill_color(*COLOR_CEBRA)
+        for k in range(1, hasta - fila, 2):
+            pdf.rect(x0, y + (k + 1) * alto_fila, ancho_total, alto_fila, 'F')
+        y_fin = y + (hasta - fila + 1) * alto_fila
+        pdf.set_draw_color(200)
+        pdf.set_line_width(0.1)
+        for k in range(hasta - fila + 2):
+            pdf.line(x0, y + k * alto_fila, x0 + ancho_total, y + k * alto_fila)
+        for b in bordes:
+            pdf.line(b, y, b, y_fin)
+        # Textos, columna por columna
+        pdf.set_font('Arial', '', tamano_fuente)
+        for c, col in enumerate(textos):
+            if derecha[c]:
+                x = (bordes[c + 1] - RELLENO_CELDA) - anchos_texto[c][fila:hasta]
+            else:
+                x = np.full(hasta - fila, bordes[c] + RELLENO_CELDA)
+            for k, (v, xk) in enumerate(zip(col[fila:hasta].tolist(), x.tolist()), start=1):
+                if v:
+                    pdf.text(xk, y + k * alto_fila + base, v)
+        pdf.set_y(y_fin)
+        fila = hasta
+        if fila >= n:
+            break
+        pdf.add_page()
+    pdf.set_auto_page_break(auto, margen)
+    pdf.set_draw_color(0)
+
+
+def documento_tabla(df, titulo):
+    """PDF de una orden: título, fecha de generación y la tabla paginada de `df`."""
+    pdf = PDFReport()
+    pdf.add_page()
+    pdf.set_text_color(0)
+    pdf.set_font("Arial", 'B', 12)
+    pdf.cell(0, 10, texto_pdf(titulo), 0, 1, 'L')
+    pdf.set_font("Arial", '', 10)
+    pdf.cell(0, 10, f"Fecha Generación: {datetime.now().strftime('%Y-%m-%d %H:%M')}", 0, 1, 'L')
+    pdf.ln(5)
+    tabla_pdf(pdf, df)
+    return bytes(pdf.output())
+
+
+def _tabla_anchos(pdf):
+    """Anchos por código latin-1 (milésimas de em) de la fuente actual."""
+    tabla = np.zeros(256)
+    for caracter, ancho in pdf.current_font.cw.items():
+        codigo = ord(caracter) if isinstance(caracter, str) else int(caracter)
+        if codigo < 256:
+            tabla[codigo] = ancho
+    return tabla
+
+
+def reporte_ejecutivo(titulo, kpis, figuras, renderizador=None):
+    """
+    PDF ejecutivo: tarjetas de KPIs (lista de (etiqueta, valor)) y gráficos
+    (lista de (título, figura Plotly)) renderizados con `renderizador.png`.
+    Si un gráfico no se puede renderizar, el reporte sale igual con una nota.
+    """
+    pdf = PDFReport()
+    pdf.titulo_reporte = 'NEXUS PRO - Reporte Ejecutivo'
+    pdf.set_auto_page_break(True, margin=20)
+    pdf.add_page()
+
+    pdf.set_font("Arial", 'B', 13)
+    pdf.set_text_color(0)
+    pdf.cell(0, 9, texto_pdf(titulo), 0, 1, 'L')
+    pdf.set_font("Arial", '', 9)
+    pdf.set_text_color(100)
+    pdf.cell(0, 6, f"Fecha Generación: {datetime.now().strftime('%Y-%m-%d %H:%M')}", 0, 1, 'L')
+    pdf.ln(3)
+
+    # Tarjetas de KPIs, 4 por fila
+    ancho = 190 / 4
+    for i, (etiqueta, valor) in enumerate(kpis):
+        if i and i % 4 == 0:
+            pdf.ln(20)
+        x, y = pdf.l_margin + (i % 4) * ancho, pdf.get_y()
+        pdf.set_fill_color(248, 249, 250)
+        pdf.rect(x + 1, y, ancho - 2, 18, 'F')
+        pdf.set_xy(x + 2, y + 2)
+        pdf.set_font("Arial", 'B', 7)
+        pdf.set_text_color(102)
+        pdf.cell(ancho - 4, 4, texto_pdf(etiqueta).upper()[:34], 0, 2, 'L')
+        pdf.set_font("Arial", 'B', 13)
+        pdf.set_text_color(46, 134, 193)
+        pdf.cell(ancho - 4, 9, texto_pdf(valor), 0, 0, 'L')
+        pdf.set_xy(pdf.l_margin, y)
+    pdf.ln(24)
+
+    # Gráficos a ancho completo (900x450 px -> 190x95 mm)
+    for titulo_fig, fig in figuras:
+        if pdf.get_y() + 105 > pdf.h - pdf.b_margin:
+            pdf.add_page()
+        pdf.set_font("Arial", 'B', 11)
+        pdf.set_text_color(0)
+        pdf.cell(0, 8, texto_pdf(titulo_fig), 0, 1, 'L')
+        try:
+            if renderizador is None:
+                raise RuntimeError("sin renderizador")
+            pdf.image(io.BytesIO(renderizador.png(fig)), w=190, h=95)
+        except Exception as e:
+            pdf.set_font("Arial", 'I', 9)
+            pdf.set_text_color(150)
+            pdf.cell(0, 8, texto_pdf(f"(Gráfico no disponible: {e})")[:120], 0, 1, 'L')
+        pdf.ln(4)
+
+    return bytes(pdf.output())
@@ -0,0 +1,32 @@
+"""Selección parcial top-N (argpartition) para los rankings de Estrategia y Logística."""
+import numpy as np
+
+
+def indices_top_n(valores, n, ascendente=False):
+    """
+    Posiciones de los `n` mejores valores, ya ordenadas, en O(len + n log n).
+    Los NaN quedan al final, como en sort_values.
+    """
+    clave = np.asarray(valores, dtype=np.float64)
+    clave = clave if ascendente else -clave
+    clave = np.where(np.isnan(clave), np.inf, clave)
+    n = max(0, min(int(n), len(clave)))
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+    idx = np.argpartition(clave, n - 1)[:n] if n < len(clave) else np.arange(len(clave))
+    return idx[np.argsort(clave[idx], kind='stable')]
+
+
+def top_n(df, columna, n, ascendente=False):
+    """Equivalente a df.sort_values(columna, ascending=ascendente).head(n) sin ordenar todo."""
+    return df.iloc[indices_top_n(df[columna].to_numpy(dtype=np.float64, na_value=np.nan), n, ascendente)]
+
+
+def top_n_por_grupo(df, columna, n, por, ascendente=False):
+    """Top-N de `columna` dentro de cada grupo de `por` (p. ej. por categoría o proveedor)."""
+    valores = df[columna].to_numpy(dtype=np.float64, na_value=np.nan)
+    posiciones = [
+        idx[indices_top_n(valores[idx], n, ascendente)]
+        for idx in df.groupby(por, observed=True, sort=True).indices.values()
+    ]
+    return df.iloc[np.concatenate(posiciones)] if posiciones else df.iloc[:0]
@@ -0,0 +1,107 @@
+"""
+Render de figuras Plotly a PNG con un Kaleido de larga vida por proceso.
+
+El navegador headless se abre una sola vez (con `pestanas` pestañas en paralelo) en
+un hilo con su propio event loop; cada PNG se guarda en una cache LRU por hash de
+la figura, así que varios reportes con los mismos gráficos no vuelven a renderizar.
+Los reportes completos se construyen en un hilo de fondo (enviar_trabajo).
+"""
+import asyncio
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from nexus.cache_vistas import CacheVistas
+
+PESTANAS = 2
+TIMEOUT_RENDER = 90
+
+
+def hash_figura(fig):
+    """Hash estable del JSON completo de la figura (datos + layout)."""
+    return hashlib.blake2b(fig.to_json().encode(), digest_size=16).hexdigest()
+
+
+class RenderizadorKaleido:
+    """Kaleido abierto una vez por proceso; `png()` es seguro para llamar desde varios hilos."""
+
+    def __init__(self, pestanas=PESTANAS, max_imagenes=128, max_bytes=64 * 1024 ** 2, timeout=TIMEOUT_RENDER):
+        self.pestanas = pestanas
+        self.timeout = timeout
+        self._cache = CacheVistas(max_entradas=max_imagenes, max_bytes=max_bytes)
+        self._lock = threading.Lock()
+        self._loop = None
+        self._kaleido = None
+        self._detener = None
+        self._hilo = None
+        self._listo = threading.Event()
+        self._error = None
+
+    # --- Ciclo de vida del navegador ---
+    async def _servir(self):
+        import kaleido  # Dependencia pesada: solo se importa si se renderiza
+
+        try:
+            async with kaleido.Kaleido(n=self.pestanas, timeout=self.timeout) as k:
+                self._kaleido = k
+                self._detener = asyncio.Event()
+                self._listo.set()
+                await self._detener.wait()
+        except Exception as e:  # Sin Chrome/Chromium disponible, p. ej.
+            self._error = e
+            self._listo.set()
+
+    def _iniciar(self):
+        if self._hilo and self._hilo.is_alive():
+            return
+        self._listo.clear()
+        self._error = None
+        self._loop = asyncio.new_event_loop()
+        self._hilo = threading.Thread(target=self._loop.run_until_complete, args=(self._servir(),), daemon=True)
+        self._hilo.start()
+        self._listo.wait(self.timeout)
+        if self._error is not None or self._kaleido is None:
+            raise RuntimeError(f"No se pudo iniciar Kaleido: {self._error}")
+
+    def cerrar(self):
+        if self._hilo and self._hilo.is_alive():
+            self._loop.call_soon_threadsafe(self._detener.set)
+            self._hilo.join(self.timeout)
+        self._kaleido = None
+
+    # --- Render ---
+    def png(self, fig, ancho=900, alto=450, escala=2):
+        """PNG de la figura; reutiliza el de la cache si la figura no cambió."""
+        clave = (hash_figura(fig), ancho, alto, escala)
+        with self._lock:
+            if clave in self._cache:
+                return self._cache.obtener(clave, None)
+            self._iniciar()
+        opciones = {'format': 'png', 'width': ancho, 'height': alto, 'scale': escala}
+        futuro = asyncio.run_coroutine_threadsafe(self._kaleido.calc_fig(fig, opts=opciones), self._loop)
+        imagen = futuro.result(self.timeout)
+        with self._lock:
+            return self._cache.obtener(clave, lambda: imagen, medir=len)
+
+    def estadisticas(self):
+        with self._lock:
+            return self._cache.estadisticas()
+
+
+_RENDERIZADOR = None
+_LOCK_GLOBAL = threading.Lock()
+_EJECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="nexus-reportes")
+
+
+def renderizador():
+    """Renderizador compartido del proceso (se crea en el primer uso)."""
+    global _RENDERIZADOR
+    with _LOCK_GLOBAL:
+        if _RENDERIZADOR is None:
+            _RENDERIZADOR = RenderizadorKaleido()
+        return _RENDERIZADOR
+
+
+def enviar_trabajo(funcion, *args, **kwargs):
+    """Ejecuta `funcion` en el hilo de reportes y devuelve su Future (la página no se bloquea)."""
+    return _EJECUTOR.submit(funcion, *args, **kwargs)
@@ -0,0 +1,35 @@
+"""Botón de reporte PDF que se construye en segundo plano sin bloquear la página."""
+import streamlit as st
+
+from nexus.render import enviar_trabajo
+
+
+@st.fragment(run_every=1)
+def _esperar_reporte(clave):
+    """Solo este fragmento se refresca (cada segundo) mientras el reporte está en construcción."""
+    if st.session_state[clave].done():
+        st.rerun()  # Rerun completo: muestra el botón de descarga
+    st.info("⏳ Generando reporte en segundo plano...")
+
+
+def _estado_reporte(clave, nombre_archivo):
+    futuro = st.session_state.get(clave)
+    if futuro is None:
+        return
+    if not futuro.done():
+        _esperar_reporte(clave)
+    elif futuro.exception() is not None:
+        st.error(f"No se pudo generar el reporte: {futuro.exception()}")
+    else:
+        st.download_button("📥 Descargar PDF", futuro.result(), file_name=nombre_archivo, mime="application/pdf", key=f"{clave}_descarga")
+
+
+def panel_reporte_pdf(clave, preparar, nombre_archivo):
+    """
+    `preparar()` corre en la página al pulsar el botón y devuelve (funcion, args);
+    `funcion(*args)` -> bytes del PDF corre en el hilo de reportes.
+    """
+    if st.button("📄 Generar Reporte Ejecutivo (PDF)", key=f"{clave}_boton"):
+        funcion, args = preparar()
+        st.session_state[clave] = enviar_trabajo(funcion, *args)
+    _estado_reporte(clave, nombre_archivo)
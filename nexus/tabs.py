@@ -0,0 +1,24 @@
+"""Pestañas perezosas: solo se calcula el contenido de la pestaña visible."""
+import os
+
+import streamlit as st
+
+
+def tabs_perezosas(etiquetas, key):
+    """
+    Igual que st.tabs, pero con seguimiento de la pestaña activa (rerun al cambiar).
+    Usar con `tab_activa(tab)` para saltar las agregaciones y figuras ocultas.
+    NEXUS_TABS_PEREZOSAS=0 fuerza el comportamiento clásico (todas se calculan).
+    """
+    if os.environ.get("NEXUS_TABS_PEREZOSAS", "1") == "0":
+        return st.tabs(etiquetas)
+    try:
+        return st.tabs(etiquetas, key=key, on_change="rerun")
+    except TypeError:  # Streamlit sin ejecución perezosa de pestañas
+        return st.tabs(etiquetas)
+
+
+def tab_activa(tab):
+    """True si la pestaña está seleccionada (o si no hay seguimiento de estado)."""
+    abierta = getattr(tab, 'open', None)
+    return True if abierta is None else bool(abierta)
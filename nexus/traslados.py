@@ -0,0 +1,93 @@
+"""
+Emparejamiento de traslados entre tiendas: excedente -> necesidad del mismo SKU.
+
+Por SKU, las filas con Excedente_Trasladable (orígenes) y con Necesidad_Total
+(destinos) se ordenan de mayor a menor y se asignan como dos colas: cada unidad
+trasladable cubre la siguiente unidad pendiente. Con los acumulados de oferta y
+demanda de todos los SKUs puestos uno tras otro en una sola recta, las líneas de
+traslado son los tramos entre cortes consecutivos, y un searchsorted da el origen
+y el destino de cada tramo. Toda la red se resuelve en una pasada (O(n log n)),
+nunca se traslada más que el excedente de un origen ni más que la necesidad
+de un destino, y origen y destino son siempre tiendas distintas (una fila no
+puede tener excedente y necesidad a la vez).
+"""
+import numpy as np
+import pandas as pd
+
+COLUMNAS_LINEAS = ['Origen', 'Destino', 'Cantidad']
+
+
+def _ordenar(filas, cantidad, codigos):
+    """Filas agrupadas por SKU y, dentro del SKU, de mayor a menor cantidad (una sola clave entera)."""
+    clave = codigos[filas] * (int(cantidad.max(initial=0)) + 1) - cantidad[filas]
+    return filas[np.argsort(clave, kind='stable')]
+
+
+def _fronteras(filas, cantidad, codigos, inicio, emparejado):
+    """Fin de cada fila en la recta global: inicio del SKU + acumulado dentro del SKU (tope: lo emparejado)."""
+    sku = codigos[filas]
+    acumulado = np.cumsum(cantidad)
+    total_sku = np.bincount(sku, weights=cantidad, minlength=len(inicio)).astype(np.int64)
+    previo = np.cumsum(total_sku) - total_sku  # Lo acumulado por los SKUs anteriores
+    return inicio[sku] + np.minimum(acumulado - previo[sku], emparejado[sku])
+
+
+def emparejar_traslados(df, sku='SKU', excedente='Excedente_Trasladable', necesidad='Necesidad_Total'):
+    """
+    Líneas de traslado (Origen, Destino, Cantidad) con Origen/Destino = etiquetas del índice de `df`.
+
+    Cada SKU traslada min(excedente total, necesidad total); el resto de la necesidad
+    queda para compra. Las filas sin SKU (nulo) no participan: su necesidad va a compra.
+    """
+    codigos = pd.factorize(df[sku])[0].astype(np.int64)
+    exc = df[excedente].to_numpy(dtype=np.int64)
+    nec = df[necesidad].to_numpy(dtype=np.int64)
+    n_sku = int(codigos.max()) + 1 if len(codigos) else 0
+
+    # Orígenes y destinos agrupados por SKU, de mayor a menor cantidad
+    con_sku = codigos >= 0  # factorize marca los nulos con -1
+    origenes = _ordenar(np.flatnonzero((exc > 0) & con_sku), exc, codigos)
+    destinos = _ordenar(np.flatnonzero((nec > 0) & con_sku), nec, codigos)
+
+    oferta = np.bincount(codigos[origenes], weights=exc[origenes], minlength=n_sku).astype(np.int64)
+    demanda = np.bincount(codigos[destinos], weights=nec[destinos], minlength=n_sku).astype(np.int64)
+    emparejado = np.minimum(oferta, demanda)
+    inicio = np.cumsum(emparejado) - emparejado
+
+    fin_origen = _fronteras(origenes, exc[origenes], codigos, inicio, emparejado)
+    fin_destino = _fronteras(destinos, nec[destinos], codigos, inicio, emparejado)
+
+    # Cada tramo (corte anterior, corte] tiene un único origen y un único destino
+    cortes = np.sort(np.concatenate([fin_origen, fin_destino]))
+    cortes = cortes[(cortes > 0) & np.diff(cortes, prepend=0).astype(bool)]
+    cantidad = np.diff(cortes, prepend=0)
+    i = np.searchsorted(fin_origen, cortes, side='left')
+    j = np.searchsorted(fin_destino, cortes, side='left')
+    return pd.DataFrame({
+        'Origen': df.index[origenes[i]],
+        'Destino': df.index[destinos[j]],
+        'Cantidad': cantidad,
+    }, columns=COLUMNAS_LINEAS)
+
+
+def traslado_por_fila(df, lineas):
+    """Unidades a recibir por traslado en cada fila de `df` (suma de sus líneas como destino)."""
+    destino = df.index.get_indexer(lineas['Destino'])
+    return np.bincount(destino, weights=lineas['Cantidad'], minlength=len(df)).astype(np.int64)
+
+
+def detalle_traslados(df, lineas):
+    """Líneas con SKU, descripción, sedes de origen y destino, costo, peso unitario y valor del traslado."""
+    origen = df.loc[lineas['Origen']]
+    destino = df.loc[lineas['Destino']]
+    detalle = pd.DataFrame({
+        'SKU': destino['SKU'].to_numpy(),
+        'Descripcion': destino['Descripcion'].to_numpy(),
+        'Origen': origen['Almacen_Nombre'].to_numpy(),
+        'Destino': destino['Almacen_Nombre'].to_numpy(),
+        'Cantidad': lineas['Cantidad'].to_numpy(),
+        'Costo_Promedio_UND': destino['Costo_Promedio_UND'].to_numpy(),
+        'Peso_Articulo': destino['Peso_Articulo'].to_numpy(),
+    }, index=lineas.index)
+    detalle['Valor_Traslado'] = detalle['Cantidad'] * detalle['Costo_Promedio_UND']
+    return detalle
@@ -4,6 +4,26 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 import time
+import os
+
+from nexus.figuras import figura_cacheada
+from nexus.historia import StoreHistoria, snapshot_estrategia
+from nexus.generador import CATEGORIAS, PERFILES_PROVEEDOR, generar_catalogo, generar_catalogo_particionado
+from nexus.cache_vistas import CacheVistas, clave_filtros
+from nexus.campanas import HORIZONTE_MESES, N_ESCENARIOS, resumen_campanas, simular_campanas
+from nexus.compacto import compactar_catalogo, filtrar_catalogo, reporte_memoria
+from nexus.cubo import agregar_cubo, construir_cubo, kpis_cubo, seleccionar_cubo
+from nexus.dispersion import UMBRAL_PUNTOS, binear_dispersion, figura_densidad, figura_puntos
+from nexus.listas_precios import StoreOfertas, indexar_ofertas, matriz_ofertas, version_ofertas
+from nexus.licitacion import OFERTAS_BASE, PESOS_BASE, barrido_pesos, licitar, malla_pesos, matriz_ofertas_fija, regiones_ganadoras, resumen_regiones
+from nexus.odoo import StoreParquet
+from nexus.optimizador import MINIMO_PEDIDO_BASE, PASO_PRESUPUESTO, curva_presupuesto, optimizar_compras
+from nexus.pdf import reporte_ejecutivo
+from nexus.render import renderizador
+from nexus.reportes_ui import panel_reporte_pdf
+from nexus.odoo_catalogo import catalogo_estrategia, version_store
+from nexus.ranking import top_n
+from nexus.tabs import tab_activa, tabs_perezosas
 
 # ==============================================================================
 # --- 1. CONFIGURACIÓN DE PÁGINA ---
@@ -109,144 +129,122 @@ st.markdown("""
 # ==============================================================================
 # --- 3. GENERADOR DE DATOS AVANZADO ---
 # ==============================================================================
+N_SKUS = int(os.environ.get("NEXUS_N_SKUS", 150))
+ODOO_STORE = os.environ.get("NEXUS_ODOO_STORE")  # Almacén Parquet de `python -m nexus.odoo`
+HISTORIA = os.environ.get("NEXUS_HISTORIA")  # Snapshots diarios particionados (nexus.historia)
+OFERTAS = os.environ.get("NEXUS_OFERTAS")  # Listas de precios importadas (nexus.listas_precios)
+
 @st.cache_data
-def generar_data_avanzada():
-    np.random.seed(42)
-    categorias = {
-        'Herramientas': ['Taladros', 'Pulidoras', 'Sierras', 'Kits Manuales'],
-        'Construcción': ['Cementos', 'Aditivos', 'Impermeabilizantes', 'Estucos'],
-        'Acabados': ['Pintura Tipo 1', 'Esmaltes', 'Brochas', 'Rodillos'],
-        'Eléctricos': ['Cableado', 'Tomas', 'Iluminación LED', 'Tableros'],
-        'Plomería': ['Tubos PVC', 'Grifería', 'Accesorios', 'Pegamentos']
-    }
-    
-    proveedores_list = ['DistriGlobal', 'FerreAbastos', 'MegaTools', 'Importados SA']
-    
-    data = []
-    for cat, subcats in categorias.items():
-        for _ in range(30): 
-            subcat = np.random.choice(subcats)
-            sku = f"{cat[:3].upper()}-{np.random.randint(1000,9999)}"
-            costo = np.random.uniform(5000, 250000)
-            margen = np.random.uniform(0.15, 0.55) # Margen bruto
-            precio = costo * (1 + margen)
-            
-            demanda = np.random.poisson(25)
-            stock = int(demanda * np.random.uniform(0, 5))
-            
-            # Datos Proveedor Base
-            prov = np.random.choice(proveedores_list)
-            
-            # Simulación de métricas proveedor para evaluación
-            if prov == 'DistriGlobal':
-                lead_time = np.random.randint(2, 5)
-                fill_rate = np.random.uniform(0.95, 1.0)
-                post_venta = np.random.uniform(8, 10)
-            elif prov == 'MegaTools':
-                lead_time = np.random.randint(10, 25)
-                fill_rate = np.random.uniform(0.70, 0.90)
-                post_venta = np.random.uniform(4, 7)
-            else:
-                lead_time = np.random.randint(5, 15)
-                fill_rate = np.random.uniform(0.85, 0.98)
-                post_venta = np.random.uniform(6, 9)
+def generar_data_avanzada(n_skus=N_SKUS, ruta_odoo=ODOO_STORE, version_odoo=None):
+    """
+    Catálogo desde el almacén Odoo si NEXUS_ODOO_STORE está definido; si no, simulado
+    (NEXUS_N_SKUS permite cargarlo a escala, 200k-1M SKUs).
+    `version_odoo` (marca de la última sincronización) invalida la caché tras cada sync.
+    """
+    if ruta_odoo:
+        crudo = catalogo_estrategia(StoreParquet(ruta_odoo))
+    elif n_skus > 100_000:
+        crudo = generar_catalogo_particionado(n_skus, n_particiones=os.cpu_count() or 4, seed=42)
+    else:
+        crudo = generar_catalogo(n_skus, CATEGORIAS, PERFILES_PROVEEDOR, np.random.default_rng(42))
+    # Forma compacta (categorías codificadas y tipos reducidos) + reporte de bytes por SKU
+    compacto = compactar_catalogo(crudo)
+    # Cubo Categoria x Proveedor x Estado: los KPIs se responden sumando celdas
+    return compacto, reporte_memoria(crudo, compacto), construir_cubo(compacto)
 
-            # Cálculo de meses de cobertura y días de inventario
-            # Días de cobertura = (Stock / Demanda Mensual) * 30 días
-            dias_cobertura = (stock / demanda) * 30 if demanda > 0 else 999 
-            
-            if stock == 0: estado = "🔴 Quiebre"
-            elif dias_cobertura < 25: estado = "🟠 Riesgo" # Menos de un mes de stock
-            elif dias_cobertura > 120: estado = "🔵 Excedente" # Más de 4 meses de stock
-            else: estado = "🟢 Óptimo"
-            
-            utilidad_mensual = (precio - costo) * demanda
-
-            data.append({
-                'SKU': sku,
-                'Producto': f"{subcat} Pro {np.random.randint(100,999)}",
-                'Categoria': cat,
-                'Subcategoria': subcat,
-                'Proveedor': prov,
-                'Costo': costo,
-                'Precio': precio,
-                'Margen_Pct': margen,
-                'Utilidad_Mensual': utilidad_mensual,
-                'Stock': stock,
-                'Demanda_Mes': demanda,
-                'Valor_Inventario': stock * costo,
-                'Dias_Inventario': dias_cobertura, # Nuevo KPI
-                'Lead_Time_Real': lead_time,
-                'Fill_Rate': fill_rate, 
-                'Post_Venta': post_venta,
-                'Estado': estado
-            })
-            
-    return pd.DataFrame(data)
+version_odoo = version_store(ODOO_STORE) if ODOO_STORE else None
+df_base, reporte_mem, cubo_base = generar_data_avanzada(version_odoo=version_odoo)
 
-df_base = generar_data_avanzada()
-df = df_base.copy() # Usamos una copia para los filtros
+@st.cache_resource(show_spinner=False)
+def registrar_snapshot_diario(ruta, fecha, _df):
+    """Escribe el snapshot del día una sola vez por proceso (y solo si la partición no existe)."""
+    store = StoreHistoria(ruta, 'estrategia')
+    if not store.tiene(fecha):
+        store.guardar(fecha, snapshot_estrategia(_df))
+    return store
 
 
 # --- FUNCIÓN LÓGICA DE RECOMENDACIÓN DE PROVEEDOR ---
-def recomendar_mejor_proveedor(row):
+@st.cache_resource(show_spinner=False)
+def indice_ofertas(ruta, version):
+    """Ofertas importadas indexadas por SKU; `version` (última importación) la recarga."""
+    tabla = StoreOfertas(ruta).tabla()
+    return indexar_ofertas(tabla) if len(tabla) else None
+
+def matriz_licitacion(df_skus):
+    """Ofertas de las listas de precios importadas (NEXUS_OFERTAS); sin listas, las de referencia."""
+    indice = indice_ofertas(OFERTAS, version_ofertas(OFERTAS)) if OFERTAS else None
+    if indice is None:
+        return matriz_ofertas_fija(len(df_skus), OFERTAS_BASE)
+    return matriz_ofertas(indice, df_skus['SKU'], df_skus['Costo'])
+
+def recomendar_mejor_proveedor(df_skus, pesos=PESOS_BASE):
     """
-    Simula una licitación rápida entre los 4 proveedores para este producto.
+    Licitación entre los proveedores para todos los SKUs a la vez.
     Criterios de Ponderación: 80% Precio, 10% Tiempo, 5% Fill Rate, 5% Postventa.
-    Devuelve el nombre del proveedor ganador.
+    Devuelve ganador, segunda opción, margen de puntaje y factor de precio del ganador por SKU.
     """
-    proveedores_sim = ['DistriGlobal', 'FerreAbastos', 'MegaTools', 'Importados SA']
-    scores = {}
-    
-    # Costo base del producto (para simular ofertas)
-    costo_base = row['Costo']
-    
-    for p in proveedores_sim:
-        # Simulamos variaciones de oferta por proveedor (Fijos para simplificar la consistencia)
-        if p == 'DistriGlobal':
-            factor_precio = 1.05 # Más caro (mejor calidad/servicio)
-            tiempo = 3
-            fill = 0.98
-            post = 9.0
-        elif p == 'MegaTools':
-            factor_precio = 0.90 # Muy barato (peor calidad/servicio)
-            tiempo = 20
-            fill = 0.80
-            post = 5.0
-        elif p == 'Importados SA':
-            factor_precio = 0.95 
-            tiempo = 10 
-            fill = 0.90
-            post = 7.0
-        else: # FerreAbastos (Promedio)
-            factor_precio = 1.00
-            tiempo = 7
-            fill = 0.92
-            post = 8.0
-            
-        precio_oferta = costo_base * factor_precio
-        
-        # Normalización (Simplificada para score 0-100)
-        # Precio: Menor es mejor. Usamos inverso (un precio más bajo da un score más alto)
-        score_precio = (costo_base / precio_oferta) * 100 
-        
-        # Tiempo: Menor es mejor. (Tiempo alto penaliza)
-        score_tiempo = max(0, 100 - (tiempo * 3)) # Pasa de 0 a 100, 3 días = 91, 20 días = 40
-        
-        # Fill Rate: Directo
-        score_fill = fill * 100
-        
-        # Post Venta: Directo (es sobre 10, escalamos a 100)
-        score_post = post * 10
-        
-        # PONDERACIÓN DEL CLIENTE
-        # 80% Precio, 10% Tiempo, 5% Fill Rate, 5% Postventa
-        final_score = (score_precio * 0.80) + (score_tiempo * 0.10) + (score_fill * 0.05) + (score_post * 0.05)
-        scores[p] = final_score
-
-    # Retorna el proveedor con max score
-    mejor_proveedor = max(scores, key=scores.get)
-    return mejor_proveedor
+    matriz = matriz_licitacion(df_skus)
+    resultado = licitar(matriz, pesos, index=df_skus.index)
+    ganador = pd.Index(matriz['proveedores']).get_indexer(resultado['Mejor_Opcion_IA'])
+    factor = matriz['factor_precio'][np.arange(len(df_skus)), np.maximum(ganador, 0)]
+    resultado['Factor_Ganador'] = np.where(ganador >= 0, factor, np.nan)
+    return resultado
+
+def robustez_recomendacion(df_skus):
+    """% de la malla de pesos (paso 5%) en la que el ganador con los pesos base sigue ganando."""
+    barrido = barrido_pesos(matriz_licitacion(df_skus), index=df_skus.index)
+    columna = barrido.columns.get_indexer(df_skus['Mejor_Opcion_IA'])
+    return pd.Series(np.where(columna >= 0, 100 * barrido.to_numpy()[np.arange(len(df_skus)), columna], np.nan), index=df_skus.index)
+
+# --- VISTA FILTRADA (SE GUARDA EN LA CACHE LRU DE LA SESIÓN) ---
+MAX_FILAS_QUIEBRES = 500 # Filas visibles del listado de quiebres
+
+def construir_vista(filtro_cat, filtro_prov):
+    """Sub-cubo, KPIs y listados del Centro de Acción para una selección de filtros."""
+    cubo = seleccionar_cubo(cubo_base, filtro_cat, filtro_prov)
+    # Filas solo para los listados del Centro de Acción (filtro sobre códigos)
+    quiebres_df = filtrar_catalogo(df_base[df_base['Estado'] == "🔴 Quiebre"], filtro_cat, filtro_prov)
+    excedentes_df = filtrar_catalogo(df_base[df_base['Estado'] == "🔵 Excedente"], filtro_cat, filtro_prov)
+    # Licitación para todos los quiebres; se listan los de mayor POTENCIAL DE UTILIDAD PERDIDA
+    quiebres_df = quiebres_df.join(recomendar_mejor_proveedor(quiebres_df))
+    quiebres_rank = top_n(quiebres_df, 'Utilidad_Mensual', MAX_FILAS_QUIEBRES)
+    quiebres_rank = quiebres_rank.assign(Robustez=robustez_recomendacion(quiebres_rank) if not quiebres_rank.empty else np.nan)
+    return {'cubo': cubo, 'kpis': kpis_cubo(cubo), 'quiebres_rank': quiebres_rank, 'excedentes_df': excedentes_df}
+
+def candidatos_reposicion(filtro_cat, filtro_prov):
+    """
+    Todo SKU con demanda mensual mayor al stock es candidato: se compra hasta cubrir el mes,
+    al proveedor ganador de la licitación y a su precio. Cada unidad recupera su margen.
+    """
+    df = filtrar_catalogo(df_base[df_base['Demanda_Mes'] > df_base['Stock']], filtro_cat, filtro_prov)
+    df = df[['SKU', 'Producto', 'Categoria', 'Costo', 'Precio', 'Stock', 'Demanda_Mes']].join(recomendar_mejor_proveedor(df)[['Mejor_Opcion_IA', 'Factor_Ganador']])
+    df = df[df['Mejor_Opcion_IA'].notna()]  # Sin oferta de ningún proveedor no hay compra
+    df['Costo_Compra'] = df['Costo'] * df['Factor_Ganador']
+    df['Valor_Unidad'] = df['Precio'] - df['Costo_Compra']
+    df['Cantidad_Max'] = (df['Demanda_Mes'] - df['Stock']).astype(np.int64)
+    return df
+
+def plan_reposicion(filtro_cat, filtro_prov, presupuesto, minimo):
+    """Plan óptimo para un presupuesto + curva de utilidad recuperada por cada millón adicional."""
+    df = candidatos_reposicion(filtro_cat, filtro_prov)
+    args = (df['Costo_Compra'].to_numpy(), df['Valor_Unidad'].to_numpy(), df['Cantidad_Max'].to_numpy(), df['Mejor_Opcion_IA'].to_numpy())
+    minimos = {p: minimo for p in df['Mejor_Opcion_IA'].unique()}
+    plan = optimizar_compras(*args, presupuesto, minimos)
+    df['Cantidad'] = plan['cantidad']
+    presupuestos = np.linspace(0, 2 * max(presupuesto, PASO_PRESUPUESTO), 9)
+    plan['curva'] = curva_presupuesto(*args, presupuestos, minimos)
+    plan['lineas'] = df[df['Cantidad'] > 0].assign(Total_Linea=lambda d: d['Cantidad'] * d['Costo_Compra'], Utilidad_Recuperada=lambda d: d['Cantidad'] * d['Valor_Unidad'])
+    plan['marginal'] = optimizar_compras(*args, presupuesto + PASO_PRESUPUESTO, minimos)['valor'] - plan['valor']
+    return plan
+
+# Una sincronización de Odoo (otro catálogo) o una importación de listas de precios (otra
+# licitación) invalidan las vistas guardadas
+version_licitacion = version_ofertas(OFERTAS) if OFERTAS else None
+version_vistas = (version_odoo, version_licitacion)
+if 'cache_vistas' not in st.session_state or st.session_state.get('version_vistas') != version_vistas:
+    st.session_state.cache_vistas = CacheVistas(max_entradas=32, max_bytes=256 * 1024 ** 2)
+    st.session_state.version_vistas = version_vistas
 
 # ==============================================================================
 # --- 4. SIDEBAR Y FILTROS ---
@@ -257,20 +255,51 @@ with st.sidebar:
     st.divider()
     
     st.header("🎛️ Filtros Globales")
-    filtro_cat = st.multiselect("Categoría", df_base['Categoria'].unique(), default=df_base['Categoria'].unique())
-    filtro_prov = st.multiselect("Proveedor", df_base['Proveedor'].unique())
+    filtro_cat = st.multiselect("Categoría", df_base['Categoria'].cat.categories, default=df_base['Categoria'].cat.categories)
+    filtro_prov = st.multiselect("Proveedor", df_base['Proveedor'].cat.categories)
     
-    # Aplicar filtros
-    df = df_base.copy()
-    if filtro_cat:
-        df = df[df['Categoria'].isin(filtro_cat)]
-    if filtro_prov:
-        df = df[df['Proveedor'].isin(filtro_prov)]
+    # Aplicar filtros: la vista de cada combinación se construye una vez y se reutiliza
+    clave_vista = clave_filtros(filtro_cat, filtro_prov, cubo_base['ejes']['Categoria'], cubo_base['ejes']['Proveedor'])
+    vista = st.session_state.cache_vistas.obtener(clave_vista, lambda: construir_vista(*clave_vista))
+    cubo, kpis_sel = vista['cubo'], vista['kpis']
         
     st.caption("Los filtros afectan todas las pestañas y KPIs.")
-    if df.empty:
+    if kpis_sel['n_skus'] == 0:
         st.error("⚠️ La combinación de filtros no arrojó resultados.")
         st.stop() # Detiene la ejecución si no hay datos
+    
+    with st.expander("💾 Memoria del catálogo"):
+        total_mem = reporte_mem.loc['TOTAL']
+        st.caption(f"{total_mem['Antes']:.0f} → {total_mem['Despues']:.0f} bytes por SKU (-{total_mem['Reduccion_Pct']:.0f}%)")
+        st.dataframe(reporte_mem, use_container_width=True)
+        stats_cache = st.session_state.cache_vistas.estadisticas()
+        st.caption(f"Cache de vistas: {stats_cache['entradas']} vistas · {stats_cache['bytes']/1e6:,.1f} MB · {stats_cache['hits']} hits / {stats_cache['misses']} misses")
+
+    if OFERTAS:
+        with st.expander("📥 Listas de precios"):
+            store_ofertas = StoreOfertas(OFERTAS)
+            archivo_lista = st.file_uploader("Lista de precios (Excel)", type=["xlsx"], key="lista_precios")
+            prov_lista = st.selectbox("Proveedor de la lista", sorted(set(OFERTAS_BASE) | set(store_ofertas.proveedores())), key="proveedor_lista")
+            if archivo_lista is not None and st.button("Importar lista", key="importar_lista"):
+                with st.spinner("Importando lista de precios..."):
+                    try:
+                        st.session_state.resultado_importacion = (prov_lista, store_ofertas.importar(archivo_lista, prov_lista))
+                    except ValueError as e:
+                        st.session_state.resultado_importacion = (prov_lista, {'error': str(e)})
+                st.rerun()  # La licitación y las vistas se recalculan con las nuevas ofertas
+            if 'resultado_importacion' in st.session_state:
+                prov_imp, resumen_imp = st.session_state.resultado_importacion
+                if 'error' in resumen_imp:
+                    st.error(f"{prov_imp}: {resumen_imp['error']}")
+                elif resumen_imp.get('omitido'):
+                    st.info(f"{prov_imp}: la lista es idéntica a la última importada.")
+                else:
+                    st.success(f"{prov_imp}: {resumen_imp['nuevas']:,} nuevas · {resumen_imp['cambiadas']:,} cambiadas · {resumen_imp['retiradas']:,} retiradas · {resumen_imp['sin_cambio']:,} sin cambio")
+            registro_listas = store_ofertas.registro()
+            if registro_listas:
+                st.dataframe(pd.DataFrame(registro_listas).T[['filas', 'importado']], use_container_width=True)
+            else:
+                st.caption("Sin listas importadas: la licitación usa las ofertas de referencia.")
 
 # ==============================================================================
 # --- 5. CABECERA ---
@@ -287,11 +316,11 @@ st.write("")
 # ==============================================================================
 # --- 6. INSIGHTS & KPIs ---
 # ==============================================================================
-total_inv = df['Valor_Inventario'].sum()
-total_utilidad = df['Utilidad_Mensual'].sum()
-dias_inv_avg = df[df['Demanda_Mes'] > 0]['Dias_Inventario'].mean() # Solo para productos con demanda
-quiebres_df = df[df['Estado'] == "🔴 Quiebre"].copy()
-excedentes_df = df[df['Estado'] == "🔵 Excedente"].copy()
+total_inv = kpis_sel['total_inv']
+total_utilidad = kpis_sel['total_utilidad']
+dias_inv_avg = kpis_sel['dias_inv_avg'] # Solo para productos con demanda
+quiebres_rank = vista['quiebres_rank']
+excedentes_df = vista['excedentes_df']
 # KPI de Rotación de Inventario (Días)
 if dias_inv_avg < 30: # Rotación alta / stock bajo
     rotacion_text = "Rápida"
@@ -304,15 +333,15 @@ else:
     rotacion_type = "d-neu"
 
 # KPI de Quiebres (para el insight)
-quiebres_utilidad_perdida = quiebres_df['Utilidad_Mensual'].sum() # Utilidad que se deja de ganar al estar en quiebre
+quiebres_utilidad_perdida = kpis_sel['utilidad_quiebres'] # Utilidad que se deja de ganar al estar en quiebre
 
 st.markdown(f"""
 <div class="ai-box">
     <div class="ai-title">🤖 Diagnóstico Nexus AI</div>
     <p style="margin: 0; color: #334155; line-height: 1.6;">
-        El análisis de <strong>{len(df):,} referencias</strong> indica una rotación promedio de <strong>{dias_inv_avg:.0f} días</strong>.
-        <br>• <strong>Foco Prioritario (Quiebres):</strong> Urge reabastecer los <strong>{len(quiebres_df)} productos agotados</strong>, que representan una potencial pérdida de <strong>${quiebres_utilidad_perdida/1e6:,.1f}M</strong> en utilidad mensual.
-        <br>• <strong>Eficiencia de Capital (Excedentes):</strong> Hay <strong>${excedentes_df['Valor_Inventario'].sum()/1e6:,.1f}M</strong> en inventario lento.
+        El análisis de <strong>{kpis_sel['n_skus']:,} referencias</strong> indica una rotación promedio de <strong>{dias_inv_avg:.0f} días</strong>.
+        <br>• <strong>Foco Prioritario (Quiebres):</strong> Urge reabastecer los <strong>{kpis_sel['n_quiebres']} productos agotados</strong>, que representan una potencial pérdida de <strong>${quiebres_utilidad_perdida/1e6:,.1f}M</strong> en utilidad mensual.
+        <br>• <strong>Eficiencia de Capital (Excedentes):</strong> Hay <strong>${kpis_sel['valor_excedentes']/1e6:,.1f}M</strong> en inventario lento.
     </p>
 </div>
 """, unsafe_allow_html=True)
@@ -330,99 +359,220 @@ def kpi(col, label, value, badge_text, badge_type):
 
 kpi(k1, "Valor Inventario Total", f"${total_inv/1e6:,.1f} M", "+3.2% vs Obj", "d-neu")
 kpi(k2, "Días Inventario en Existencia", f"{dias_inv_avg:.0f} Días", rotacion_text, rotacion_type)
-kpi(k3, "Capital Inmovilizado (Excedentes)", f"${excedentes_df['Valor_Inventario'].sum()/1e6:,.1f} M", "Optimizable", "d-neu")
+kpi(k3, "Capital Inmovilizado (Excedentes)", f"${kpis_sel['valor_excedentes']/1e6:,.1f} M", "Optimizable", "d-neu")
 kpi(k4, "Utilidad Mensual Proyectada", f"${total_utilidad/1e6:,.1f} M", "Mensual", "d-pos")
 
 # ==============================================================================
 # --- 7. ANÁLISIS DETALLADO (TABS) ---
 # ==============================================================================
+# Constructores de figuras: reciben el agregado y devuelven la figura completa.
+# figura_cacheada() los reutiliza entre reruns mientras el agregado no cambie.
+def fig_motores_rentabilidad(df_cat):
+    fig = px.bar(df_cat.sort_values('Utilidad_Mensual', ascending=True), x='Utilidad_Mensual', y='Categoria', orientation='h', text_auto='.2s', color='Utilidad_Mensual', color_continuous_scale=['#CCFBF1', '#2DD4BF', '#0F766E'])
+    fig.update_layout(plot_bgcolor='rgba(0,0,0,0)', xaxis_title="Utilidad Mensual ($)", yaxis_title=None, coloraxis_showscale=False, height=350)
+    return fig
+
+def fig_frenos_capital(df_cat):
+    fig = px.scatter(df_cat, x='Valor_Inventario', y='Margen_Pct', size='Valor_Inventario', color='Categoria', text='Categoria', color_discrete_sequence=px.colors.qualitative.Pastel)
+    fig.update_layout(plot_bgcolor='rgba(0,0,0,0)', xaxis_title="Dinero Atrapado ($)", yaxis_title="Margen (%)", height=350, showlegend=False)
+    fig.update_traces(textposition='top center')
+    return fig
+
+def fig_estado_proveedor(df_stack):
+    fig = px.bar(df_stack, x='Proveedor', y='Conteo', color='Estado', color_discrete_map={'🟢 Óptimo': '#34D399', '🔴 Quiebre': '#F87171', '🔵 Excedente': '#60A5FA', '🟠 Riesgo': '#FBBF24'})
+    fig.update_layout(height=200, margin=dict(t=10, l=0, r=0, b=0), showlegend=False, plot_bgcolor='rgba(0,0,0,0)')
+    return fig
+
+def fig_rotacion_gauge(dias_inv_avg):
+    fig = go.Figure(go.Indicator(
+        mode = "gauge+number", 
+        value = dias_inv_avg, 
+        number = {'suffix': " Días", 'font': {'size': 50, 'color': '#0F172A'}}, 
+        domain = {'x': [0, 1], 'y': [0, 1]}, 
+        title = {'text': "Rotación Promedio (Días)", 'font': {'size': 18, 'color': '#64748B'}}, 
+        gauge = {
+            'axis': {'range': [0, 180], 'tickwidth': 0, 'tickcolor': "white"}, 
+            'bar': {'color': "#10B981"}, 
+            'bgcolor': "white", 
+            'borderwidth': 0, 
+            'bordercolor': "gray", 
+            'steps': [
+                {'range': [0, 25], 'color': "#FEF2F2"}, # Rotación muy rápida/stock bajo
+                {'range': [25, 90], 'color': "#DCFCE7"}, # Óptimo
+                {'range': [90, 180], 'color': "#F0F9FF"} # Lento/Excedente
+            ], 
+            'threshold': {'line': {'color': "#FBBF24", 'width': 4}, 'thickness': 0.75, 'value': 90}}
+    ))
+    fig.update_layout(height=300, margin=dict(t=50, b=10, l=30, r=30), paper_bgcolor='rgba(0,0,0,0)', font={'family': "Inter, sans-serif"})
+    return fig
+
+def fig_tendencia(kpis_hist, columna, titulo_y):
+    fig = px.line(kpis_hist, x='Fecha', y=columna, color='Grupo', color_discrete_sequence=px.colors.qualitative.Pastel)
+    fig.update_layout(height=280, margin=dict(t=10, l=0, r=0, b=0), plot_bgcolor='rgba(0,0,0,0)', xaxis_title=None, yaxis_title=titulo_y, legend_title=None)
+    return fig
+
+def fig_rotacion_categoria(rotacion_cat):
+    fig = px.pie(rotacion_cat, values='Dias_Inventario', names='Categoria', color_discrete_sequence=px.colors.qualitative.Pastel)
+    fig.update_traces(textinfo='label+percent', hole=.3)
+    fig.update_layout(height=300, margin=dict(t=0, b=0, l=0, r=0), showlegend=False)
+    return fig
+
+# Agregados por categoría (los usan las pestañas y el reporte PDF)
+def agregado_categorias(cubo):
+    df_cat = agregar_cubo(cubo, 'Categoria')
+    df_cat['Margen_Pct'] = df_cat['Margen_Pct'] / df_cat['Conteo']
+    return df_cat
+
+def agregado_rotacion(cubo):
+    rotacion_cat = agregar_cubo(cubo, 'Categoria').rename(columns={'Stock': 'Total_Stock', 'Demanda_Mes': 'Total_Demanda'})
+    rotacion_cat = rotacion_cat[['Categoria', 'Total_Stock', 'Total_Demanda']]
+    # Calcular Días de Inventario de Cobertura
+    demanda_cat = rotacion_cat['Total_Demanda'].where(rotacion_cat['Total_Demanda'] > 0)
+    rotacion_cat['Dias_Inventario'] = (rotacion_cat['Total_Stock'] / demanda_cat * 30).fillna(999)
+    return rotacion_cat
+
 st.markdown("---")
 st.markdown("### 📊 Tablero de Decisiones")
 
-tab1, tab2, tab3 = st.tabs(["💰 Rentabilidad & Esfuerzo", "🚛 Diagnóstico Proveedor", "🎯 Rotación de Inventario"])
+# Pestañas perezosas: cada pestaña calcula sus agregados y figuras solo cuando está visible
+tab1, tab2, tab3, tab4 = tabs_perezosas(["💰 Rentabilidad & Esfuerzo", "🚛 Diagnóstico Proveedor", "🎯 Rotación de Inventario", "📈 Tendencias"], key="tabs_estrategia")
 
 with tab1:
-    st.markdown("""<p class="section-desc"><b>¿Dónde enfocamos esfuerzos?</b> Identifica qué categorías impulsan tu ganancia ("Motores") y cuáles consumen capital sin rotar ("Frenos").</p>""", unsafe_allow_html=True)
-    col_rent1, col_rent2 = st.columns(2)
-    df_cat = df.groupby('Categoria').agg({'Utilidad_Mensual': 'sum', 'Valor_Inventario': 'sum', 'Margen_Pct': 'mean'}).reset_index()
+    if tab_activa(tab1):
+        st.markdown("""<p class="section-desc"><b>¿Dónde enfocamos esfuerzos?</b> Identifica qué categorías impulsan tu ganancia ("Motores") y cuáles consumen capital sin rotar ("Frenos").</p>""", unsafe_allow_html=True)
+        col_rent1, col_rent2 = st.columns(2)
+        df_cat = agregado_categorias(cubo)
     
-    with col_rent1:
-        st.markdown("##### 🚀 Motores de Rentabilidad (Utilidad Total)")
-        fig_bar = px.bar(df_cat.sort_values('Utilidad_Mensual', ascending=True), x='Utilidad_Mensual', y='Categoria', orientation='h', text_auto='.2s', color='Utilidad_Mensual', color_continuous_scale=['#CCFBF1', '#2DD4BF', '#0F766E'])
-        fig_bar.update_layout(plot_bgcolor='rgba(0,0,0,0)', xaxis_title="Utilidad Mensual ($)", yaxis_title=None, coloraxis_showscale=False, height=350)
-        st.plotly_chart(fig_bar, use_container_width=True)
-
-    with col_rent2:
-        st.markdown("##### ⚓ Frenos de Capital (Inventario vs Margen)")
-        fig_scat = px.scatter(df_cat, x='Valor_Inventario', y='Margen_Pct', size='Valor_Inventario', color='Categoria', text='Categoria', color_discrete_sequence=px.colors.qualitative.Pastel)
-        fig_scat.update_layout(plot_bgcolor='rgba(0,0,0,0)', xaxis_title="Dinero Atrapado ($)", yaxis_title="Margen (%)", height=350, showlegend=False)
-        fig_scat.update_traces(textposition='top center')
-        st.plotly_chart(fig_scat, use_container_width=True)
+        with col_rent1:
+            st.markdown("##### 🚀 Motores de Rentabilidad (Utilidad Total)")
+            fig_bar = figura_cacheada(fig_motores_rentabilidad, df_cat)
+            st.plotly_chart(fig_bar, use_container_width=True)
+
+        with col_rent2:
+            st.markdown("##### ⚓ Frenos de Capital (Inventario vs Margen)")
+            nivel_frenos = st.radio("Nivel", ["Categorías", "SKUs"], horizontal=True, key="nivel_frenos", label_visibility="collapsed")
+            if nivel_frenos == "Categorías":
+                fig_scat = figura_cacheada(fig_frenos_capital, df_cat)
+                st.plotly_chart(fig_scat, use_container_width=True)
+            else:
+                skus_df = filtrar_catalogo(df_base, filtro_cat, filtro_prov)
+                if len(skus_df) <= UMBRAL_PUNTOS:
+                    # Pocos SKUs: un punto WebGL por SKU
+                    fig_scat = figura_cacheada(figura_puntos, skus_df[['SKU', 'Categoria', 'Valor_Inventario', 'Margen_Pct']])
+                    st.plotly_chart(fig_scat, use_container_width=True)
+                else:
+                    # Catálogo grande: densidad agregada en el servidor (rejilla fija) + detalle por celda
+                    densidad, codigo_bin = st.session_state.cache_vistas.obtener(
+                        ('densidad_frenos',) + clave_vista,
+                        lambda: binear_dispersion(skus_df['Valor_Inventario'], skus_df['Margen_Pct'])
+                    )
+                    fig_scat = figura_cacheada(figura_densidad, densidad)
+                    evento = st.plotly_chart(fig_scat, use_container_width=True, on_select="rerun", selection_mode="points", key="densidad_frenos")
+                    puntos = evento["selection"]["points"] if evento else []
+                    bins_sel = densidad['Bin'].to_numpy()[[p['point_index'] for p in puntos]]
+                    if len(bins_sel):
+                        en_celda = skus_df[np.isin(codigo_bin, bins_sel)]
+                        st.caption(f"{len(en_celda):,} SKUs en la selección · mayores capitales inmovilizados:")
+                        st.dataframe(
+                            top_n(en_celda, 'Valor_Inventario', 200)[['SKU', 'Producto', 'Categoria', 'Proveedor', 'Valor_Inventario', 'Margen_Pct']],
+                            column_config={"Valor_Inventario": st.column_config.NumberColumn("Capital", format="$%d"), "Margen_Pct": st.column_config.NumberColumn("Margen", format="%.2f")},
+                            hide_index=True, use_container_width=True, height=250
+                        )
+                    else:
+                        st.caption(f"{len(skus_df):,} SKUs agregados en celdas. Haz clic en una celda para ver sus SKUs.")
 
 with tab2:
-    st.markdown("""<p class="section-desc"><b>Auditoría de Cumplimiento.</b> Evaluamos a los socios logísticos por confiabilidad (tiempos) y completitud (Fill Rate).</p>""", unsafe_allow_html=True)
-    prov_score = df.groupby('Proveedor').agg({'Lead_Time_Real': 'mean', 'Fill_Rate': 'mean', 'Valor_Inventario': 'sum'}).reset_index()
-    prov_score['Check_Tiempo'] = prov_score['Lead_Time_Real'].apply(lambda x: "✅ Rápido" if x < 8 else ("⚠️ Lento" if x < 15 else "❌ Crítico"))
-    prov_score['Check_Entregas'] = prov_score['Fill_Rate'].apply(lambda x: "✅ Completo" if x > 0.95 else ("⚠️ Parcial" if x > 0.85 else "❌ Incompleto"))
+    if tab_activa(tab2):
+        st.markdown("""<p class="section-desc"><b>Auditoría de Cumplimiento.</b> Evaluamos a los socios logísticos por confiabilidad (tiempos) y completitud (Fill Rate).</p>""", unsafe_allow_html=True)
+        prov_score = agregar_cubo(cubo, 'Proveedor')
+        prov_score['Lead_Time_Real'] = prov_score['Lead_Time_Real'] / prov_score['Conteo']
+        prov_score['Fill_Rate'] = prov_score['Fill_Rate'] / prov_score['Conteo']
+        prov_score = prov_score[['Proveedor', 'Lead_Time_Real', 'Fill_Rate', 'Valor_Inventario']]
+        prov_score['Check_Tiempo'] = prov_score['Lead_Time_Real'].apply(lambda x: "✅ Rápido" if x < 8 else ("⚠️ Lento" if x < 15 else "❌ Crítico"))
+        prov_score['Check_Entregas'] = prov_score['Fill_Rate'].apply(lambda x: "✅ Completo" if x > 0.95 else ("⚠️ Parcial" if x > 0.85 else "❌ Incompleto"))
     
-    col_audit1, col_audit2 = st.columns([2, 1])
-    with col_audit1:
-        st.markdown("##### 📋 Scorecard de Cumplimiento")
-        st.dataframe(prov_score, column_config={"Proveedor": "Socio Logístico", "Lead_Time_Real": st.column_config.NumberColumn("Días Promedio", format="%.1f d"), "Fill_Rate": st.column_config.ProgressColumn("Tasa Entrega (%)", min_value=0, max_value=1, format="%.0f%%"), "Check_Tiempo": "Auditoría Tiempo", "Check_Entregas": "Auditoría Calidad", "Valor_Inventario": st.column_config.NumberColumn("Volumen Compra", format="$%d")}, hide_index=True, use_container_width=True)
-    with col_audit2:
-        st.info("💡 **Criterios de Evaluación:**")
-        st.markdown("- **✅ Rápido:** < 8 días\n- **❌ Crítico:** > 15 días\n- **✅ Completo:** > 95%\n- **❌ Incompleto:** < 85%")
-        df_stack = df.groupby(['Proveedor', 'Estado']).size().reset_index(name='Conteo')
-        fig_stack = px.bar(df_stack, x='Proveedor', y='Conteo', color='Estado', color_discrete_map={'🟢 Óptimo': '#34D399', '🔴 Quiebre': '#F87171', '🔵 Excedente': '#60A5FA', '🟠 Riesgo': '#FBBF24'})
-        fig_stack.update_layout(height=200, margin=dict(t=10, l=0, r=0, b=0), showlegend=False, plot_bgcolor='rgba(0,0,0,0)')
-        st.plotly_chart(fig_stack, use_container_width=True)
+        col_audit1, col_audit2 = st.columns([2, 1])
+        with col_audit1:
+            st.markdown("##### 📋 Scorecard de Cumplimiento")
+            st.dataframe(prov_score, column_config={"Proveedor": "Socio Logístico", "Lead_Time_Real": st.column_config.NumberColumn("Días Promedio", format="%.1f d"), "Fill_Rate": st.column_config.ProgressColumn("Tasa Entrega (%)", min_value=0, max_value=1, format="%.0f%%"), "Check_Tiempo": "Auditoría Tiempo", "Check_Entregas": "Auditoría Calidad", "Valor_Inventario": st.column_config.NumberColumn("Volumen Compra", format="$%d")}, hide_index=True, use_container_width=True)
+        with col_audit2:
+            st.info("💡 **Criterios de Evaluación:**")
+            st.markdown("- **✅ Rápido:** < 8 días\n- **❌ Crítico:** > 15 días\n- **✅ Completo:** > 95%\n- **❌ Incompleto:** < 85%")
+            df_stack = agregar_cubo(cubo, ['Proveedor', 'Estado'])[['Proveedor', 'Estado', 'Conteo']]
+            fig_stack = figura_cacheada(fig_estado_proveedor, df_stack)
+            st.plotly_chart(fig_stack, use_container_width=True)
 
 with tab3:
-    st.markdown("""<p class="section-desc"><b>Eficiencia de Capital.</b> Días promedio que el inventario permanece antes de venderse (meta: 30-90 días).</p>""", unsafe_allow_html=True)
-    c_gauge, c_details = st.columns([1, 1])
+    if tab_activa(tab3):
+        st.markdown("""<p class="section-desc"><b>Eficiencia de Capital.</b> Días promedio que el inventario permanece antes de venderse (meta: 30-90 días).</p>""", unsafe_allow_html=True)
+        c_gauge, c_details = st.columns([1, 1])
     
-    # Calcular Rotación por Categoría
-    rotacion_cat = df.groupby('Categoria').agg(
-        Total_Stock=('Stock', 'sum'), 
-        Total_Demanda=('Demanda_Mes', 'sum')
-    ).reset_index()
-    # Calcular Días de Inventario de Cobertura
-    rotacion_cat['Dias_Inventario'] = rotacion_cat.apply(
-        lambda row: (row['Total_Stock'] / row['Total_Demanda']) * 30 if row['Total_Demanda'] > 0 else 999, axis=1
-    )
+        # Calcular Rotación por Categoría
+        rotacion_cat = agregado_rotacion(cubo)
     
-    with c_gauge:
-        fig_gauge = go.Figure(go.Indicator(
-            mode = "gauge+number", 
-            value = dias_inv_avg, 
-            number = {'suffix': " Días", 'font': {'size': 50, 'color': '#0F172A'}}, 
-            domain = {'x': [0, 1], 'y': [0, 1]}, 
-            title = {'text': "Rotación Promedio (Días)", 'font': {'size': 18, 'color': '#64748B'}}, 
-            gauge = {
-                'axis': {'range': [0, 180], 'tickwidth': 0, 'tickcolor': "white"}, 
-                'bar': {'color': "#10B981"}, 
-                'bgcolor': "white", 
-                'borderwidth': 0, 
-                'bordercolor': "gray", 
-                'steps': [
-                    {'range': [0, 25], 'color': "#FEF2F2"}, # Rotación muy rápida/stock bajo
-                    {'range': [25, 90], 'color': "#DCFCE7"}, # Óptimo
-                    {'range': [90, 180], 'color': "#F0F9FF"} # Lento/Excedente
-                ], 
-                'threshold': {'line': {'color': "#FBBF24", 'width': 4}, 'thickness': 0.75, 'value': 90}}
-        ))
-        fig_gauge.update_layout(height=300, margin=dict(t=50, b=10, l=30, r=30), paper_bgcolor='rgba(0,0,0,0)', font={'family': "Inter, sans-serif"})
-        st.plotly_chart(fig_gauge, use_container_width=True)
-    with c_details:
-        st.success(f"La rotación promedio es de **{dias_inv_avg:.0f} días**.")
-        st.markdown(f"Esto se traduce en que el capital está atado por **{dias_inv_avg:.0f} días** antes de generar flujo.\n\n**Acciones Clave de Rotación:**\n1.  Priorizar la venta de **Excedentes** (> 120 días).\n2.  Revisar **categorías lentas** en la gráfica inferior.\n3.  Ajustar frecuencia de pedidos a **30-60 días**.")
+        with c_gauge:
+            fig_gauge = figura_cacheada(fig_rotacion_gauge, float(dias_inv_avg))
+            st.plotly_chart(fig_gauge, use_container_width=True)
+        with c_details:
+            st.success(f"La rotación promedio es de **{dias_inv_avg:.0f} días**.")
+            st.markdown(f"Esto se traduce en que el capital está atado por **{dias_inv_avg:.0f} días** antes de generar flujo.\n\n**Acciones Clave de Rotación:**\n1.  Priorizar la venta de **Excedentes** (> 120 días).\n2.  Revisar **categorías lentas** en la gráfica inferior.\n3.  Ajustar frecuencia de pedidos a **30-60 días**.")
         
-        st.markdown("##### 🔄 Rotación por Categoría")
-        fig_pie = px.pie(rotacion_cat, values='Dias_Inventario', names='Categoria', color_discrete_sequence=px.colors.qualitative.Pastel)
-        fig_pie.update_traces(textinfo='label+percent', hole=.3)
-        fig_pie.update_layout(height=300, margin=dict(t=0, b=0, l=0, r=0), showlegend=False)
-        st.plotly_chart(fig_pie, use_container_width=True)
-
+            st.markdown("##### 🔄 Rotación por Categoría")
+            fig_pie = figura_cacheada(fig_rotacion_categoria, rotacion_cat)
+            st.plotly_chart(fig_pie, use_container_width=True)
+with tab4:
+    if tab_activa(tab4):
+        st.markdown("""<p class="section-desc"><b>Tendencias.</b> Ventanas móviles de 30 días sobre los snapshots diarios del inventario, por categoría.</p>""", unsafe_allow_html=True)
+        if not HISTORIA:
+            st.info("Define `NEXUS_HISTORIA` (carpeta de snapshots) para registrar la foto diaria del inventario y ver su evolución.")
+        else:
+            store_hist = registrar_snapshot_diario(HISTORIA, pd.Timestamp.now().strftime('%Y-%m-%d'), df_base)
+            periodo = st.radio("Periodo", ["90 días", "1 año", "2 años"], horizontal=True, key="periodo_tendencias")
+            desde = pd.Timestamp.now().normalize() - pd.Timedelta(days={"90 días": 90, "1 año": 365, "2 años": 730}[periodo])
+            # Solo la tabla diaria (fechas x categorías): los snapshots por SKU no se cargan
+            kpis_hist = store_hist.kpis(desde=desde, grupos=list(clave_vista[0]) or None)
+            if kpis_hist.empty:
+                st.info("Aún no hay historia para este periodo.")
+            else:
+                c_t1, c_t2 = st.columns(2)
+                with c_t1:
+                    st.markdown("##### 🔄 Rotación (días de cobertura, 30d)")
+                    st.plotly_chart(figura_cacheada(fig_tendencia, kpis_hist, columna='Rotacion_30', titulo_y="Días"), use_container_width=True)
+                    st.markdown("##### 💤 Capital en Excedente (promedio 30d)")
+                    st.plotly_chart(figura_cacheada(fig_tendencia, kpis_hist, columna='Valor_Excedente_30', titulo_y="$"), use_container_width=True)
+                with c_t2:
+                    st.markdown("##### 🚨 Días en Quiebre (SKU-días, 30d)")
+                    st.plotly_chart(figura_cacheada(fig_tendencia, kpis_hist, columna='Dias_Quiebre_30', titulo_y="SKU-días"), use_container_width=True)
+                    st.markdown("##### ⏱️ SKUs con más días en quiebre (90d)")
+                    st.dataframe(top_n(store_hist.dias_quiebre(), 'Dias_Quiebre_90', 10)[['Clave', 'Dias_Quiebre_30', 'Dias_Quiebre_90']], hide_index=True, use_container_width=True, column_config={"Clave": "SKU"})
+                if clave_vista[1]:
+                    st.caption("La historia se agrega por categoría: el filtro de proveedor no aplica en esta pestaña.")
+
+
+# --- REPORTE EJECUTIVO PDF (se construye en segundo plano; los PNG se cachean por figura) ---
+def preparar_reporte_estrategia():
+    kpis_pdf = [
+        ("Valor Inventario Total", f"${total_inv/1e6:,.1f} M"),
+        ("Días Inventario", f"{dias_inv_avg:.0f} Días"),
+        ("Capital Inmovilizado", f"${kpis_sel['valor_excedentes']/1e6:,.1f} M"),
+        ("Utilidad Mensual", f"${total_utilidad/1e6:,.1f} M"),
+        ("Referencias Analizadas", f"{kpis_sel['n_skus']:,}"),
+        ("Productos en Quiebre", f"{kpis_sel['n_quiebres']:,}"),
+        ("Utilidad en Riesgo", f"${quiebres_utilidad_perdida/1e6:,.1f} M"),
+        ("Productos en Excedente", f"{kpis_sel['n_excedentes']:,}"),
+    ]
+    df_cat = agregado_categorias(cubo)
+    figuras_pdf = [
+        ("Motores de Rentabilidad (Utilidad Total)", figura_cacheada(fig_motores_rentabilidad, df_cat)),
+        ("Frenos de Capital (Inventario vs Margen)", figura_cacheada(fig_frenos_capital, df_cat)),
+        ("Estado del Inventario por Proveedor", figura_cacheada(fig_estado_proveedor, agregar_cubo(cubo, ['Proveedor', 'Estado'])[['Proveedor', 'Estado', 'Conteo']])),
+        ("Rotación por Categoría", figura_cacheada(fig_rotacion_categoria, agregado_rotacion(cubo))),
+    ]
+    return reporte_ejecutivo, ("Control & Estrategia", kpis_pdf, figuras_pdf, renderizador())
+
+with st.expander("📄 Reporte Ejecutivo (PDF)"):
+    st.caption("KPIs y gráficos de la selección actual de filtros.")
+    panel_reporte_pdf("reporte_estrategia", preparar_reporte_estrategia, f"Reporte_Estrategia_{pd.Timestamp.now():%Y%m%d}.pdf")
 
 # ==============================================================================
 # --- 8. CENTRO DE ACCIÓN (LÓGICA ACTUALIZADA) ---
@@ -434,35 +584,78 @@ col_quiebres, col_excedentes = st.columns(2)
 
 # --- COLUMNA 1: GESTIÓN DE QUIEBRES (Con Recomendador IA) ---
 with col_quiebres:
-    st.markdown("""<div class="action-box-red"><h4 style="color: #991B1B; margin:0;">🚨 Prioridad URGENTE: Quiebres de Stock</h4><p style="color: #7F1D1D;">Selección de los 6 productos con mayor utilidad potencial perdida.</p></div>""", unsafe_allow_html=True)
+    st.markdown("""<div class="action-box-red"><h4 style="color: #991B1B; margin:0;">🚨 Prioridad URGENTE: Quiebres de Stock</h4><p style="color: #7F1D1D;">Productos agotados con mayor utilidad potencial perdida, con su proveedor sugerido.</p></div>""", unsafe_allow_html=True)
     st.write("")
     
-    if not quiebres_df.empty:
-        # Seleccionar top 6 quiebres por POTENCIAL DE UTILIDAD PERDIDA (Utilidad_Mensual)
-        quiebres_top = quiebres_df.sort_values('Utilidad_Mensual', ascending=False).head(6).copy()
-        
-        # Aplicar el motor de recomendación fila por fila
-        quiebres_top['Mejor_Opcion_IA'] = quiebres_top.apply(recomendar_mejor_proveedor, axis=1)
-        
+    if not quiebres_rank.empty:
+        # Quiebres por utilidad perdida, con licitación vectorizada (vista en cache)
         st.dataframe(
-            quiebres_top[['SKU', 'Producto', 'Proveedor', 'Mejor_Opcion_IA', 'Utilidad_Mensual']],
+            quiebres_rank[['SKU', 'Producto', 'Proveedor', 'Mejor_Opcion_IA', 'Segunda_Opcion', 'Margen_Score', 'Robustez', 'Utilidad_Mensual']],
             column_config={
                 "Proveedor": "Prov. Actual",
                 "Mejor_Opcion_IA": st.column_config.TextColumn("⭐ Sugerencia IA", help="Proveedor mejor evaluado: 80% Precio, 10% Tiempo, 5% Fill Rate, 5% Postventa"),
+                "Segunda_Opcion": "2ª Opción",
+                "Margen_Score": st.column_config.NumberColumn("Ventaja (pts)", format="%.1f"),
+                "Robustez": st.column_config.ProgressColumn("Robustez", help="% de las combinaciones de pesos en las que la sugerencia sigue ganando", format="%.0f%%", min_value=0, max_value=100),
                 "Utilidad_Mensual": st.column_config.NumberColumn("Ganancia Perdida/Mes", format="$%d")
             },
             hide_index=True,
-            use_container_width=True
+            use_container_width=True,
+            height=250
         )
         
-        if st.button("🛒 Ejecutar Pedido Inteligente (6 Productos)", type="primary"):
-            st.toast("Analizando la mejor oferta...", icon="🤖")
-            time.sleep(1.5)
-            st.success(f"¡Órdenes de compra generadas! Se han seleccionado los **proveedores sugeridos por Nexus AI** para reponer los 6 productos más críticos. Pedido #ORD-{np.random.randint(10000,99999)} enviado al ERP.")
-            st.balloons()
+        with st.expander("⚖️ Sensibilidad a los pesos de la licitación"):
+            malla = malla_pesos()
+            matriz_ref = matriz_ofertas_fija(1, OFERTAS_BASE)
+            st.caption(f"Ganador en {len(malla):,} combinaciones de pesos (paso 5%). Base: " + ", ".join(f"{c} {p:.0%}" for c, p in PESOS_BASE.items()))
+            ganador_malla, _ = regiones_ganadoras(matriz_ref, malla)
+            df_malla = pd.DataFrame(malla, columns=[f"Peso_{c}" for c in PESOS_BASE])
+            df_malla['Ganador'] = np.array(matriz_ref['proveedores'], dtype=object)[ganador_malla[0]]
+            fig_malla = px.scatter(df_malla, x='Peso_precio', y='Peso_tiempo', color='Ganador', opacity=0.5, labels={'Peso_precio': 'Peso Precio', 'Peso_tiempo': 'Peso Tiempo'})
+            fig_malla.add_scatter(x=[PESOS_BASE['precio']], y=[PESOS_BASE['tiempo']], mode='markers', marker=dict(symbol='x', size=14, color='black'), name='Pesos actuales')
+            fig_malla.update_layout(height=300, margin=dict(l=0, r=0, t=10, b=0))
+            st.plotly_chart(fig_malla, use_container_width=True)
+            st.dataframe(
+                resumen_regiones(matriz_ref, malla),
+                column_config={"Region_Pct": st.column_config.NumberColumn("Región (%)", format="%.1f")} | {
+                    f"Peso_{c}": st.column_config.NumberColumn(f"Peso {c} (centro)", format="%.2f") for c in PESOS_BASE
+                },
+                hide_index=True,
+                use_container_width=True,
+            )
     else:
         st.success("✅ No hay quiebres de stock críticos con potencial de pérdida en este momento.")
 
+    # Pedido sobre TODO el catálogo filtrado, limitado por presupuesto y pedidos mínimos
+    c_pres, c_min = st.columns(2)
+    presupuesto = c_pres.number_input("Presupuesto de compra ($)", min_value=0, value=50 * PASO_PRESUPUESTO, step=PASO_PRESUPUESTO, key="presupuesto_pedido")
+    minimo = c_min.number_input("Pedido mínimo por proveedor ($)", min_value=0, value=MINIMO_PEDIDO_BASE, step=PASO_PRESUPUESTO // 2, key="minimo_pedido")
+    if st.button("🛒 Ejecutar Pedido Inteligente (Catálogo Completo)", type="primary"):
+        st.session_state.pedido_inteligente = (presupuesto, minimo)
+    if st.session_state.get('pedido_inteligente') == (presupuesto, minimo):
+        plan = st.session_state.cache_vistas.obtener(
+            ('plan_compras', presupuesto, minimo) + clave_vista,
+            lambda: plan_reposicion(*clave_vista, presupuesto, minimo),
+        )
+        m1, m2, m3 = st.columns(3)
+        m1.metric("Inversión", f"${plan['gasto']/1e6:,.1f} M", f"{len(plan['lineas']):,} SKUs", delta_color="off")
+        m2.metric("Utilidad Recuperada/Mes", f"${plan['valor']/1e6:,.1f} M")
+        m3.metric("Cada $1M adicional", f"${plan['marginal']/1e6:,.2f} M", help="Utilidad mensual extra que recupera un millón más de presupuesto (valor marginal).")
+        st.dataframe(
+            plan['proveedores'],
+            column_config={
+                "Gasto": st.column_config.NumberColumn(format="$%d"),
+                "Utilidad_Recuperada": st.column_config.NumberColumn("Utilidad/Mes", format="$%d"),
+                "Minimo": st.column_config.NumberColumn("Mínimo", format="$%d"),
+            },
+            hide_index=True,
+            use_container_width=True,
+        )
+        fig_curva = px.line(plan['curva'], x='Presupuesto', y='Utilidad_Recuperada', markers=True, labels={'Utilidad_Recuperada': 'Utilidad Recuperada/Mes'})
+        fig_curva.add_vline(x=presupuesto, line_dash="dash", line_color="#EF4444")
+        fig_curva.update_layout(height=250, margin=dict(l=0, r=0, t=10, b=0))
+        st.plotly_chart(fig_curva, use_container_width=True)
+
 # --- COLUMNA 2: LIBERACIÓN DE EFECTIVO (Con Campañas Dinámicas) ---
 with col_excedentes:
     st.markdown("""<div class="action-box-blue"><h4 style="color: #1E40AF; margin:0;">💎 Estrategia: Liberación de Efectivo</h4><p style="color: #1E3A8A;">Convierte el inventario quieto (más de 4 meses) en flujo de caja inmediato.</p></div>""", unsafe_allow_html=True)
@@ -470,7 +663,7 @@ with col_excedentes:
     
     if not excedentes_df.empty:
         # Seleccionar top 6 excedentes por valor de inventario
-        excedentes_top = excedentes_df.sort_values('Valor_Inventario', ascending=False).head(6).copy()
+        excedentes_top = top_n(excedentes_df, 'Valor_Inventario', 6).copy()
         
         # Selector de Estrategia
         estrategia = st.radio(
@@ -498,6 +691,38 @@ with col_excedentes:
             use_container_width=True
         )
         
+        # Simulación de ambas campañas sobre TODOS los excedentes de la selección (vista en cache)
+        with st.expander(f"🎲 Simulación Monte Carlo ({N_ESCENARIOS:,} escenarios, {HORIZONTE_MESES} meses)"):
+            sim = st.session_state.cache_vistas.obtener(
+                ('campanas',) + clave_vista,
+                lambda: simular_campanas(excedentes_df, rng=np.random.default_rng(42)),
+            )
+            resumen_sim = resumen_campanas(sim)
+            totales_sim = resumen_sim[resumen_sim['Categoria'] == 'TOTAL']
+            for col_metrica, fila in zip(st.columns(len(totales_sim)), totales_sim.itertuples()):
+                col_metrica.metric(
+                    f"Caja liberada · {fila.Campaña.split(' (')[0]}", f"${fila.Caja_P50/1e6:,.1f} M",
+                    f"Margen cedido ${fila.Margen_Perdido_P50/1e6:,.1f} M", delta_color="inverse",
+                    help=f"Mediana de los escenarios. P10–P90: ${fila.Caja_P10/1e6:,.1f} M – ${fila.Caja_P90/1e6:,.1f} M",
+                )
+            fig_sim = go.Figure([
+                go.Histogram(x=metricas['Caja'].sum(axis=1) / 1e6, name=campana.split(' (')[0], opacity=0.6, nbinsx=40)
+                for campana, metricas in sim['campanas'].items()
+            ])
+            fig_sim.update_layout(barmode='overlay', height=250, margin=dict(l=0, r=0, t=10, b=0), xaxis_title="Caja liberada ($ M)", yaxis_title="Escenarios", legend=dict(orientation="h", y=1.1))
+            st.plotly_chart(fig_sim, use_container_width=True)
+            st.dataframe(
+                resumen_sim[['Campaña', 'Categoria', 'Caja_P10', 'Caja_P50', 'Caja_P90', 'Margen_Perdido_P50']],
+                column_config={
+                    "Caja_P10": st.column_config.NumberColumn("Caja P10", format="$%d"),
+                    "Caja_P50": st.column_config.NumberColumn("Caja P50", format="$%d"),
+                    "Caja_P90": st.column_config.NumberColumn("Caja P90", format="$%d"),
+                    "Margen_Perdido_P50": st.column_config.NumberColumn("Margen cedido P50", format="$%d"),
+                },
+                hide_index=True,
+                use_container_width=True,
+            )
+
         if st.button("📢 Lanzar Campaña & Notificar", type="secondary"):
             st.toast("Generando listados...", icon="📄")
             time.sleep(1)
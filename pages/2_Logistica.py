@@ -7,9 +7,28 @@ from datetime import datetime, timedelta
 import time
 import random
 import io
-from fpdf import FPDF
+import os
+import zipfile
 import xlsxwriter
 
+from nexus.cache_vistas import CacheVistas
+from nexus.consolidacion import VEHICULO_BASE, VEHICULOS, consolidar_envios, minimo_camiones
+from nexus.excel import TAMANO_LOTE, escribir_excel, lotes_de
+from nexus.figuras import figura_cacheada
+from nexus.generador import COLUMNAS_LOGISTICA, generar_red_tiendas
+from nexus.historia import StoreHistoria, snapshot_logistica
+from nexus.odoo import StoreParquet
+from nexus.odoo_catalogo import maestro_logistica, version_store
+from nexus.optimizador import MINIMO_PEDIDO_BASE, optimizar_compras
+from nexus.ordenes import generar_ordenes
+from nexus.pdf import documento_tabla, reporte_ejecutivo
+from nexus.render import renderizador
+from nexus.rutas import DEPOSITO_BASE, cargas_por_tienda, coordenadas_tiendas, distancia_directa, leer_matriz, matriz_distancias, planificar_rutas
+from nexus.reportes_ui import panel_reporte_pdf
+from nexus.ranking import top_n
+from nexus.tabs import tab_activa, tabs_perezosas
+from nexus.traslados import detalle_traslados, emparejar_traslados, traslado_por_fila
+
 # --- 1. CONFIGURACIÓN DE PÁGINA ---
 st.set_page_config(
     page_title="NEXUS PRO | Abastecimiento Estratégico",
@@ -93,67 +112,73 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # --- 3. MOTOR DE SIMULACIÓN DE DATOS (BACKEND SIMULADO) ---
+COLUMNAS_MAESTRO = COLUMNAS_LOGISTICA
+N_SKUS_LOGISTICA = int(os.environ.get("NEXUS_LOGISTICA_SKUS", 80))  # Escala de la red simulada
+N_TIENDAS = int(os.environ.get("NEXUS_LOGISTICA_TIENDAS", 5))
+
 @st.cache_data
-def init_mock_data():
-    """Genera datos base realistas para la demostración."""
-    tiendas = ['Sede Principal', 'Norte', 'Sur', 'Occidente', 'Outlet']
-    proveedores = ['DISTRIBUIDORA GLOBAL', 'IMPORTADOS S.A.', 'ACEROS DEL CARIBE', 'HERRAMIENTAS PRO', 'ELECTRO-MUNDO']
-    categorias = ['Herramientas', 'Construcción', 'Eléctricos', 'Pinturas', 'Seguridad Ind.']
-    
-    data = []
-    for i in range(1001, 1081): # 80 productos simulados
-        cat = random.choice(categorias)
-        sku = f"{cat[:3].upper()}-{i}"
-        costo = np.random.randint(5000, 250000)
-        
-        for tienda in tiendas:
-            demanda = np.random.randint(0, 60)
-            stock = np.random.randint(0, 120)
-            
-            # Lógica para forzar escenarios interesantes para el demo
-            if random.random() < 0.15: stock = 0 # Quiebre forzado
-            if random.random() < 0.10: stock = 300 # Excedente forzado
-            
-            # Cálculo de necesidades (Lógica de negocio)
-            necesidad = max(0, (demanda * 1.5) - stock) # Cobertura ideal 1.5 meses
-            excedente = max(0, stock - (demanda * 3)) # Excedente si supera 3 meses
-            
-            # Clasificación ABC basada en valor
-            valor_movimiento = demanda * costo
-            abc = 'A' if valor_movimiento > 5000000 else ('B' if valor_movimiento > 1000000 else 'C')
-
-            data.append({
-                'SKU': sku,
-                'Descripcion': f"Item {cat} Profesional {i}",
-                'Categoria': cat,
-                'Marca_Nombre': random.choice(['Makita', 'Bosch', '3M', 'Pintuco', 'Schneider']),
-                'Proveedor': random.choice(proveedores),
-                'Almacen_Nombre': tienda,
-                'Stock': stock,
-                'Costo_Promedio_UND': costo,
-                'Precio_Venta': costo * 1.4,
-                'Peso_Articulo': round(random.uniform(0.5, 10.0), 2),
-                'Demanda_Mes': demanda,
-                'Necesidad_Total': int(necesidad),
-                'Excedente_Trasladable': int(excedente),
-                'Stock_En_Transito': 0,
-                'Segmento_ABC': abc
-            })
-    return pd.DataFrame(data)
-
-# Inicializar estado
-if 'df_maestro' not in st.session_state:
-    st.session_state.df_maestro = init_mock_data()
+def init_mock_data(n_skus=N_SKUS_LOGISTICA, n_tiendas=N_TIENDAS, semilla=42):
+    """Genera datos base realistas para la demostración (SKU x tienda, vectorizado y reproducible)."""
+    return generar_red_tiendas(n_skus, n_tiendas, np.random.default_rng(semilla))
+
+HISTORIA = os.environ.get("NEXUS_HISTORIA")  # Snapshots diarios particionados (nexus.historia)
+DISTANCIAS = os.environ.get("NEXUS_DISTANCIAS")  # CSV tienda x tienda (km o minutos); si no, red simulada
+
+@st.cache_data(show_spinner=False)
+def matriz_tiendas(tiendas, deposito):
+    """Matriz de distancias de la red: la local (NEXUS_DISTANCIAS) o una simulada alrededor del depósito."""
+    return leer_matriz(DISTANCIAS) if DISTANCIAS else matriz_distancias(coordenadas_tiendas(tiendas, deposito))
+
+@st.cache_resource(show_spinner=False)
+def registrar_snapshot_diario(ruta, fecha, _df):
+    """Escribe el snapshot del día una sola vez por proceso (y solo si la partición no existe)."""
+    store = StoreHistoria(ruta, 'logistica')
+    if not store.tiene(fecha):
+        store.guardar(fecha, snapshot_logistica(_df))
+    return store
+
+def actualizar_maestro(df):
+    """Reemplaza el maestro y sube su versión: lo derivado se recalcula en el próximo rerun."""
+    st.session_state.df_maestro = df
+    st.session_state.version_maestro = st.session_state.get('version_maestro', 0) + 1
+
+# Inicializar estado (desde el almacén Odoo sincronizado si NEXUS_ODOO_STORE está definido)
+ODOO_STORE = os.environ.get("NEXUS_ODOO_STORE")
+
+@st.cache_data(show_spinner=False)
+def maestro_odoo(ruta, version_odoo):
+    """Maestro desde el almacén Odoo; `version_odoo` (última sincronización) lo recarga tras cada sync."""
+    return maestro_logistica(StoreParquet(ruta), COLUMNAS_MAESTRO)
+
+def cargar_maestro():
+    """Maestro vigente: el del almacén Odoo si está configurado; si no, la red simulada del demo."""
+    if ODOO_STORE:
+        st.session_state.version_odoo = version_store(ODOO_STORE)
+        return maestro_odoo(ODOO_STORE, st.session_state.version_odoo)
+    return init_mock_data()
+
+# Una sincronización nueva del almacén reemplaza el maestro en el próximo rerun
+if 'df_maestro' not in st.session_state or (ODOO_STORE and st.session_state.get('version_odoo') != version_store(ODOO_STORE)):
+    actualizar_maestro(cargar_maestro())
 
 # Lógica de abastecimiento (Separa qué se puede trasladar vs comprar)
 def calcular_abastecimiento(df):
-    # Si hay necesidad, intentamos cubrir hasta 12 unidades con traslados (simulación)
-    df['Sugerencia_Traslado'] = df.apply(lambda x: min(x['Necesidad_Total'], 12) if x['Necesidad_Total'] > 0 else 0, axis=1)
-    # Lo que falte, se compra
+    """Empareja excedentes con necesidades del mismo SKU en toda la red; lo que falte se compra."""
+    lineas = emparejar_traslados(df)
+    df['Sugerencia_Traslado'] = traslado_por_fila(df, lineas)
     df['Sugerencia_Compra'] = (df['Necesidad_Total'] - df['Sugerencia_Traslado']).clip(lower=0)
-    return df
+    return df, lineas
 
-df_work = calcular_abastecimiento(st.session_state.df_maestro.copy())
+# Lo derivado del maestro (abastecimiento, vistas filtradas, candidatos) se guarda por versión:
+# los reruns que no cambian datos (checkboxes, pestañas, botones) no recalculan nada.
+# Los derivados se comparten entre reruns y se tratan como solo lectura.
+version_maestro = st.session_state.version_maestro
+if 'cache_logistica' not in st.session_state or st.session_state.get('version_cache_logistica') != version_maestro:
+    st.session_state.cache_logistica = CacheVistas(max_entradas=32, max_bytes=256 * 1024 ** 2)
+    st.session_state.version_cache_logistica = version_maestro
+cache_logistica = st.session_state.cache_logistica
+
+df_work, lineas_traslado = cache_logistica.obtener('abastecimiento', lambda: calcular_abastecimiento(st.session_state.df_maestro.copy()))
 
 # --- MOCK DE DATOS PARA LA TORRE DE CONTROL (ACTUALIZADO) ---
 @st.cache_data
@@ -243,89 +268,29 @@ if 'df_tracking' not in st.session_state:
 # --- 4. FUNCIONES GENERADORAS DE ARCHIVOS (EXCEL Y PDF) ---
 
 def generar_excel(df, hoja="Reporte"):
-    """Genera un archivo Excel en memoria bytes."""
-    output = io.BytesIO()
-    writer = pd.ExcelWriter(output, engine='xlsxwriter')
-    
-    # Pre-procesamiento: Quitar 'Seleccionar' y formatear
-    df_temp = df.drop(columns=['Seleccionar'], errors='ignore')
-    if 'Costo Unit.' in df_temp.columns:
-        df_temp['Costo Unit.'] = df_temp['Costo Unit.'].apply(lambda x: f"${x:,.0f}")
-    if 'Total Estimado' in df_temp.columns:
-        df_temp['Total Estimado'] = df_temp['Total Estimado'].apply(lambda x: f"${x:,.0f}")
-        
-    df_temp.to_excel(writer, index=False, sheet_name=hoja)
-    
-    workbook = writer.book
-    worksheet = writer.sheets[hoja]
-    
-    # Formatos profesionales
-    header_fmt = workbook.add_format({'bold': True, 'fg_color': '#2E86C1', 'font_color': 'white', 'border': 1})
-    
-    for col_num, value in enumerate(df_temp.columns.values):
-        worksheet.write(0, col_num, value, header_fmt)
-        # Ajustar ancho
-        worksheet.set_column(col_num, col_num, 20)
-    
-    writer.close()
-    return output.getvalue()
+    """Genera un archivo Excel en memoria bytes (streaming, con moneda y cantidades numéricas)."""
+    return escribir_excel(lotes_de(df.drop(columns=['Seleccionar'], errors='ignore')), hoja=hoja)
 
-class PDFReport(FPDF):
-    """Clase personalizada para el PDF."""
-    def header(self):
-        self.set_font('Arial', 'B', 15)
-        self.set_text_color(46, 134, 193) # Azul corporativo
-        self.cell(0, 10, 'NEXUS PRO - Reporte Operativo', 0, 1, 'C')
-        self.ln(5)
-    def footer(self):
-        self.set_y(-15)
-        self.set_font('Arial', 'I', 8)
-        self.set_text_color(128)
-        self.cell(0, 10, f'Pagina {self.page_no()}', 0, 0, 'C')
+def lotes_traslado(df, lineas, tamano=TAMANO_LOTE):
+    """Detalle de las líneas de traslado por lotes (para exportar la red completa sin armarla entera)."""
+    for lote in lotes_de(lineas, tamano):
+        detalle = detalle_traslados(df, lote)
+        yield detalle[['SKU', 'Descripcion', 'Origen', 'Destino', 'Cantidad', 'Costo_Promedio_UND', 'Peso_Articulo', 'Valor_Traslado']]
 
 def generar_pdf(df, titulo):
-    """Genera un PDF simple con tabla en memoria bytes."""
-    pdf = PDFReport()
-    pdf.add_page()
-    pdf.set_font("Arial", size=10)
-    pdf.set_text_color(0)
-    
-    pdf.set_font("Arial", 'B', 12)
-    pdf.cell(0, 10, f"{titulo}", 0, 1, 'L')
-    pdf.set_font("Arial", '', 10)
-    pdf.cell(0, 10, f"Fecha Generación: {datetime.now().strftime('%Y-%m-%d %H:%M')}", 0, 1, 'L')
-    pdf.ln(5)
-    
-    # Pre-procesamiento: Quitar 'Seleccionar' y formatear para PDF
-    df_temp = df.drop(columns=['Seleccionar'], errors='ignore').copy()
-    if 'Costo Unit.' in df_temp.columns:
-        df_temp['Costo Unit.'] = df_temp['Costo Unit.'].apply(lambda x: f"${x:,.0f}")
-    if 'Total Estimado' in df_temp.columns:
-        df_temp['Total Estimado'] = df_temp['Total Estimado'].apply(lambda x: f"${x:,.0f}")
-
-    # Tabla simple
-    num_cols = len(df_temp.columns)
-    col_width = 190 / num_cols if num_cols > 0 else 10
-    row_height = 7
-    
-    # Encabezados
-    pdf.set_font("Arial", 'B', 8)
-    pdf.set_fill_color(232, 244, 253) # Azul muy claro
-    for col in df_temp.columns:
-        clean_col = str(col)[:15]
-        pdf.cell(col_width, row_height, clean_col, 1, 0, 'C', True)
-    pdf.ln()
-    
-    # Filas
-    pdf.set_font("Arial", '', 8)
-    for i, row in df_temp.iterrows():
-        for col in df_temp.columns:
-            txt = str(row[col])
-            # Truncar texto de celda si es muy largo
-            pdf.cell(col_width, row_height, txt[:18], 1, 0, 'C')
-        pdf.ln()
-    
-    return bytes(pdf.output())
+    """Genera un PDF con la tabla paginada (encabezado repetido) en memoria bytes."""
+    return documento_tabla(df.drop(columns=['Seleccionar'], errors='ignore'), titulo)
+
+def generar_documentos_envios(tramos, envios):
+    """ZIP con una orden de traslado PDF por camión (sus líneas, peso y ocupación en el título)."""
+    output = io.BytesIO()
+    columnas = {'SKU': 'SKU', 'Descripcion': 'Producto', 'Cantidad': 'Cantidad', 'Peso_kg': 'Peso (kg)', 'Costo_Promedio_UND': 'Costo Unit.'}
+    with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for envio, lineas in zip(envios.itertuples(index=False), tramos.groupby('Envio', sort=True)):
+            doc = lineas[1][list(columnas)].rename(columns=columnas).round({'Peso (kg)': 1})
+            titulo = f"ENVIO {envio.Envio}: {envio.Origen} -> {envio.Destino} | {envio.Peso_kg:,.0f} kg ({envio.Ocupacion:.0%})"
+            zf.writestr(f"Envio_{envio.Envio:05d}_{envio.Origen}_{envio.Destino}.pdf".replace(" ", "_"), generar_pdf(doc, titulo))
+    return output.getvalue()
 
 # --- 5. UI: BARRA LATERAL DE NAVEGACIÓN ---
 with st.sidebar:
@@ -346,14 +311,21 @@ with st.sidebar:
     st.divider()
     st.info("🟢 **Conexión ERP:** Establecida\n📅 **Datos:** Tiempo Real")
 
-# Aplicar Filtros Globales
-if filtro_tienda != "Todas":
-    df_vista = df_work[df_work['Almacen_Nombre'] == filtro_tienda]
-else:
-    df_vista = df_work
+# Aplicar Filtros Globales (una vista por combinación y versión del maestro)
+def construir_vista(tienda, marcas):
+    """Vista filtrada y sus candidatos: líneas de traslado hacia la vista y filas con compra sugerida."""
+    vista = df_work if tienda == "Todas" else df_work[df_work['Almacen_Nombre'] == tienda]
+    if marcas:
+        vista = vista[vista['Marca_Nombre'].isin(marcas)]
+    return {
+        'vista': vista,
+        'traslados': lineas_traslado[lineas_traslado['Destino'].isin(vista.index)],
+        'compras': vista[vista['Sugerencia_Compra'] > 0],
+    }
 
-if filtro_marca:
-    df_vista = df_vista[df_vista['Marca_Nombre'].isin(filtro_marca)]
+clave_vista = (filtro_tienda, tuple(sorted(filtro_marca)))
+vista_actual = cache_logistica.obtener(('vista', *clave_vista), lambda: construir_vista(*clave_vista))
+df_vista = vista_actual['vista']
 
 # --- 6. UI: ENCABEZADO PRINCIPAL ---
 col_h1, col_h2 = st.columns([3, 1])
@@ -364,393 +336,603 @@ with col_h2:
     if st.button("🔄 Actualizar Análisis"):
         st.toast("Recalculando algoritmos de abastecimiento...", icon="🤖")
         time.sleep(1)
-        # Forzamos un recálculo simple para simular frescura de datos
-        st.session_state.df_maestro = init_mock_data()
+        # Recarga el maestro: el almacén Odoo (última sincronización) o la red del demo
+        actualizar_maestro(cargar_maestro())
         st.session_state.df_tracking = get_tracking_data(st.session_state.df_maestro)
         st.rerun()
 
 # --- 7. PESTAÑAS DE CONTENIDO ---
-tab1, tab2, tab3, tab4 = st.tabs([
+# Constructores de figuras (memoizados con figura_cacheada entre reruns)
+def fig_distribucion_inversion(df_sun):
+    # Plotly agrega el color de cada sector con max, que no admite categóricas sin orden
+    df_sun = df_sun.astype({'Categoria': str, 'Marca_Nombre': str, 'Segmento_ABC': str})
+    fig = px.sunburst(
+        df_sun, 
+        path=['Categoria', 'Marca_Nombre'], 
+        values='Costo_Promedio_UND',
+        color='Segmento_ABC',
+        color_discrete_map={'A':'#EF553B', 'B':'#FFA15A', 'C':'#00CC96'},
+        title="Haga clic en los sectores para profundizar (Drill-down)"
+    )
+    fig.update_layout(height=450, margin=dict(t=30, l=0, r=0, b=0))
+    return fig
+
+def fig_tendencia_tiendas(kpis_hist, columna, titulo_y):
+    fig = px.line(kpis_hist, x='Fecha', y=columna, color='Grupo')
+    fig.update_layout(height=300, margin=dict(t=10, l=0, r=0, b=0), xaxis_title=None, yaxis_title=titulo_y, legend_title=None)
+    return fig
+
+def fig_rutas(paradas, deposito, tiendas):
+    # Solo las rutas multiparada (las directas son ida y vuelta); una sola traza con cortes entre rutas
+    coords = coordenadas_tiendas(tiendas, deposito)
+    multi = paradas[paradas.groupby('Ruta')['Parada'].transform('size') > 1]
+    ida = multi.groupby('Ruta', as_index=False).first().assign(Parada=0, Tienda=deposito)
+    vuelta = ida.assign(Parada=np.iinfo(np.int64).max)
+    corte = ida.assign(Parada=np.iinfo(np.int64).max, Tienda=None)
+    trazado = pd.concat([ida, multi, vuelta, corte]).sort_values(['Ruta', 'Parada'], kind='stable')
+    trazado = trazado.join(coords, on='Tienda')
+    fig = go.Figure(go.Scatter(x=trazado['x'], y=trazado['y'], mode='lines+markers', text=trazado['Tienda'],
+                               hovertemplate="%{text}<extra></extra>", line=dict(color="#2E86C1", width=1.5)))
+    fig.add_trace(go.Scatter(x=[0.0], y=[0.0], mode='markers', marker=dict(size=14, color="#EF553B", symbol="star"), name=deposito))
+    fig.update_layout(height=450, margin=dict(t=10, l=0, r=0, b=0), xaxis_title="km", yaxis_title="km", showlegend=False)
+    fig.update_yaxes(scaleanchor="x", scaleratio=1)
+    return fig
+
+def fig_nivel_servicio(eficiencia):
+    fig = go.Figure(go.Indicator(
+        mode = "gauge+number",
+        value = eficiencia,
+        title = {'text': "Nivel de Servicio (%)"},
+        gauge = {'axis': {'range': [None, 100]},
+                 'bar': {'color': "#2E86C1"},
+                 'steps': [
+                     {'range': [0, 85], 'color': "#F9EBEA"},
+                     {'range': [85, 100], 'color': "#E8F8F5"}],
+                 'threshold': {'line': {'color': "red", 'width': 4}, 'thickness': 0.75, 'value': 90}}))
+    fig.update_layout(height=350, margin=dict(t=50, l=20, r=20, b=20))
+    return fig
+
+# --- REPORTE EJECUTIVO PDF (se construye en segundo plano; los PNG se cachean por figura) ---
+def preparar_reporte_logistica():
+    skus_quiebre = int((df_vista['Stock'] == 0).sum())
+    eficiencia = 100 - (skus_quiebre / len(df_vista) * 100) if len(df_vista) > 0 else 100
+    kpis_pdf = [
+        ("Valor Inventario Actual", f"${(df_vista['Stock'] * df_vista['Costo_Promedio_UND']).sum()/1e6:,.1f} M"),
+        ("Inversión Requerida", f"${(df_vista['Sugerencia_Compra'] * df_vista['Costo_Promedio_UND']).sum()/1e6:,.1f} M"),
+        ("Ahorro x Traslados", f"${(df_vista['Sugerencia_Traslado'] * df_vista['Costo_Promedio_UND']).sum()/1e6:,.1f} M"),
+        ("SKUs en Quiebre", f"{skus_quiebre:,}"),
+    ]
+    df_sun = df_vista.groupby(['Categoria', 'Marca_Nombre', 'Segmento_ABC'], as_index=False, observed=True)['Costo_Promedio_UND'].sum()
+    figuras_pdf = [
+        ("Distribución de Inversión", figura_cacheada(fig_distribucion_inversion, df_sun)),
+        ("Salud del Inventario", figura_cacheada(fig_nivel_servicio, float(eficiencia))),
+    ]
+    return reporte_ejecutivo, (f"Abastecimiento Inteligente - {filtro_tienda}", kpis_pdf, figuras_pdf, renderizador())
+
+with col_h2:
+    panel_reporte_pdf("reporte_logistica", preparar_reporte_logistica, f"Reporte_Logistica_{datetime.now():%Y%m%d}.pdf")
+
+# Pestañas perezosas: cada pestaña calcula sus agregados y figuras solo cuando está visible
+tab1, tab2, tab3, tab4 = tabs_perezosas([
     "📊 Diagnóstico Estratégico", 
     "🚚 Gestión de Traslados", 
     "🛒 Gestión de Compras", 
     "📡 Torre de Control"
-])
+], key="tabs_logistica")
 
 # === TAB 1: DIAGNÓSTICO ===
 with tab1:
-    st.markdown("""
-    <div class="guide-box">
-        <div class="guide-title">💡 Guía Estratégica: Diagnóstico</div>
-        Esta vista le permite identificar en segundos dónde está atrapado su capital y dónde está perdiendo ventas por quiebres.
-        <br>Utilice el gráfico de <b>Nivel de Servicio</b> para medir la calidad de su inventario actual.
-    </div>
-    """, unsafe_allow_html=True)
-
-    # KPIs Principales
-    c1, c2, c3, c4 = st.columns(4)
-    
-    total_inv = (df_vista['Stock'] * df_vista['Costo_Promedio_UND']).sum()
-    total_compra = (df_vista['Sugerencia_Compra'] * df_vista['Costo_Promedio_UND']).sum()
-    total_ahorro = (df_vista['Sugerencia_Traslado'] * df_vista['Costo_Promedio_UND']).sum()
-    skus_quiebre = len(df_vista[df_vista['Stock'] == 0])
-
-    with c1: st.markdown(f'<div class="metric-card"><div class="metric-label">Valor Inventario Actual</div><div class="metric-value">${total_inv/1e6:,.1f} M</div></div>', unsafe_allow_html=True)
-    with c2: st.markdown(f'<div class="metric-card" style="border-color:#EF553B;"><div class="metric-label">Inversión Requerida</div><div class="metric-value" style="color:#EF553B">${total_compra/1e6:,.1f} M</div></div>', unsafe_allow_html=True)
-    with c3: st.markdown(f'<div class="metric-card" style="border-color:#00CC96;"><div class="metric-label">Ahorro x Traslados</div><div class="metric-value" style="color:#00CC96">${total_ahorro/1e6:,.1f} M</div></div>', unsafe_allow_html=True)
-    with c4: st.markdown(f'<div class="metric-card"><div class="metric-label">SKUs en Quiebre</div><div class="metric-value">{skus_quiebre}</div></div>', unsafe_allow_html=True)
-
-    # Gráficos Avanzados
-    st.markdown("---")
-    col_chart1, col_chart2 = st.columns([2, 1])
-    
-    with col_chart1:
-        st.subheader("Distribución de Inversión (Interactivo)")
-        # Sunburst Chart: Categoría -> Marca
-        fig_sun = px.sunburst(
-            df_vista, 
-            path=['Categoria', 'Marca_Nombre'], 
-            values='Costo_Promedio_UND',
-            color='Segmento_ABC',
-            color_discrete_map={'A':'#EF553B', 'B':'#FFA15A', 'C':'#00CC96'},
-            title="Haga clic en los sectores para profundizar (Drill-down)"
-        )
-        fig_sun.update_layout(height=450, margin=dict(t=30, l=0, r=0, b=0))
-        st.plotly_chart(fig_sun, use_container_width=True)
+    if tab_activa(tab1):
+        st.markdown("""
+        <div class="guide-box">
+            <div class="guide-title">💡 Guía Estratégica: Diagnóstico</div>
+            Esta vista le permite identificar en segundos dónde está atrapado su capital y dónde está perdiendo ventas por quiebres.
+            <br>Utilice el gráfico de <b>Nivel de Servicio</b> para medir la calidad de su inventario actual.
+        </div>
+        """, unsafe_allow_html=True)
+
+        # KPIs Principales
+        c1, c2, c3, c4 = st.columns(4)
+    
+        total_inv = (df_vista['Stock'] * df_vista['Costo_Promedio_UND']).sum()
+        total_compra = (df_vista['Sugerencia_Compra'] * df_vista['Costo_Promedio_UND']).sum()
+        total_ahorro = (df_vista['Sugerencia_Traslado'] * df_vista['Costo_Promedio_UND']).sum()
+        skus_quiebre = len(df_vista[df_vista['Stock'] == 0])
+
+        with c1: st.markdown(f'<div class="metric-card"><div class="metric-label">Valor Inventario Actual</div><div class="metric-value">${total_inv/1e6:,.1f} M</div></div>', unsafe_allow_html=True)
+        with c2: st.markdown(f'<div class="metric-card" style="border-color:#EF553B;"><div class="metric-label">Inversión Requerida</div><div class="metric-value" style="color:#EF553B">${total_compra/1e6:,.1f} M</div></div>', unsafe_allow_html=True)
+        with c3: st.markdown(f'<div class="metric-card" style="border-color:#00CC96;"><div class="metric-label">Ahorro x Traslados</div><div class="metric-value" style="color:#00CC96">${total_ahorro/1e6:,.1f} M</div></div>', unsafe_allow_html=True)
+        with c4: st.markdown(f'<div class="metric-card"><div class="metric-label">SKUs en Quiebre</div><div class="metric-value">{skus_quiebre}</div></div>', unsafe_allow_html=True)
+
+        # Gráficos Avanzados
+        st.markdown("---")
+        col_chart1, col_chart2 = st.columns([2, 1])
+    
+        with col_chart1:
+            st.subheader("Distribución de Inversión (Interactivo)")
+            # Sunburst Chart: Categoría -> Marca
+            # El sunburst suma por ruta: se agrega antes para que la figura dependa de un frame pequeño
+            df_sun = df_vista.groupby(['Categoria', 'Marca_Nombre', 'Segmento_ABC'], as_index=False, observed=True)['Costo_Promedio_UND'].sum()
+            fig_sun = figura_cacheada(fig_distribucion_inversion, df_sun)
+            st.plotly_chart(fig_sun, use_container_width=True)
         
-    with col_chart2:
-        st.subheader("Salud del Inventario")
-        # Gauge Chart (Velocímetro)
-        eficiencia = 100 - (skus_quiebre / len(df_vista) * 100) if len(df_vista) > 0 else 100
-        fig_gauge = go.Figure(go.Indicator(
-            mode = "gauge+number",
-            value = eficiencia,
-            title = {'text': "Nivel de Servicio (%)"},
-            gauge = {'axis': {'range': [None, 100]},
-                     'bar': {'color': "#2E86C1"},
-                     'steps': [
-                         {'range': [0, 85], 'color': "#F9EBEA"},
-                         {'range': [85, 100], 'color': "#E8F8F5"}],
-                     'threshold': {'line': {'color': "red", 'width': 4}, 'thickness': 0.75, 'value': 90}}))
-        fig_gauge.update_layout(height=350, margin=dict(t=50, l=20, r=20, b=20))
-        st.plotly_chart(fig_gauge, use_container_width=True)
+        with col_chart2:
+            st.subheader("Salud del Inventario")
+            # Gauge Chart (Velocímetro)
+            eficiencia = 100 - (skus_quiebre / len(df_vista) * 100) if len(df_vista) > 0 else 100
+            fig_gauge = figura_cacheada(fig_nivel_servicio, float(eficiencia))
+            st.plotly_chart(fig_gauge, use_container_width=True)
         
-        st.info("✅ **Meta:** Mantener el nivel de servicio por encima del 90% para asegurar la satisfacción del cliente.")
+            st.info("✅ **Meta:** Mantener el nivel de servicio por encima del 90% para asegurar la satisfacción del cliente.")
+
+        if HISTORIA:
+            with st.expander("📈 Tendencia por Sede (últimos 90 días)"):
+                store_hist = registrar_snapshot_diario(HISTORIA, datetime.now().strftime('%Y-%m-%d'), st.session_state.df_maestro)
+                sedes = None if filtro_tienda == "Todas" else [filtro_tienda]
+                kpis_hist = store_hist.kpis(desde=datetime.now() - timedelta(days=90), grupos=sedes)
+                if kpis_hist.empty:
+                    st.info("Aún no hay historia registrada.")
+                else:
+                    c_h1, c_h2 = st.columns(2)
+                    with c_h1: st.plotly_chart(figura_cacheada(fig_tendencia_tiendas, kpis_hist, columna='Valor_Inventario', titulo_y="Valor Inventario ($)"), use_container_width=True)
+                    with c_h2: st.plotly_chart(figura_cacheada(fig_tendencia_tiendas, kpis_hist, columna='Dias_Quiebre_30', titulo_y="SKU-días en Quiebre (30d)"), use_container_width=True)
 
 # === TAB 2: TRASLADOS ===
 with tab2:
-    st.markdown("""
-    <div class="guide-box">
-        <div class="guide-title">🚚 Guía Estratégica: Centro de Traslados</div>
-        El sistema detecta automáticamente dónde sobra mercancía y dónde falta.
-        <br><b>Acción:</b> Seleccione los productos en la tabla, descargue la orden y envíela a bodega para ahorrar capital de compra.
-    </div>
-    """, unsafe_allow_html=True)
-    
-    df_traslados = df_vista[df_vista['Sugerencia_Traslado'] > 0].copy()
-    
-    if df_traslados.empty:
-        st.success("✅ Excelente. El inventario está balanceado. No se requieren traslados.")
-    else:
-        # Preparar datos para edición
-        # Simulamos un origen lógico
-        df_traslados['Origen_Sugerido'] = df_traslados['Almacen_Nombre'].apply(lambda x: "Sede Principal" if x != "Sede Principal" else "Norte")
+    if tab_activa(tab2):
+        st.markdown("""
+        <div class="guide-box">
+            <div class="guide-title">🚚 Guía Estratégica: Centro de Traslados</div>
+            El sistema detecta automáticamente dónde sobra mercancía y dónde falta.
+            <br><b>Acción:</b> Seleccione los productos en la tabla, descargue la orden y envíela a bodega para ahorrar capital de compra.
+        </div>
+        """, unsafe_allow_html=True)
+    
+        # Líneas origen -> destino cuyo destino está en la vista (sede y marcas filtradas)
+        lineas_vista = vista_actual['traslados']
+    
+        if lineas_vista.empty:
+            st.success("✅ Excelente. El inventario está balanceado. No se requieren traslados.")
+        else:
+            # Preparar datos para edición: las 20 líneas de mayor valor (selección parcial)
+            costo_destino = df_work['Costo_Promedio_UND'].to_numpy()[df_work.index.get_indexer(lineas_vista['Destino'])]
+            lineas_top = top_n(lineas_vista.assign(Valor_Traslado=lineas_vista['Cantidad'] * costo_destino), 'Valor_Traslado', 20)
+            df_traslados = detalle_traslados(df_work, lineas_top)
+            st.caption(f"{len(lineas_vista):,} líneas de traslado factibles (origen con excedente real); se muestran las {len(df_traslados)} de mayor valor.")
+
+            # El plan completo se exporta en streaming (memoria acotada aunque sean cientos de miles de líneas)
+            clave_plan = (version_maestro, *clave_vista)
+            if st.button(f"📊 Preparar Excel con las {len(lineas_vista):,} líneas", key="excel_traslados_completo"):
+                with st.spinner("Escribiendo el libro en streaming..."):
+                    st.session_state.excel_traslados = (clave_plan, escribir_excel(lotes_traslado(df_work, lineas_vista), hoja="Plan_Traslados"))
+            excel_plan = st.session_state.get('excel_traslados')
+            if excel_plan and excel_plan[0] == clave_plan:
+                st.download_button(
+                    label="📥 Descargar Plan de Traslados Completo (Excel)",
+                    data=excel_plan[1],
+                    file_name=f"Plan_Traslados_{datetime.now():%Y%m%d}.xlsx",
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                )
         
-        df_display_tras = df_traslados[['SKU', 'Descripcion', 'Origen_Sugerido', 'Almacen_Nombre', 'Sugerencia_Traslado', 'Costo_Promedio_UND']].head(20)
-        df_display_tras.columns = ['SKU', 'Producto', 'Origen', 'Destino', 'Cantidad', 'Costo Unit.']
-        df_display_tras['Seleccionar'] = False
+            df_display_tras = df_traslados[['SKU', 'Descripcion', 'Origen', 'Destino', 'Cantidad', 'Costo_Promedio_UND']]
+            df_display_tras.columns = ['SKU', 'Producto', 'Origen', 'Destino', 'Cantidad', 'Costo Unit.']
+            df_display_tras['Seleccionar'] = False
         
-        # Editor interactivo
-        edited_traslados = st.data_editor(
-            df_display_tras,
-            column_config={
-                "Seleccionar": st.column_config.CheckboxColumn(required=True),
-                "Cantidad": st.column_config.NumberColumn(min_value=1, step=1),
-                "Costo Unit.": st.column_config.NumberColumn(format="$%d")
-            },
-            use_container_width=True,
-            hide_index=True,
-            key="editor_traslados_principal"
-        )
+            # Editor interactivo
+            edited_traslados = st.data_editor(
+                df_display_tras,
+                column_config={
+                    "Seleccionar": st.column_config.CheckboxColumn(required=True),
+                    "Cantidad": st.column_config.NumberColumn(min_value=1, step=1),
+                    "Costo Unit.": st.column_config.NumberColumn(format="$%d")
+                },
+                use_container_width=True,
+                hide_index=True,
+                key="editor_traslados_principal"
+            )
         
-        seleccionados_tras = edited_traslados[edited_traslados['Seleccionar']]
+            seleccionados_tras = edited_traslados[edited_traslados['Seleccionar']]
         
-        st.markdown("---")
+            st.markdown("---")
         
-        # Panel de Acciones
-        if not seleccionados_tras.empty:
-            cant_total = seleccionados_tras['Cantidad'].sum()
-            valor_total = (seleccionados_tras['Cantidad'] * seleccionados_tras['Costo Unit.']).sum()
+            # Panel de Acciones
+            if not seleccionados_tras.empty:
+                cant_total = seleccionados_tras['Cantidad'].sum()
+                valor_total = (seleccionados_tras['Cantidad'] * seleccionados_tras['Costo Unit.']).sum()
             
-            col_res, col_exp, col_act = st.columns([1, 1, 1])
+                col_res, col_exp, col_act = st.columns([1, 1, 1])
             
-            with col_res:
-                st.markdown("#### Resumen")
-                st.info(f"📦 **{len(seleccionados_tras)} Referencias**\n\n📊 **{cant_total} Unidades**\n\n💰 Valor: **${valor_total:,.0f}**")
+                with col_res:
+                    st.markdown("#### Resumen")
+                    st.info(f"📦 **{len(seleccionados_tras)} Referencias**\n\n📊 **{cant_total} Unidades**\n\n💰 Valor: **${valor_total:,.0f}**")
             
-            with col_exp:
-                st.markdown("#### Exportar Documentos")
+                with col_exp:
+                    st.markdown("#### Exportar Documentos")
                 
-                # Generar Excel
-                excel_data = generar_excel(seleccionados_tras, "Orden_Traslado")
-                st.download_button(
-                    label="📥 Descargar Excel (Bodega)",
-                    data=excel_data,
-                    file_name="Orden_Traslado.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                    use_container_width=True
-                )
+                    # Generar Excel
+                    excel_data = generar_excel(seleccionados_tras, "Orden_Traslado")
+                    st.download_button(
+                        label="📥 Descargar Excel (Bodega)",
+                        data=excel_data,
+                        file_name="Orden_Traslado.xlsx",
+                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                        use_container_width=True
+                    )
                 
-                # Generar PDF
-                pdf_data = generar_pdf(seleccionados_tras, "ORDEN DE TRASLADO INTERNO")
-                st.download_button(
-                    label="📄 Descargar PDF (Legal)",
-                    data=pdf_data,
-                    file_name="Orden_Traslado.pdf",
-                    mime="application/pdf",
-                    use_container_width=True
-                )
+                    # Generar PDF
+                    pdf_data = generar_pdf(seleccionados_tras, "ORDEN DE TRASLADO INTERNO")
+                    st.download_button(
+                        label="📄 Descargar PDF (Legal)",
+                        data=pdf_data,
+                        file_name="Orden_Traslado.pdf",
+                        mime="application/pdf",
+                        use_container_width=True
+                    )
                 
-            with col_act:
-                st.markdown("#### Ejecución")
-                if st.button("🚀 Procesar Traslado y Notificar", type="primary", use_container_width=True):
-                    with st.spinner("Enviando notificaciones a Jefes de Bodega..."):
-                        time.sleep(2)
-                        st.success(f"¡Orden procesada! Se notificó a {seleccionados_tras['Origen'].iloc[0]} y {seleccionados_tras['Destino'].iloc[0]}.")
-                        st.balloons()
-        else:
-            st.warning("👆 Por favor, seleccione al menos un ítem en la tabla para activar las opciones de exportación y envío.")
+                with col_act:
+                    st.markdown("#### Ejecución")
+                    if st.button("🚀 Procesar Traslado y Notificar", type="primary", use_container_width=True):
+                        with st.spinner("Enviando notificaciones a Jefes de Bodega..."):
+                            time.sleep(2)
+                            st.success(f"¡Orden procesada! Se notificó a {seleccionados_tras['Origen'].iloc[0]} y {seleccionados_tras['Destino'].iloc[0]}.")
+                            st.balloons()
+            else:
+                st.warning("👆 Por favor, seleccione al menos un ítem en la tabla para activar las opciones de exportación y envío.")
+
+            def lineas_por_alcance(alcance):
+                """Líneas aprobadas (seleccionadas en la tabla, con su cantidad editada) o todas las de la vista."""
+                if alcance == "Seleccionadas":
+                    return df_traslados.loc[seleccionados_tras.index].assign(Cantidad=seleccionados_tras['Cantidad'])
+                return detalle_traslados(df_work, lineas_vista)
+
+            def plan_vigente(nombre, *dependientes):
+                """Plan guardado como (clave_plan, plan); si se armó con otra vista o versión del maestro se descarta, con lo que depende de él."""
+                guardado = st.session_state.get(nombre)
+                if guardado is not None and guardado[0] != clave_plan:
+                    for clave in (nombre, *dependientes):
+                        st.session_state.pop(clave, None)
+                    return None
+                return guardado[1] if guardado is not None else None
+
+            # Consolidación: las líneas se empacan por carril en camiones según su peso
+            with st.expander("🚛 Consolidación de Envíos por Peso"):
+                c_e1, c_e2, c_e3 = st.columns([2, 2, 1])
+                alcance = c_e1.radio("Líneas a consolidar:", ["Seleccionadas", "Todas las de la vista"], horizontal=True, key="alcance_envios")
+                vehiculo = c_e2.selectbox("Vehículo:", list(VEHICULOS), index=list(VEHICULOS).index(VEHICULO_BASE), key="vehiculo_envios")
+                capacidad = c_e3.number_input("Capacidad (kg):", min_value=100, value=VEHICULOS[vehiculo], step=100, key=f"capacidad_{vehiculo}")
+
+                if st.button("📦 Planificar Envíos", use_container_width=True):
+                    lineas_envio = lineas_por_alcance(alcance)
+                    st.session_state.plan_envios = (clave_plan, consolidar_envios(lineas_envio, capacidad) if not lineas_envio.empty else None)
+                    st.session_state.zip_envios = None
+
+                plan = plan_vigente('plan_envios', 'zip_envios')
+                if plan is not None:
+                    tramos, envios = plan
+                    c_m1, c_m2, c_m3, c_m4 = st.columns(4)
+                    c_m1.metric("Líneas", f"{tramos.index.nunique():,}")
+                    c_m2.metric("Camiones", f"{len(envios):,}", delta=f"mínimo teórico {minimo_camiones(envios, envios['Capacidad_kg'].iloc[0]):,}", delta_color="off")
+                    c_m3.metric("Ocupación Promedio", f"{envios['Ocupacion'].mean():.0%}")
+                    c_m4.metric("Peso Total", f"{envios['Peso_kg'].sum()/1000:,.1f} t")
+                    if tramos['Sobrepeso'].any():
+                        st.warning(f"⚠️ {int(tramos['Sobrepeso'].sum())} unidades pesan más que el vehículo y viajan solas.")
+                    st.dataframe(envios.assign(Ocupacion=envios['Ocupacion'] * 100), use_container_width=True, hide_index=True, column_config={
+                        "Peso_kg": st.column_config.NumberColumn(format="%.0f"),
+                        "Capacidad_kg": st.column_config.NumberColumn(format="%.0f"),
+                        "Ocupacion": st.column_config.ProgressColumn(min_value=0, max_value=100, format="%.0f%%"),
+                    })
+                    if st.button("🗂️ Generar Documentos por Camión", use_container_width=True):
+                        with st.spinner(f"Generando {len(envios):,} documentos..."):
+                            st.session_state.zip_envios = generar_documentos_envios(tramos, envios)
+                    if st.session_state.get('zip_envios'):
+                        st.download_button(
+                            label="📥 Descargar Documentos de Envío (ZIP)",
+                            data=st.session_state.zip_envios,
+                            file_name=f"Envios_Traslado_{datetime.now():%Y%m%d}.zip",
+                            mime="application/zip",
+                            use_container_width=True
+                        )
+
+            # Ruteo: los camiones salen del depósito y recorren varias tiendas entregando y recogiendo
+            with st.expander("🗺️ Rutas Multiparada del Día"):
+                c_r1, c_r2, c_r3 = st.columns([2, 2, 1])
+                alcance_rutas = c_r1.radio("Traslados aprobados:", ["Seleccionadas", "Todas las de la vista"], horizontal=True, key="alcance_rutas")
+                tiendas_red = [str(t) for t in pd.unique(df_work['Almacen_Nombre'])]
+                deposito = c_r2.selectbox("Depósito (cross-dock):", tiendas_red, index=tiendas_red.index(DEPOSITO_BASE) if DEPOSITO_BASE in tiendas_red else 0, key="deposito_rutas")
+                capacidad_ruta = c_r3.number_input("Capacidad (kg):", min_value=100, value=VEHICULOS[VEHICULO_BASE], step=100, key="capacidad_rutas")
+
+                if st.button("🧭 Planificar Rutas", use_container_width=True):
+                    lineas_ruta = lineas_por_alcance(alcance_rutas)
+                    lineas_ruta = lineas_ruta.assign(Peso_kg=lineas_ruta['Cantidad'] * lineas_ruta['Peso_Articulo'])
+                    distancias = matriz_tiendas(tuple(tiendas_red), deposito)
+                    cargas = cargas_por_tienda(lineas_ruta, deposito)
+                    if cargas.empty:
+                        st.session_state.plan_rutas = (clave_plan, None)
+                    else:
+                        paradas, rutas = planificar_rutas(cargas, distancias, deposito, capacidad_ruta)
+                        st.session_state.plan_rutas = (clave_plan, (paradas, rutas, distancia_directa(lineas_ruta, distancias, deposito, capacidad_ruta), deposito))
+
+                plan_rutas = plan_vigente('plan_rutas')
+                if plan_rutas is not None:
+                    paradas, rutas, km_directo, deposito_plan = plan_rutas
+                    km_rutas = rutas['Distancia'].sum()
+                    c_m1, c_m2, c_m3, c_m4 = st.columns(4)
+                    c_m1.metric("Rutas", f"{len(rutas):,}", delta=f"{int((rutas['Tipo'] == 'Multiparada').sum()):,} multiparada", delta_color="off")
+                    c_m2.metric("Paradas", f"{len(paradas):,}")
+                    c_m3.metric("Distancia Total", f"{km_rutas:,.0f} km", delta=f"{km_rutas - km_directo:,.0f} km vs. viajes por carril", delta_color="inverse")
+                    c_m4.metric("Ocupación Promedio", f"{rutas['Ocupacion'].mean():.0%}")
+                    if not DISTANCIAS:
+                        st.plotly_chart(figura_cacheada(fig_rutas, paradas, deposito=deposito_plan, tiendas=tiendas_red), use_container_width=True)
+                    st.dataframe(rutas.assign(Ocupacion=rutas['Ocupacion'] * 100), use_container_width=True, hide_index=True, column_config={
+                        "Distancia": st.column_config.NumberColumn(format="%.1f km"),
+                        "Carga_Max_kg": st.column_config.NumberColumn(format="%.0f"),
+                        "Ocupacion": st.column_config.ProgressColumn(min_value=0, max_value=100, format="%.0f%%"),
+                    })
+                    st.dataframe(paradas.round(1), use_container_width=True, hide_index=True)
 
 # === TAB 3: COMPRAS ===
 with tab3:
-    st.markdown("""
-    <div class="guide-box">
-        <div class="guide-title">🛒 Guía Estratégica: Generador de Compras</div>
-        Aquí convertimos las "Sugerencias del Algoritmo" en "Órdenes de Compra" reales.
-        <br>1. Seleccione un proveedor.
-        <br>2. Ajuste las cantidades sugeridas si es necesario.
-        <br>3. Genere el PDF para firma o envíe el email directamente.
-    </div>
-    """, unsafe_allow_html=True)
-    
-    df_compras = df_vista[df_vista['Sugerencia_Compra'] > 0].copy()
-    
-    # Filtro de Proveedor
-    col_filtro_prov, col_info_prov = st.columns([1, 2])
-    
-    with col_filtro_prov:
-        list_prov = sorted(df_compras['Proveedor'].unique())
-        if not list_prov:
-            st.success("No hay necesidades de compra pendientes.")
-            st.stop()
+    if tab_activa(tab3):
+        st.markdown("""
+        <div class="guide-box">
+            <div class="guide-title">🛒 Guía Estratégica: Generador de Compras</div>
+            Aquí convertimos las "Sugerencias del Algoritmo" en "Órdenes de Compra" reales.
+            <br>1. Seleccione un proveedor.
+            <br>2. Ajuste las cantidades sugeridas si es necesario.
+            <br>3. Genere el PDF para firma o envíe el email directamente.
+            <br>4. O genere de una vez las órdenes de todos los proveedores (ZIP con manifiesto).
+        </div>
+        """, unsafe_allow_html=True)
+    
+        df_compras = vista_actual['compras'].copy()
+    
+        # Tope de presupuesto: el optimizador reparte la compra entre todos los proveedores
+        col_pres, col_min = st.columns(2)
+        presupuesto_compras = col_pres.number_input("Presupuesto de compra ($, 0 = sin límite)", min_value=0, value=0, step=1_000_000, key="presupuesto_compras")
+        minimo_compras = col_min.number_input("Pedido mínimo por proveedor ($)", min_value=0, value=MINIMO_PEDIDO_BASE, step=500_000, key="minimo_compras", disabled=presupuesto_compras == 0)
+        if presupuesto_compras > 0 and not df_compras.empty:
+            plan = optimizar_compras(
+                df_compras['Costo_Promedio_UND'].to_numpy(), (df_compras['Precio_Venta'] - df_compras['Costo_Promedio_UND']).to_numpy(),
+                df_compras['Sugerencia_Compra'].to_numpy(), df_compras['Proveedor'].to_numpy(), presupuesto_compras,
+                {p: minimo_compras for p in df_compras['Proveedor'].unique()},
+            )
+            df_compras['Sugerencia_Compra'] = plan['cantidad']
+            df_compras = df_compras[df_compras['Sugerencia_Compra'] > 0]
+            st.caption(f"Plan óptimo: ${plan['gasto']:,.0f} de ${presupuesto_compras:,.0f} → margen recuperado ${plan['valor']:,.0f}. "
+                       f"Cada $1 adicional recupera ${plan['precio_sombra']:.2f}.")
+
+        # Órdenes en lote: Excel + PDF de todos los proveedores de la vista en un solo ZIP
+        if not df_compras.empty:
+            with st.expander("📦 Órdenes de Compra en Lote (todos los proveedores)"):
+                n_prov = df_compras['Proveedor'].nunique()
+                clave_lote = (version_maestro, *clave_vista, presupuesto_compras, minimo_compras)
+                st.caption(f"{len(df_compras):,} líneas de {n_prov} proveedores, sin tope de 20 líneas por orden.")
+                if st.button(f"⚡ Generar las {n_prov} órdenes (Excel + PDF)", type="primary", key="generar_ordenes_lote"):
+                    with st.spinner(f"Generando {n_prov * 2} documentos..."):
+                        st.session_state.ordenes_lote = (clave_lote, *generar_ordenes(df_compras))
+                lote = st.session_state.get('ordenes_lote')
+                if lote and lote[0] == clave_lote:
+                    _, zip_lote, manifiesto = lote
+                    st.dataframe(manifiesto, column_config={"Total": st.column_config.NumberColumn(format="$%d")}, use_container_width=True, hide_index=True)
+                    st.download_button(f"📥 Descargar ZIP ({len(manifiesto)} proveedores)", data=zip_lote, file_name=f"Ordenes_Compra_{datetime.now():%Y%m%d}.zip", mime="application/zip", use_container_width=True)
+    
+        # Filtro de Proveedor
+        col_filtro_prov, col_info_prov = st.columns([1, 2])
+    
+        with col_filtro_prov:
+            list_prov = sorted(df_compras['Proveedor'].unique())
+            if not list_prov:
+                st.success("No hay necesidades de compra pendientes.")
+                st.stop()
             
-        sel_prov = st.selectbox("Seleccionar Proveedor para Orden:", list_prov)
-    
-    # Filtrar datos
-    df_prov = df_compras[df_compras['Proveedor'] == sel_prov].head(20)
-    df_prov['Total_Linea'] = df_prov['Sugerencia_Compra'] * df_prov['Costo_Promedio_UND']
-    
-    with col_info_prov:
-        total_sug = df_prov['Total_Linea'].sum()
-        st.info(f"El sistema sugiere **{len(df_prov)} referencias** para **{sel_prov}** por un valor total de **${total_sug:,.0f}**")
-    
-    # Preparar tabla
-    df_display_compra = df_prov[['SKU', 'Descripcion', 'Stock', 'Sugerencia_Compra', 'Costo_Promedio_UND', 'Total_Linea']]
-    df_display_compra.columns = ['SKU', 'Producto', 'Stock Actual', 'Cant. Sugerida', 'Costo Unit.', 'Total Estimado']
-    df_display_compra['Incluir'] = True # Checkbox por defecto activado
-    
-    st.markdown("##### Detalle de la Orden")
-    edited_compras = st.data_editor(
-        df_display_compra,
-        column_config={
-            "Incluir": st.column_config.CheckboxColumn(required=True),
-            "Cant. Sugerida": st.column_config.NumberColumn(min_value=1, step=1),
-            "Costo Unit.": st.column_config.NumberColumn(format="$%d"),
-            "Total Estimado": st.column_config.ProgressColumn(format="$%d", min_value=0, max_value=int(df_display_compra['Total Estimado'].max()))
-        },
-        use_container_width=True,
-        hide_index=True,
-        key="editor_compra_principal"
-    )
+            sel_prov = st.selectbox("Seleccionar Proveedor para Orden:", list_prov)
+    
+        # Filtrar datos: las 20 líneas de mayor valor del proveedor (selección parcial)
+        df_compras['Total_Linea'] = df_compras['Sugerencia_Compra'] * df_compras['Costo_Promedio_UND']
+        df_prov = top_n(df_compras[df_compras['Proveedor'] == sel_prov], 'Total_Linea', 20)
+    
+        with col_info_prov:
+            total_sug = df_prov['Total_Linea'].sum()
+            st.info(f"El sistema sugiere **{len(df_prov)} referencias** para **{sel_prov}** por un valor total de **${total_sug:,.0f}**")
+    
+        # Preparar tabla
+        df_display_compra = df_prov[['SKU', 'Descripcion', 'Stock', 'Sugerencia_Compra', 'Costo_Promedio_UND', 'Total_Linea']]
+        df_display_compra.columns = ['SKU', 'Producto', 'Stock Actual', 'Cant. Sugerida', 'Costo Unit.', 'Total Estimado']
+        df_display_compra['Incluir'] = True # Checkbox por defecto activado
+    
+        st.markdown("##### Detalle de la Orden")
+        edited_compras = st.data_editor(
+            df_display_compra,
+            column_config={
+                "Incluir": st.column_config.CheckboxColumn(required=True),
+                "Cant. Sugerida": st.column_config.NumberColumn(min_value=1, step=1),
+                "Costo Unit.": st.column_config.NumberColumn(format="$%d"),
+                "Total Estimado": st.column_config.ProgressColumn(format="$%d", min_value=0, max_value=int(df_display_compra['Total Estimado'].max()))
+            },
+            use_container_width=True,
+            hide_index=True,
+            key="editor_compra_principal"
+        )
     
-    seleccionados_compra = edited_compras[edited_compras['Incluir']]
+        seleccionados_compra = edited_compras[edited_compras['Incluir']]
     
-    st.markdown("---")
+        st.markdown("---")
     
-    if not seleccionados_compra.empty:
-        c_buy1, c_buy2 = st.columns([1, 1])
+        if not seleccionados_compra.empty:
+            c_buy1, c_buy2 = st.columns([1, 1])
         
-        with c_buy1:
-            total_oc = (seleccionados_compra['Cant. Sugerida'] * seleccionados_compra['Costo Unit.']).sum()
-            st.subheader(f"Total Orden: **${total_oc:,.0f}**")
-            st.markdown(f"Items Seleccionados: **{len(seleccionados_compra)}**")
+            with c_buy1:
+                total_oc = (seleccionados_compra['Cant. Sugerida'] * seleccionados_compra['Costo Unit.']).sum()
+                st.subheader(f"Total Orden: **${total_oc:,.0f}**")
+                st.markdown(f"Items Seleccionados: **{len(seleccionados_compra)}**")
             
-            if st.button("📧 Enviar Orden al Proveedor", type="primary", use_container_width=True):
-                with st.spinner(f"Enviando correo a pedidos@{sel_prov.lower().replace(' ', '')}.com..."):
-                    time.sleep(1.5)
-                    st.success("✅ Orden enviada exitosamente.")
-                    st.toast("Copia enviada a compras@tuempresa.com", icon="📨")
+                if st.button("📧 Enviar Orden al Proveedor", type="primary", use_container_width=True):
+                    with st.spinner(f"Enviando correo a pedidos@{sel_prov.lower().replace(' ', '')}.com..."):
+                        time.sleep(1.5)
+                        st.success("✅ Orden enviada exitosamente.")
+                        st.toast("Copia enviada a compras@tuempresa.com", icon="📨")
             
-        with c_buy2:
-            st.markdown("#### Descargar Archivos")
-            # Excel
-            excel_oc = generar_excel(seleccionados_compra, "Orden_Compra")
-            st.download_button("📥 Descargar Excel (Formato Proveedor)", data=excel_oc, file_name=f"OC_{sel_prov}.xlsx", use_container_width=True)
+            with c_buy2:
+                st.markdown("#### Descargar Archivos")
+                # Excel
+                excel_oc = generar_excel(seleccionados_compra, "Orden_Compra")
+                st.download_button("📥 Descargar Excel (Formato Proveedor)", data=excel_oc, file_name=f"OC_{sel_prov}.xlsx", use_container_width=True)
             
-            # PDF
-            pdf_oc = generar_pdf(seleccionados_compra, f"ORDEN DE COMPRA - {sel_prov}")
-            st.download_button("📄 Descargar PDF (Formato Firma)", data=pdf_oc, file_name=f"OC_{sel_prov}.pdf", use_container_width=True)
-    else:
-        st.warning("Seleccione al menos un producto para generar la orden.")
+                # PDF
+                pdf_oc = generar_pdf(seleccionados_compra, f"ORDEN DE COMPRA - {sel_prov}")
+                st.download_button("📄 Descargar PDF (Formato Firma)", data=pdf_oc, file_name=f"OC_{sel_prov}.pdf", use_container_width=True)
+        else:
+            st.warning("Seleccione al menos un producto para generar la orden.")
 
 # === TAB 4: TRACKING (TORRE DE CONTROL ACTUALIZADA) ===
 with tab4:
-    st.header("📡 Torre de Control: Orquestación Total de la Cadena")
-    
-    st.markdown("""
-    <div class="guide-box">
-        <div class="guide-title">🚀 Valor Estratégico: Control y Aprendizaje</div>
-        Esta Torre de Control le ofrece visibilidad total sobre **cada movimiento** (compra y traslado). 
-        <br>Al centralizar esta información, la aplicación futura podrá:
-        <ul>
-            <li>**Evaluar Proveedores** en tiempo de entrega y faltantes.</li>
-            <li>**Optimizar Rutas** de traslado.</li>
-            <li>**Recomendar mejores proveedores** basándose en el historial de eficiencia.</li>
-        </ul>
-        **Todo el flujo operativo está bajo control.**
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # 1. FILTROS DE LA TORRE DE CONTROL
-    st.subheader("Filtros de Órdenes")
-    col_f1, col_f2, col_f3, col_f4 = st.columns(4)
-    
-    df_track_work = st.session_state.df_tracking.copy()
-
-    with col_f1:
-        tipo_orden = st.multiselect("Tipo de Orden:", ["Compra", "Traslado"], default=["Compra", "Traslado"])
-        df_track_work = df_track_work[df_track_work['Tipo'].isin(tipo_orden)]
-
-    with col_f2:
-        estados = sorted(df_track_work['Estado'].unique())
-        estado_sel = st.multiselect("Filtrar por Estado:", estados, default=[e for e in estados if 'Pendiente' in e or 'Tránsito' in e or 'Despachado' in e])
-        df_track_work = df_track_work[df_track_work['Estado'].isin(estado_sel)]
+    if tab_activa(tab4):
+        st.header("📡 Torre de Control: Orquestación Total de la Cadena")
+    
+        st.markdown("""
+        <div class="guide-box">
+            <div class="guide-title">🚀 Valor Estratégico: Control y Aprendizaje</div>
+            Esta Torre de Control le ofrece visibilidad total sobre **cada movimiento** (compra y traslado). 
+            <br>Al centralizar esta información, la aplicación futura podrá:
+            <ul>
+                <li>**Evaluar Proveedores** en tiempo de entrega y faltantes.</li>
+                <li>**Optimizar Rutas** de traslado.</li>
+                <li>**Recomendar mejores proveedores** basándose en el historial de eficiencia.</li>
+            </ul>
+            **Todo el flujo operativo está bajo control.**
+        </div>
+        """, unsafe_allow_html=True)
+    
+        # 1. FILTROS DE LA TORRE DE CONTROL
+        st.subheader("Filtros de Órdenes")
+        col_f1, col_f2, col_f3, col_f4 = st.columns(4)
+    
+        df_track_work = st.session_state.df_tracking.copy()
+
+        with col_f1:
+            tipo_orden = st.multiselect("Tipo de Orden:", ["Compra", "Traslado"], default=["Compra", "Traslado"])
+            df_track_work = df_track_work[df_track_work['Tipo'].isin(tipo_orden)]
+
+        with col_f2:
+            estados = sorted(df_track_work['Estado'].unique())
+            estado_sel = st.multiselect("Filtrar por Estado:", estados, default=[e for e in estados if 'Pendiente' in e or 'Tránsito' in e or 'Despachado' in e])
+            df_track_work = df_track_work[df_track_work['Estado'].isin(estado_sel)]
         
-    with col_f3:
-        proveedores_list = sorted(df_track_work[df_track_work['Tipo'] == 'Compra']['Tercero'].unique())
-        tercero_sel = st.multiselect("Proveedor / Ruta:", proveedores_list, default=proveedores_list)
-        # Aseguramos incluir las rutas de traslado si se seleccionó ese tipo
-        tercero_sel.extend(df_track_work[df_track_work['Tipo'] == 'Traslado']['Tercero'].unique())
-        df_track_work = df_track_work[df_track_work['Tercero'].isin(tercero_sel)]
-
-    with col_f4:
-        # Filtro de fecha de creación (rango)
-        min_date = df_track_work['Fecha_Creacion'].min().date() if not df_track_work.empty else datetime.now().date() - timedelta(days=30)
-        max_date = df_track_work['Fecha_Creacion'].max().date() if not df_track_work.empty else datetime.now().date()
-        date_range = st.date_input("Rango de Creación:", [min_date, max_date], max_value=datetime.now().date())
+        with col_f3:
+            proveedores_list = sorted(df_track_work[df_track_work['Tipo'] == 'Compra']['Tercero'].unique())
+            tercero_sel = st.multiselect("Proveedor / Ruta:", proveedores_list, default=proveedores_list)
+            # Aseguramos incluir las rutas de traslado si se seleccionó ese tipo
+            tercero_sel.extend(df_track_work[df_track_work['Tipo'] == 'Traslado']['Tercero'].unique())
+            df_track_work = df_track_work[df_track_work['Tercero'].isin(tercero_sel)]
+
+        with col_f4:
+            # Filtro de fecha de creación (rango)
+            min_date = df_track_work['Fecha_Creacion'].min().date() if not df_track_work.empty else datetime.now().date() - timedelta(days=30)
+            max_date = df_track_work['Fecha_Creacion'].max().date() if not df_track_work.empty else datetime.now().date()
+            date_range = st.date_input("Rango de Creación:", [min_date, max_date], max_value=datetime.now().date())
         
-        if len(date_range) == 2:
-            start_date = pd.to_datetime(date_range[0])
-            end_date = pd.to_datetime(date_range[1]) + timedelta(days=1) # Incluir el final del día
-            df_track_work = df_track_work[
-                (df_track_work['Fecha_Creacion'] >= start_date) & 
-                (df_track_work['Fecha_Creacion'] < end_date)
-            ]
-
-    st.markdown("---")
-    
-    # 2. TABLA DE GESTIÓN INTERACTIVA
-    st.subheader("Gestión de Órdenes Pendientes y en Curso")
-    
-    # Preparamos la tabla para el Data Editor
-    df_display_track = df_track_work.copy()
-    
-    # Formateo de columnas
-    df_display_track['Valor_Total_Fmt'] = df_display_track.apply(lambda x: f"${x['Valor_Total']:,.0f}" if x['Tipo'] == 'Compra' else 'N/A', axis=1)
-    df_display_track = df_display_track.sort_values(by='Fecha_Creacion', ascending=False)
-    
-    # Seleccionamos y renombramos columnas para la vista
-    df_display_track = df_display_track[[
-        'ID_Orden', 'Tipo', 'Fecha_Creacion', 'Tercero', 'Portafolio', 
-        'Estado', 'Fecha_Estimada_Llegada', 'Valor_Total_Fmt', 'Comentario'
-    ]]
-    df_display_track.columns = [
-        'ID', 'Tipo', 'Creada', 'Tercero/Ruta', 'Portafolio', 
-        'Estado Actual', 'Llegada Est.', 'Valor (Compra)', 'Notas'
-    ]
+            if len(date_range) == 2:
+                start_date = pd.to_datetime(date_range[0])
+                end_date = pd.to_datetime(date_range[1]) + timedelta(days=1) # Incluir el final del día
+                df_track_work = df_track_work[
+                    (df_track_work['Fecha_Creacion'] >= start_date) & 
+                    (df_track_work['Fecha_Creacion'] < end_date)
+                ]
 
+        st.markdown("---")
     
-    if df_display_track.empty:
-        st.warning("No hay órdenes que coincidan con los filtros seleccionados.")
-    else:
-        # Lógica de colores para los estados
-        def get_color_style(estado):
-            if 'Recibido' in estado: return 'background-color: #E8F8F5; color: #008000; font-weight: bold;' # Verde claro
-            if 'Tránsito' in estado: return 'background-color: #FFF9E8; color: #FFA500; font-weight: bold;' # Amarillo claro
-            if 'Despachado' in estado: return 'background-color: #E8F4FD; color: #2E86C1; font-weight: bold;' # Azul claro
-            if 'Pendiente' in estado: return 'background-color: #F8F8F8; color: #555555;' # Gris claro
-            if 'Cancelada' in estado or 'Rechazada' in estado: return 'background-color: #F9EBEA; color: #FF0000; font-weight: bold;' # Rojo claro
-            return ''
-
-        # Aplicamos el estilo de color (requiere una función de formato CSS en el dataframe)
-        st.dataframe(
-            df_display_track.style.applymap(get_color_style, subset=['Estado Actual']),
-            use_container_width=True,
-            hide_index=True,
-            column_config={
-                'ID': st.column_config.TextColumn("ID", width="small"),
-                'Tipo': st.column_config.TextColumn("Tipo", width="small"),
-                'Estado Actual': st.column_config.TextColumn("Estado Actual", width="medium"),
-                'Llegada Est.': st.column_config.DateColumn("Llegada Est.", format="YYYY-MM-DD", width="small"),
-                'Valor (Compra)': st.column_config.TextColumn("Valor (Compra)", width="small"),
-                'Notas': st.column_config.TextColumn("Notas", width="medium")
-            }
-        )
+        # 2. TABLA DE GESTIÓN INTERACTIVA
+        st.subheader("Gestión de Órdenes Pendientes y en Curso")
+    
+        # Preparamos la tabla para el Data Editor
+        df_display_track = df_track_work.copy()
+    
+        # Formateo de columnas
+        df_display_track['Valor_Total_Fmt'] = df_display_track.apply(lambda x: f"${x['Valor_Total']:,.0f}" if x['Tipo'] == 'Compra' else 'N/A', axis=1)
+        df_display_track = df_display_track.sort_values(by='Fecha_Creacion', ascending=False)
+    
+        # Seleccionamos y renombramos columnas para la vista
+        df_display_track = df_display_track[[
+            'ID_Orden', 'Tipo', 'Fecha_Creacion', 'Tercero', 'Portafolio', 
+            'Estado', 'Fecha_Estimada_Llegada', 'Valor_Total_Fmt', 'Comentario'
+        ]]
+        df_display_track.columns = [
+            'ID', 'Tipo', 'Creada', 'Tercero/Ruta', 'Portafolio', 
+            'Estado Actual', 'Llegada Est.', 'Valor (Compra)', 'Notas'
+        ]
+
+    
+        if df_display_track.empty:
+            st.warning("No hay órdenes que coincidan con los filtros seleccionados.")
+        else:
+            # Lógica de colores para los estados
+            def get_color_style(estado):
+                if 'Recibido' in estado: return 'background-color: #E8F8F5; color: #008000; font-weight: bold;' # Verde claro
+                if 'Tránsito' in estado: return 'background-color: #FFF9E8; color: #FFA500; font-weight: bold;' # Amarillo claro
+                if 'Despachado' in estado: return 'background-color: #E8F4FD; color: #2E86C1; font-weight: bold;' # Azul claro
+                if 'Pendiente' in estado: return 'background-color: #F8F8F8; color: #555555;' # Gris claro
+                if 'Cancelada' in estado or 'Rechazada' in estado: return 'background-color: #F9EBEA; color: #FF0000; font-weight: bold;' # Rojo claro
+                return ''
+
+            # Aplicamos el estilo de color (requiere una función de formato CSS en el dataframe)
+            st.dataframe(
+                df_display_track.style.map(get_color_style, subset=['Estado Actual']),
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    'ID': st.column_config.TextColumn("ID", width="small"),
+                    'Tipo': st.column_config.TextColumn("Tipo", width="small"),
+                    'Estado Actual': st.column_config.TextColumn("Estado Actual", width="medium"),
+                    'Llegada Est.': st.column_config.DateColumn("Llegada Est.", format="YYYY-MM-DD", width="small"),
+                    'Valor (Compra)': st.column_config.TextColumn("Valor (Compra)", width="small"),
+                    'Notas': st.column_config.TextColumn("Notas", width="medium")
+                }
+            )
 
-    st.markdown("---")
+        st.markdown("---")
     
-    # 3. ACCIONES Y MÉTRICAS DE APRENDIZAJE
-    st.subheader("Métricas Operativas Clave")
+        # 3. ACCIONES Y MÉTRICAS DE APRENDIZAJE
+        st.subheader("Métricas Operativas Clave")
     
-    # Simulación de KPIs de la Torre de Control
-    df_compra = st.session_state.df_tracking[st.session_state.df_tracking['Tipo'] == 'Compra']
-    oc_recibidas = len(df_compra[df_compra['Estado'].str.contains('Recibido')])
-    oc_totales = len(df_compra)
-    ot_recibidas = len(st.session_state.df_tracking[st.session_state.df_tracking['Tipo'] == 'Traslado']['Estado'].str.contains('Recibido'))
-    ot_totales = len(st.session_state.df_tracking[st.session_state.df_tracking['Tipo'] == 'Traslado'])
+        # Simulación de KPIs de la Torre de Control
+        df_compra = st.session_state.df_tracking[st.session_state.df_tracking['Tipo'] == 'Compra']
+        oc_recibidas = len(df_compra[df_compra['Estado'].str.contains('Recibido')])
+        oc_totales = len(df_compra)
+        ot_recibidas = len(st.session_state.df_tracking[st.session_state.df_tracking['Tipo'] == 'Traslado']['Estado'].str.contains('Recibido'))
+        ot_totales = len(st.session_state.df_tracking[st.session_state.df_tracking['Tipo'] == 'Traslado'])
     
-    col_kpi_t1, col_kpi_t2, col_kpi_t3 = st.columns(3)
+        col_kpi_t1, col_kpi_t2, col_kpi_t3 = st.columns(3)
     
-    with col_kpi_t1:
-        tasa_cumplimiento = (oc_recibidas / oc_totales) * 100 if oc_totales > 0 else 0
-        st.metric(label="Cumplimiento OC (Recibidas/Total)", value=f"{tasa_cumplimiento:,.1f}%", delta_color="normal", delta=f"{oc_recibidas}/{oc_totales}")
-        st.caption("Mide la efectividad del proceso de compra.")
+        with col_kpi_t1:
+            tasa_cumplimiento = (oc_recibidas / oc_totales) * 100 if oc_totales > 0 else 0
+            st.metric(label="Cumplimiento OC (Recibidas/Total)", value=f"{tasa_cumplimiento:,.1f}%", delta_color="normal", delta=f"{oc_recibidas}/{oc_totales}")
+            st.caption("Mide la efectividad del proceso de compra.")
 
-    with col_kpi_t2:
-        # Tiempo promedio de entrega (Simulación)
-        tiempo_promedio = random.randint(18, 25) # Días
-        st.metric(label="Lead Time Prom. Proveedores", value=f"{tiempo_promedio} días", delta_color="inverse", delta=f"-2 días (vs mes ant.)")
-        st.caption("Métrica crítica para el reabastecimiento.")
+        with col_kpi_t2:
+            # Tiempo promedio de entrega (Simulación)
+            tiempo_promedio = random.randint(18, 25) # Días
+            st.metric(label="Lead Time Prom. Proveedores", value=f"{tiempo_promedio} días", delta_color="inverse", delta=f"-2 días (vs mes ant.)")
+            st.caption("Métrica crítica para el reabastecimiento.")
 
-    with col_kpi_t3:
-        # Traslados completados
-        tasa_traslado = (ot_recibidas / ot_totales) * 100 if ot_totales > 0 else 0
-        st.metric(label="Efectividad de Traslados", value=f"{tasa_traslado:,.1f}%", delta_color="normal", delta=f"{ot_recibidas}/{ot_totales}")
-        st.caption("Indica la eficiencia en la redistribución interna.")
+        with col_kpi_t3:
+            # Traslados completados
+            tasa_traslado = (ot_recibidas / ot_totales) * 100 if ot_totales > 0 else 0
+            st.metric(label="Efectividad de Traslados", value=f"{tasa_traslado:,.1f}%", delta_color="normal", delta=f"{ot_recibidas}/{ot_totales}")
+            st.caption("Indica la eficiencia en la redistribución interna.")
 
-    st.markdown("#### Tablero de Aprendizaje")
-    st.warning("🤖 En una implementación completa, esta sección mostraría un ranking de proveedores basado en **Lead Time**, **Faltantes** (inventario) y **Costo** (OC), permitiendo a NEXUS PRO optimizar continuamente las decisiones de compra.")
+        st.markdown("#### Tablero de Aprendizaje")
+        st.warning("🤖 En una implementación completa, esta sección mostraría un ranking de proveedores basado en **Lead Time**, **Faltantes** (inventario) y **Costo** (OC), permitiendo a NEXUS PRO optimizar continuamente las decisiones de compra.")
     
-    if st.button("Simular Actualización de Estados de Órdenes", use_container_width=True):
-        st.toast("Simulando una actualización de estado en las órdenes...", icon="📡")
+        if st.button("Simular Actualización de Estados de Órdenes", use_container_width=True):
+            st.toast("Simulando una actualización de estado en las órdenes...", icon="📡")
         
-        # Lógica de gestión simulada: mover 1 orden pendiente a 'Despachado'
-        df_pending = st.session_state.df_tracking[st.session_state.df_tracking['Estado'].str.contains('Pendiente Aprobación')]
-        if not df_pending.empty:
-            idx = df_pending.index[0]
-            st.session_state.df_tracking.loc[idx, 'Estado'] = "🔵 Despachado (En Ruta)"
-            st.session_state.df_tracking.loc[idx, 'Fecha_Estimada_Llegada'] = (datetime.now() + timedelta(days=random.randint(5, 15))).strftime('%Y-%m-%d')
-            st.success(f"La orden **{st.session_state.df_tracking.loc[idx, 'ID_Orden']}** ha pasado a **Despachado**.")
-            st.rerun()
-        else:
-            st.info("No hay órdenes pendientes para simular el avance de estado.")
+            # Lógica de gestión simulada: mover 1 orden pendiente a 'Despachado'
+            df_pending = st.session_state.df_tracking[st.session_state.df_tracking['Estado'].str.contains('Pendiente Aprobación')]
+            if not df_pending.empty:
+                idx = df_pending.index[0]
+                st.session_state.df_tracking.loc[idx, 'Estado'] = "🔵 Despachado (En Ruta)"
+                st.session_state.df_tracking.loc[idx, 'Fecha_Estimada_Llegada'] = (datetime.now() + timedelta(days=random.randint(5, 15))).strftime('%Y-%m-%d')
+                st.success(f"La orden **{st.session_state.df_tracking.loc[idx, 'ID_Orden']}** ha pasado a **Despachado**.")
+                st.rerun()
+            else:
+                st.info("No hay órdenes pendientes para simular el avance de estado.")
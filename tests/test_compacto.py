@@ -0,0 +1,65 @@
+"""Catálogo compacto: mismas columnas y valores que el original, tipos reducidos y vistas filtradas."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from nexus.cache_vistas import CacheVistas, clave_filtros
+from nexus.clasificador import ESTADOS
+from nexus.compacto import (
+    COLUMNAS_CATEGORICAS, COLUMNAS_ENTERAS, COLUMNAS_FLOAT32, compactar_catalogo, filtrar_catalogo,
+)
+from nexus.generador import generar_catalogo
+
+
+@pytest.fixture(scope='module')
+def catalogos():
+    crudo = generar_catalogo(2_000, rng=np.random.default_rng(11))
+    return crudo, compactar_catalogo(crudo)
+
+
+def test_ida_y_vuelta_al_catalogo_original(catalogos):
+    crudo, compacto = catalogos
+    assert list(compacto.columns) == list(crudo.columns)
+    assert compacto.index.equals(crudo.index)
+
+    # De vuelta a los tipos originales, los valores son los mismos (float32 con su precisión)
+    restaurado = compacto.astype(crudo.dtypes.to_dict())
+    assert (restaurado.dtypes == crudo.dtypes).all()
+    exactas = [c for c in crudo.columns if c not in COLUMNAS_FLOAT32]
+    pd.testing.assert_frame_equal(restaurado[exactas], crudo[exactas])
+    pd.testing.assert_frame_equal(restaurado[COLUMNAS_FLOAT32], crudo[COLUMNAS_FLOAT32], rtol=1e-6)
+
+
+def test_tipos_compactos(catalogos):
+    crudo, compacto = catalogos
+    for col in COLUMNAS_CATEGORICAS:
+        assert isinstance(compacto[col].dtype, pd.CategoricalDtype)
+    assert list(compacto['Estado'].cat.categories) == list(ESTADOS) and compacto['Estado'].cat.ordered
+    assert (compacto[COLUMNAS_FLOAT32].dtypes == np.float32).all()
+    for col in COLUMNAS_ENTERAS:
+        assert compacto[col].dtype.kind in 'iu' and compacto[col].dtype.itemsize <= crudo[col].dtype.itemsize
+    # Los montos se quedan en float64
+    assert compacto['Valor_Inventario'].dtype == np.float64 and compacto['Utilidad_Mensual'].dtype == np.float64
+    assert compacto.memory_usage(deep=True).sum() < crudo.memory_usage(deep=True).sum()
+
+
+def test_vistas_filtradas_iguales_al_filtro_por_filas(catalogos):
+    crudo, compacto = catalogos
+    categorias = list(compacto['Categoria'].cat.categories)
+    proveedores = list(compacto['Proveedor'].cat.categories)
+    assert filtrar_catalogo(compacto) is compacto
+
+    cache = CacheVistas(max_entradas=2)
+    selecciones = [(categorias[:2], None), (None, proveedores[::2]), (categorias[1:3], proveedores[:1] + ['Otro'])]
+    for categorias_sel, proveedores_sel in selecciones * 2:
+        esperado = crudo[crudo['Categoria'].isin(categorias_sel or categorias) & crudo['Proveedor'].isin(proveedores_sel or proveedores)]
+        clave = clave_filtros(categorias_sel, proveedores_sel, categorias, proveedores)
+        vista = cache.obtener(clave, lambda: filtrar_catalogo(compacto, categorias_sel, proveedores_sel))
+        assert vista.index.equals(esperado.index)
+        assert (vista['SKU'].astype(object) == esperado['SKU']).all()
+    assert len(cache) == 2 and cache.estadisticas()['misses'] == 6  # Tres vistas rotando en una LRU de dos
+    assert cache.obtener(clave, lambda: None) is vista and cache.hits == 1
+
+    # El orden de selección no cambia la clave y "todas" equivale a sin filtro
+    assert clave_filtros(categorias[:2][::-1], None, categorias) == clave_filtros(categorias[:2], [], categorias)
+    assert clave_filtros(categorias, proveedores, categorias, proveedores) == ((), ())
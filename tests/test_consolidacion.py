@@ -0,0 +1,68 @@
+"""Consolidación de envíos: capacidad por camión, cada línea asignada una sola vez y carriles sin mezclar."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from nexus.consolidacion import consolidar_envios, dividir_lineas, minimo_camiones
+
+TIENDAS = ['Sede Principal', 'Tienda 1', 'Tienda 2', 'Tienda 3']
+
+
+def _lineas(rng, n=200):
+    origen = rng.integers(0, len(TIENDAS), n)
+    destino = (origen + rng.integers(1, len(TIENDAS), n)) % len(TIENDAS)
+    return pd.DataFrame({
+        'Origen': np.array(TIENDAS)[origen],
+        'Destino': np.array(TIENDAS)[destino],
+        'Cantidad': rng.integers(1, 300, n),
+        'Peso_Articulo': np.round(rng.uniform(0.2, 40.0, n), 2),
+    }, index=pd.Index(rng.permutation(n) + 1000))
+
+
+def _verificar(lineas, capacidad):
+    tramos, envios = consolidar_envios(lineas, capacidad)
+
+    # Cada línea aparece completa: sus tramos suman la cantidad y el peso original
+    cantidad = tramos.groupby(level=0)['Cantidad'].sum().reindex(lineas.index)
+    assert (cantidad == lineas['Cantidad']).all()
+    assert np.allclose(tramos.groupby(level=0)['Peso_kg'].sum().reindex(lineas.index), lineas['Cantidad'] * lineas['Peso_Articulo'])
+    assert tramos['Envio'].notna().all() and set(tramos['Envio']) == set(envios['Envio'])
+
+    # Ningún camión pasa la capacidad, salvo una unidad sola más pesada que el camión
+    peso = tramos.groupby('Envio')['Peso_kg'].sum()
+    sobrepeso = tramos.groupby('Envio')['Sobrepeso'].any()
+    assert (peso[~sobrepeso] <= capacidad + 1e-6).all()
+    assert (tramos[tramos['Sobrepeso']]['Cantidad'] == 1).all()
+    assert (tramos[tramos['Sobrepeso']].groupby('Envio').size() == 1).all()
+
+    # Un envío no mezcla carriles y el resumen coincide con sus tramos
+    assert (tramos.groupby('Envio')[['Origen', 'Destino']].nunique() == 1).all().all()
+    assert np.allclose(envios.set_index('Envio')['Peso_kg'].reindex(peso.index), peso)
+    normales = envios[~envios['Envio'].map(sobrepeso)]  # La cota no aplica a unidades que no caben
+    assert len(normales) >= minimo_camiones(normales, capacidad)
+    return tramos, envios
+
+
+@pytest.mark.parametrize("capacidad", [500, 1_500, 3_500])
+def test_capacidad_y_lineas_asignadas_una_vez(capacidad):
+    _verificar(_lineas(np.random.default_rng(capacidad)), capacidad)
+
+
+def test_lineas_mas_pesadas_que_el_camion():
+    lineas = pd.DataFrame({
+        'Origen': ['Tienda 1', 'Tienda 1', 'Tienda 2'],
+        'Destino': ['Tienda 2', 'Tienda 2', 'Tienda 3'],
+        'Cantidad': [25, 3, 2],
+        'Peso_Articulo': [100.0, 50.0, 900.0],  # 2500 kg en camiones de 800; 900 kg no cabe ni solo
+    })
+    tramos, envios = _verificar(lineas, 800)
+    assert tramos['Sobrepeso'].sum() == 2
+    assert len(envios[envios['Origen'] == 'Tienda 1']) == minimo_camiones(envios[envios['Origen'] == 'Tienda 1'], 800)
+
+
+def test_dividir_lineas_conserva_unidades():
+    lineas = _lineas(np.random.default_rng(0), 50)
+    tramos = dividir_lineas(lineas, 1_000)
+    assert tramos['Cantidad'].sum() == lineas['Cantidad'].sum()
+    assert (tramos['Cantidad'] > 0).all()
+    assert (tramos.loc[~tramos['Sobrepeso'], 'Peso_kg'] <= 1_000).all()
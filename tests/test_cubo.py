@@ -0,0 +1,68 @@
+"""Cubo Categoria x Proveedor x Estado: agregados y KPIs iguales al groupby sobre las filas."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from nexus.compacto import compactar_catalogo, filtrar_catalogo
+from nexus.cubo import MEDIDAS_SUMA, agregar_cubo, construir_cubo, kpis_cubo, seleccionar_cubo
+from nexus.generador import generar_catalogo
+
+
+@pytest.fixture(scope='module')
+def catalogo():
+    return compactar_catalogo(generar_catalogo(3_000, rng=np.random.default_rng(5)))
+
+
+def _filtros(catalogo):
+    categorias = list(catalogo['Categoria'].cat.categories)
+    proveedores = list(catalogo['Proveedor'].cat.categories)
+    return [
+        (None, None),
+        (categorias[:2], None),
+        (None, proveedores[1:2]),
+        (categorias[::-1][:3], proveedores[:2] + ['Proveedor Inexistente']),
+    ]
+
+
+def _groupby(filas, por):
+    agregado = filas.groupby(por, observed=True)[MEDIDAS_SUMA].sum()
+    agregado.insert(0, 'Conteo', filas.groupby(por, observed=True).size())
+    return agregado
+
+
+@pytest.mark.parametrize("por", ['Categoria', 'Proveedor', 'Estado', ['Proveedor', 'Estado'], ['Estado', 'Categoria']])
+def test_agregados_iguales_al_groupby(catalogo, por):
+    cubo = construir_cubo(catalogo)
+    for categorias, proveedores in _filtros(catalogo):
+        filas = filtrar_catalogo(catalogo, categorias, proveedores)
+        esperado = _groupby(filas, por)
+        obtenido = agregar_cubo(seleccionar_cubo(cubo, categorias, proveedores), por).set_index(por)
+        obtenido = obtenido.reindex(esperado.index)
+        assert obtenido['Conteo'].tolist() == esperado['Conteo'].tolist()
+        for medida in MEDIDAS_SUMA:
+            np.testing.assert_allclose(obtenido[medida], esperado[medida].astype(np.float64), rtol=1e-6, err_msg=medida)
+        assert len(agregar_cubo(seleccionar_cubo(cubo, categorias, proveedores), por)) == len(esperado)
+
+
+def test_kpis_iguales_al_calculo_por_filas(catalogo):
+    cubo = construir_cubo(catalogo)
+    for categorias, proveedores in _filtros(catalogo):
+        filas = filtrar_catalogo(catalogo, categorias, proveedores)
+        kpis = kpis_cubo(seleccionar_cubo(cubo, categorias, proveedores))
+        quiebres = filas[filas['Estado'] == "🔴 Quiebre"]
+        excedentes = filas[filas['Estado'] == "🔵 Excedente"]
+        assert kpis['n_skus'] == len(filas)
+        assert kpis['n_quiebres'] == len(quiebres) and kpis['n_excedentes'] == len(excedentes)
+        assert kpis['total_inv'] == pytest.approx(filas['Valor_Inventario'].sum())
+        assert kpis['total_utilidad'] == pytest.approx(filas['Utilidad_Mensual'].sum())
+        assert kpis['utilidad_quiebres'] == pytest.approx(quiebres['Utilidad_Mensual'].sum())
+        assert kpis['valor_excedentes'] == pytest.approx(excedentes['Valor_Inventario'].sum())
+        dias = filas.loc[filas['Demanda_Mes'] > 0, 'Dias_Inventario'].astype(np.float64).mean()
+        assert kpis['dias_inv_avg'] == pytest.approx(dias, rel=1e-6)
+
+
+def test_seleccion_vacia(catalogo):
+    cubo = seleccionar_cubo(construir_cubo(catalogo), ['Categoria Inexistente'], None)
+    assert kpis_cubo(cubo)['n_skus'] == 0
+    assert agregar_cubo(cubo, 'Proveedor').empty
+    assert isinstance(agregar_cubo(cubo, ['Proveedor', 'Estado']), pd.DataFrame)
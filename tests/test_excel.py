@@ -0,0 +1,78 @@
+"""Excel en streaming: encabezados, celdas numéricas nativas (no texto) y hojas de continuación."""
+import io
+
+import numpy as np
+import openpyxl
+import pandas as pd
+import pytest
+
+from nexus import excel
+from nexus.excel import FORMATO_DECIMAL, FORMATO_ENTERO, FORMATO_MONEDA, escribir_excel, lotes_de
+
+
+def _orden(n=250):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'SKU': [f'SKU-{i}' for i in range(n)],
+        'Cantidad': rng.integers(1, 500, n),
+        'Costo Unit.': rng.uniform(1_000, 90_000, n).round(0),
+        'Peso_kg': rng.uniform(0.1, 30, n),
+        'Urgente': rng.random(n) < 0.5,
+        'Pendiente': pd.array(rng.integers(0, 9, n), dtype='Int64'),
+    })
+    df.loc[3, 'Peso_kg'] = np.nan
+    df.loc[4, 'Pendiente'] = pd.NA
+    df.loc[5, 'SKU'] = None
+    return df
+
+
+def _filas(libro, hoja):
+    return list(libro[hoja].iter_rows(values_only=True))
+
+
+def test_celdas_numericas_y_encabezado():
+    df = _orden()
+    libro = openpyxl.load_workbook(io.BytesIO(escribir_excel(lotes_de(df, 70), hoja='Orden')))
+    ws = libro['Orden']
+    filas = _filas(libro, 'Orden')
+    assert list(filas[0]) == list(df.columns)
+    assert ws.freeze_panes == 'A2' and ws.auto_filter.ref == f'A1:F{len(df) + 1}'
+    assert len(filas) == len(df) + 1
+
+    for c, columna in enumerate(df.columns, start=1):
+        celdas = [ws.cell(row=f, column=c) for f in range(2, len(df) + 2)]
+        esperado = df[columna].tolist()
+        if columna == 'SKU':
+            assert all(celda.data_type == 's' for k, celda in enumerate(celdas) if k != 5)
+            assert celdas[5].value is None
+            continue
+        for k, celda in enumerate(celdas):
+            if pd.isna(esperado[k]):
+                assert celda.value is None, (columna, k)
+            elif columna == 'Urgente':
+                assert celda.data_type == 'b' and celda.value == esperado[k]
+            else:
+                assert celda.data_type == 'n' and not isinstance(celda.value, str), (columna, k)
+                assert celda.value == pytest.approx(float(esperado[k]))
+
+    formatos = {columna: ws.cell(row=2, column=c).number_format for c, columna in enumerate(df.columns, start=1)}
+    assert formatos['Cantidad'] == FORMATO_ENTERO
+    assert formatos['Costo Unit.'] == FORMATO_MONEDA
+    assert formatos['Peso_kg'] == FORMATO_DECIMAL
+
+
+def test_hojas_de_continuacion(monkeypatch):
+    monkeypatch.setattr(excel, 'MAX_FILAS_HOJA', 100)
+    df = _orden(250)
+    libro = openpyxl.load_workbook(io.BytesIO(escribir_excel(lotes_de(df, 60), hoja='Orden')))
+    assert libro.sheetnames == ['Orden', 'Orden (2)', 'Orden (3)']
+    hojas = [_filas(libro, h) for h in libro.sheetnames]
+    assert all(list(h[0]) == list(df.columns) for h in hojas)
+    assert [len(h) - 1 for h in hojas] == [100, 100, 50]
+    cantidades = [fila[1] for h in hojas for fila in h[1:]]
+    assert cantidades == df['Cantidad'].tolist()
+
+
+def test_sin_filas():
+    libro = openpyxl.load_workbook(io.BytesIO(escribir_excel(_orden().iloc[:0])))
+    assert _filas(libro, 'Reporte') == [tuple(_orden().columns)]
@@ -0,0 +1,71 @@
+"""Días en quiebre por clave: el estado incremental coincide con el conteo sobre las particiones."""
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from nexus.clasificador import OPTIMO, QUIEBRE
+from nexus.historia import VENTANAS, StoreHistoria
+
+INICIO = date(2024, 1, 1)
+CLAVES = ['A', 'B', 'C']
+
+
+def _snapshot(estados):
+    return pd.DataFrame({
+        'Clave': CLAVES, 'Grupo': 'G', 'Stock': 0, 'Demanda_Mes': 10,
+        'Valor_Inventario': 0.0, 'Estado': np.asarray(estados, dtype=np.int8),
+    })
+
+
+def _esperado(estados_por_dia, hasta):
+    """Conteo directo de días en quiebre en cada ventana que termina en `hasta`."""
+    return {
+        n: sum(
+            (np.asarray(e) == QUIEBRE).astype(int)
+            for d, e in estados_por_dia.items() if hasta - timedelta(days=n - 1) <= d <= hasta
+        )
+        for n in VENTANAS
+    }
+
+
+def _verificar(store, estados_por_dia):
+    estado = store.dias_quiebre().set_index('Clave').reindex(CLAVES, fill_value=0)
+    esperado = _esperado(estados_por_dia, max(estados_por_dia))
+    for n in VENTANAS:
+        assert estado[f'Dias_Quiebre_{n}'].tolist() == list(esperado[n]), n
+
+
+def test_relleno_de_un_dia_pasado(tmp_path):
+    store = StoreHistoria(str(tmp_path))
+    quiebre = [QUIEBRE] * len(CLAVES)
+    dias = {INICIO + timedelta(days=i): quiebre for i in range(40) if i != 5}
+    for d, e in dias.items():
+        store.guardar(d, _snapshot(e))
+    dias[INICIO + timedelta(days=5)] = quiebre  # Relleno del día que faltaba
+    store.guardar(INICIO + timedelta(days=5), _snapshot(quiebre))
+    _verificar(store, dias)
+
+    dias[INICIO + timedelta(days=40)] = quiebre  # Siguiente día en orden
+    store.guardar(INICIO + timedelta(days=40), _snapshot(quiebre))
+    assert store.dias_quiebre().set_index('Clave').loc['A', 'Dias_Quiebre_90'] == 41
+    _verificar(store, dias)
+
+
+def test_orden_aleatorio_con_huecos_y_reescrituras(tmp_path):
+    rng = np.random.default_rng(3)
+    store = StoreHistoria(str(tmp_path))
+    dias = {}
+    candidatos = [INICIO + timedelta(days=int(i)) for i in rng.choice(120, 70, replace=False)]
+    # Mayormente en orden, con algunos rellenos y reescrituras intercalados
+    orden = sorted(candidatos)
+    for k in rng.choice(len(orden), 10, replace=False):
+        orden.append(orden[k])
+    cola = orden[50:]
+    rng.shuffle(cola)
+    orden[50:] = cola
+    for d in orden:
+        estados = np.where(rng.random(len(CLAVES)) < 0.4, QUIEBRE, OPTIMO)
+        dias[d] = estados
+        store.guardar(d, _snapshot(estados))
+        _verificar(store, dias)
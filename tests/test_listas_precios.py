@@ -0,0 +1,91 @@
+"""Importación de listas de precios: diff por lotes contra lo guardado, igual al de la lista completa."""
+import numpy as np
+import openpyxl
+import pytest
+
+from nexus.listas_precios import CAMPOS_OFERTA, StoreOfertas
+
+PROVEEDOR = 'MegaTools'
+
+
+def _lista(ruta, filas):
+    """Libro con título, encabezado en la fila 3 y una fila por (sku, precio, tiempo)."""
+    libro = openpyxl.Workbook()
+    hoja = libro.active
+    hoja.append(['Lista de precios'])
+    hoja.append([])
+    hoja.append(['Código', 'Precio Unitario', 'Días Entrega'])
+    for fila in filas:
+        hoja.append(list(fila))
+    libro.save(ruta)
+    return str(ruta)
+
+
+def _esperado(anterior, filas):
+    """Conteos del diff calculados sobre la lista completa (la última aparición de un SKU gana)."""
+    lista = dict((sku, (precio, tiempo)) for sku, precio, tiempo in filas)
+    return {
+        'nuevas': sum(sku not in anterior for sku in lista),
+        'cambiadas': sum(sku in anterior and anterior[sku] != v for sku, v in lista.items()),
+        'retiradas': sum(sku not in lista for sku in anterior),
+        'sin_cambio': sum(anterior.get(sku) == v for sku, v in lista.items()),
+    }, lista
+
+
+def _guardado(store):
+    df = store.leer(PROVEEDOR)
+    assert df['SKU'].is_unique
+    return {sku: (precio, tiempo) for sku, precio, tiempo in df[['SKU', 'Precio', 'Tiempo']].itertuples(index=False)}
+
+
+@pytest.mark.parametrize("lote", [3, 7, 1000])
+def test_reimportaciones_por_lotes(tmp_path, lote):
+    rng = np.random.default_rng(lote)
+    store = StoreOfertas(str(tmp_path / 'ofertas'))
+    anterior = {}
+    skus = [f'A-{i}' for i in range(40)]
+    for version in range(4):
+        elegidos = rng.choice(skus, 30, replace=False)
+        filas = [(s, float(rng.integers(1, 4) * 100), float(rng.integers(5, 7))) for s in elegidos]
+        filas += [filas[k][:1] + (999.0, 5.0) for k in rng.choice(len(filas), 4, replace=False)]  # SKUs repetidos
+        rng.shuffle(filas)
+        esperado, lista = _esperado(anterior, filas)
+
+        assert store.importar(_lista(tmp_path / f'v{version}.xlsx', filas), PROVEEDOR, lote=lote) == esperado
+        assert _guardado(store) == lista
+        assert store.registro()[PROVEEDOR]['filas'] == len(lista)
+        anterior = lista
+    assert not [p for p in (tmp_path / 'ofertas').iterdir() if p.name.endswith('.tmp')]
+
+
+def test_filas_sin_cambio_conservan_su_fecha(tmp_path):
+    store = StoreOfertas(str(tmp_path))
+    filas = [(f'A-{i}', 100.0, 5.0) for i in range(10)]
+    store.importar(_lista(tmp_path / 'v1.xlsx', filas), PROVEEDOR, lote=4)
+    antes = store.leer(PROVEEDOR).set_index('SKU')['Actualizado']
+
+    filas[2] = ('A-2', 150.0, 5.0)
+    assert store.importar(_lista(tmp_path / 'v2.xlsx', filas), PROVEEDOR, lote=4)['cambiadas'] == 1
+    despues = store.leer(PROVEEDOR).set_index('SKU')
+    assert despues.loc['A-2', 'Precio'] == 150.0 and despues.loc['A-2', 'Actualizado'] > antes['A-2']
+    assert (despues['Actualizado'].drop('A-2') == antes.drop('A-2')).all()
+    assert set(store.tabla().columns) >= set(CAMPOS_OFERTA)
+
+
+def test_lista_sin_filas_validas_no_toca_lo_guardado(tmp_path):
+    store = StoreOfertas(str(tmp_path))
+    store.importar(_lista(tmp_path / 'v1.xlsx', [('A-1', 100.0, 5.0)]), PROVEEDOR)
+    with pytest.raises(ValueError, match="SKU y precio"):
+        store.importar(_lista(tmp_path / 'vacia.xlsx', [('A-1', 0, 5.0)]), PROVEEDOR)
+    assert _guardado(store) == {'A-1': (100.0, 5.0)}
+    assert store.proveedores() == [PROVEEDOR]
+
+
+def test_proveedores_con_el_mismo_archivo(tmp_path):
+    store = StoreOfertas(str(tmp_path))
+    store.importar(_lista(tmp_path / 'a.xlsx', [('A-1', 100.0, 5.0)]), 'Mega-Tools')
+    assert store.ruta_proveedor('Mega Tools') == store.ruta_proveedor('Mega-Tools')
+    with pytest.raises(ValueError, match="Mega-Tools"):
+        store.importar(_lista(tmp_path / 'b.xlsx', [('B-1', 200.0, 5.0)]), 'Mega Tools')
+    assert store.proveedores() == ['Mega-Tools']
+    assert store.tabla().index.tolist() == [('A-1', 'Mega-Tools')]
@@ -0,0 +1,85 @@
+"""Conector Odoo contra el servidor simulado: sincronización incremental, paginación y lectura."""
+import pytest
+
+from nexus.generador import COLUMNAS_LOGISTICA
+from nexus.odoo import ClienteOdoo, StoreParquet, sincronizar
+from nexus.odoo_catalogo import catalogo_estrategia, maestro_logistica
+from nexus.odoo_simulado import ServidorOdooSimulado, modelos_demo
+
+N_PRODUCTOS = 60
+
+
+@pytest.fixture
+def servidor():
+    with ServidorOdooSimulado(modelos_demo(N_PRODUCTOS, n_tiendas=3)) as s:
+        yield s
+
+
+def _sincronizar(servidor, store, **kwargs):
+    with ClienteOdoo(servidor.url, servidor.db, servidor.usuario, servidor.password) as cliente:
+        return {m: r for m, (r, _) in sincronizar(cliente, store, **kwargs).items()}
+
+
+def test_incremental_solo_trae_lo_cambiado(servidor, tmp_path):
+    store = StoreParquet(str(tmp_path))
+    completa = _sincronizar(servidor, store)
+    assert completa['product.product'] == N_PRODUCTOS
+    assert sum(_sincronizar(servidor, store).values()) == 0
+
+    servidor.escribir('product.product', [3, 7, 11], {'list_price': 999.0})
+    incremental = _sincronizar(servidor, store)
+    assert incremental == {m: (3 if m == 'product.product' else 0) for m in completa}
+
+    productos = store.leer('product.product').set_index('id')
+    assert len(productos) == N_PRODUCTOS
+    assert (productos.loc[[3, 7, 11], 'list_price'] == 999.0).all()
+    assert (productos.drop([3, 7, 11])['list_price'] != 999.0).all()
+
+
+def test_paginacion_con_empates_en_write_date(servidor, tmp_path):
+    # modelos_demo escribe todo con el mismo write_date: cada página corta en medio de un empate
+    store = StoreParquet(str(tmp_path))
+    _sincronizar(servidor, store, lote=7)
+    productos = store.leer('product.product')
+    assert len(productos) == N_PRODUCTOS and productos['id'].is_unique
+
+    # Un lote de cambios con la misma marca que cruza varias páginas
+    ids = list(range(2, N_PRODUCTOS, 3))
+    servidor.escribir('product.product', ids, {'weight': 1.5})
+    assert _sincronizar(servidor, store, modelos=['product.product'], lote=4) == {'product.product': len(ids)}
+    productos = store.leer('product.product').set_index('id')
+    assert productos['weight'].eq(1.5).sum() == len(ids) and productos.index.is_unique
+
+
+def test_reconcilia_quants_eliminados(servidor, tmp_path):
+    store = StoreParquet(str(tmp_path))
+    _sincronizar(servidor, store)
+    ids_antes = set(store.leer('stock.quant')['id'])
+    borrados = sorted(ids_antes)[:5]
+    servidor.eliminar('stock.quant', borrados)
+
+    assert _sincronizar(servidor, store, modelos=['stock.quant']) == {'stock.quant': 0}
+    assert set(store.leer('stock.quant')['id']) == ids_antes - set(borrados)
+
+
+@pytest.mark.parametrize("vacios", [
+    ['product.supplierinfo'],
+    ['product.supplierinfo', 'stock.quant', 'stock.move'],
+    list(modelos_demo(1)),
+])
+def test_modelos_vacios(tmp_path, vacios):
+    modelos = modelos_demo(20, n_tiendas=2)
+    for modelo in vacios:
+        modelos[modelo] = []
+    with ServidorOdooSimulado(modelos) as servidor:
+        store = StoreParquet(str(tmp_path))
+        _sincronizar(servidor, store)
+
+    catalogo = catalogo_estrategia(store)
+    maestro = maestro_logistica(store, COLUMNAS_LOGISTICA)
+    n_productos = len(modelos['product.product'])
+    assert len(catalogo) == n_productos
+    assert len(maestro) == n_productos * sum(u['usage'] == 'internal' for u in modelos['stock.location'])
+    if 'product.supplierinfo' in vacios:
+        assert (catalogo['Proveedor'] == 'Sin Proveedor').all()
+        assert (maestro['Proveedor'] == 'Sin Proveedor').all()
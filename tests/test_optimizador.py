@@ -0,0 +1,43 @@
+"""Factibilidad del optimizador de reposición: presupuesto y mínimos por proveedor."""
+import numpy as np
+import pytest
+
+from nexus.optimizador import curva_presupuesto, optimizar_compras
+
+
+def _verificar(plan, costo, cantidad, proveedor, presupuesto, minimos):
+    x = plan['cantidad']
+    assert x.dtype.kind == 'i'
+    assert ((x >= 0) & (x <= np.maximum(cantidad, 0))).all()
+    assert x @ costo <= presupuesto + 1e-6
+    for p, minimo in minimos.items():
+        gasto = float(x[proveedor == p] @ costo[proveedor == p])
+        assert gasto == 0 or gasto >= minimo - 1e-6, (p, gasto, minimo)
+
+
+def test_forzados_que_no_caben():
+    args = ([6, 8, 6, 8], [5, 3, 7, 3], [2, 4, 1, 2], ['A', 'B', 'B', 'A'])
+    minimos = {'A': 16, 'B': 16}
+    plan = optimizar_compras(*args, 19, minimos)
+    _verificar(plan, np.array(args[0], dtype=float), np.array(args[2]), np.array(args[3]), 19, minimos)
+
+
+@pytest.mark.parametrize("semilla", range(300))
+def test_presupuesto_y_minimos_aleatorios(semilla):
+    """Entradas con la forma de la página: pocos proveedores, mínimos del orden del presupuesto."""
+    rng = np.random.default_rng(semilla)
+    n, proveedores = int(rng.integers(1, 40)), np.array(['A', 'B', 'C', 'D', 'E'])
+    costo = rng.integers(1, 20, n).astype(float)
+    valor = rng.integers(0, 10, n).astype(float)
+    cantidad = rng.integers(0, 6, n)
+    proveedor = proveedores[rng.integers(0, int(rng.integers(1, 6)), n)]
+    presupuesto = float(rng.uniform(0, 1.2) * (costo @ cantidad))
+    minimos = {p: float(rng.uniform(0, 0.6) * presupuesto) for p in proveedores}
+
+    plan = optimizar_compras(costo, valor, cantidad, proveedor, presupuesto, minimos)
+    _verificar(plan, costo, cantidad, proveedor, presupuesto, minimos)
+    assert plan['valor'] == pytest.approx(plan['cantidad'] @ valor)
+
+    presupuestos = np.linspace(0, 2 * presupuesto, 5)
+    curva = curva_presupuesto(costo, valor, cantidad, proveedor, presupuestos, minimos)
+    assert len(curva) == len(presupuestos) and (curva['Utilidad_Recuperada'] >= 0).all()
@@ -0,0 +1,71 @@
+"""Tablas PDF paginadas: encabezado repetido en cada página y encabezados saneados medidos bien."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from nexus.pdf import RELLENO_CELDA, TAMANO_FUENTE_TABLA, PDFReport, documento_tabla, tabla_pdf, texto_pdf
+
+pytestmark = pytest.mark.filterwarnings("ignore::DeprecationWarning")  # Fuente 'Arial' -> Helvetica en fpdf2
+
+
+def _dibujar(df):
+    """Dibuja la tabla registrando cada texto (página, y, texto, estilo) y las líneas verticales de la grilla."""
+    pdf = PDFReport()
+    pdf.add_page()
+    textos, verticales = [], []
+    texto, linea = pdf.text, pdf.line
+    pdf.text = lambda x, y, txt='': (textos.append((pdf.page, round(y, 3), txt, pdf.font_style)), texto(x, y, txt))
+    pdf.line = lambda x1, y1, x2, y2: (x1 == x2 and verticales.append((pdf.page, round(x1, 3))), linea(x1, y1, x2, y2))
+    tabla_pdf(pdf, df)
+    return pdf, pd.DataFrame(textos, columns=['Pagina', 'y', 'Texto', 'Estilo']), verticales
+
+
+def _orden(n):
+    rng = np.random.default_rng(1)
+    return pd.DataFrame({
+        'SKU': [f'SKU-{i:05d}' for i in range(n)],
+        'Producto': [f'Producto de prueba {i}' for i in range(n)],
+        'Cantidad': rng.integers(1, 900, n),
+        'Costo Unit.': rng.uniform(1_000, 90_000, n).round(0),
+    })
+
+
+def test_encabezado_en_cada_pagina():
+    df = _orden(400)
+    pdf, textos, _ = _dibujar(df)
+    assert pdf.pages_count > 3
+    for pagina, dibujado in textos.groupby('Pagina'):
+        primera = dibujado[dibujado['y'] == dibujado['y'].min()]
+        assert primera['Texto'].tolist() == list(df.columns), pagina
+        assert (primera['Estilo'] == 'B').all()
+        assert (dibujado.loc[dibujado['y'] > dibujado['y'].min(), 'Estilo'] == '').all()
+    # Cada fila aparece una sola vez, en orden, a lo largo de las páginas
+    assert textos.loc[textos['Texto'].str.startswith('SKU-'), 'Texto'].tolist() == df['SKU'].tolist()
+    assert set(textos['Pagina']) == set(range(1, pdf.pages_count + 1))
+
+
+def test_encabezados_saneados_se_miden_sin_recortar():
+    df = pd.DataFrame({
+        '🚚 Destino': ['A', 'B'],
+        'Descripción del producto 🔧': ['x', 'y'],
+        'Cantidad 📦': [1, 2],
+    })
+    pdf, textos, verticales = _dibujar(df)
+    encabezados = textos[textos['Estilo'] == 'B']['Texto'].tolist()
+    assert encabezados == [texto_pdf(c) for c in df.columns] == ['Destino', 'Descripción del producto', 'Cantidad']
+
+    # Cada encabezado cabe en su columna (bordes = líneas verticales de la grilla)
+    bordes = sorted({x for _, x in verticales})
+    pdf.set_font('Arial', 'B', TAMANO_FUENTE_TABLA)
+    for encabezado, izquierda, derecha in zip(encabezados, bordes[:-1], bordes[1:]):
+        assert pdf.get_string_width(encabezado) <= derecha - izquierda - 2 * RELLENO_CELDA + 1e-6, encabezado
+
+
+def test_documento_con_tabla_vacia():
+    contenido = documento_tabla(_orden(0), "ORDEN DE COMPRA - 🔴 Prueba")
+    assert bytes(contenido[:5]) == b'%PDF-'
+
+
+@pytest.mark.parametrize("n", [1, 37])
+def test_documento_pocas_filas(n):
+    assert bytes(documento_tabla(_orden(n), "ORDEN")[:5]) == b'%PDF-'
@@ -0,0 +1,61 @@
+"""Ruteo multiparada: capacidad a bordo en cada parada, cada tienda una vez y 2-opt que nunca alarga."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from nexus.generador import nombres_tiendas
+from nexus.rutas import (
+    DEPOSITO_BASE, _carga_max, _distancia, _dos_opt, coordenadas_tiendas, matriz_distancias, planificar_rutas,
+)
+
+
+def _red(rng, n_tiendas=25, carga_max=900.0):
+    tiendas = [DEPOSITO_BASE] + [t for t in nombres_tiendas(n_tiendas + 1) if t != DEPOSITO_BASE][:n_tiendas]
+    distancias = matriz_distancias(coordenadas_tiendas(tiendas))
+    cargas = pd.DataFrame({
+        'Entrega_kg': np.round(rng.uniform(0, carga_max, n_tiendas), 1),
+        'Recoge_kg': np.round(rng.uniform(0, carga_max, n_tiendas) * (rng.random(n_tiendas) < 0.5), 1),
+    }, index=tiendas[1:])
+    return cargas, distancias
+
+
+@pytest.mark.parametrize("capacidad, carga_max", [(1_500, 900.0), (3_500, 900.0), (1_000, 2_600.0)])
+def test_capacidad_y_visitas(capacidad, carga_max):
+    cargas, distancias = _red(np.random.default_rng(capacidad), carga_max=carga_max)
+    paradas, rutas = planificar_rutas(cargas, distancias, DEPOSITO_BASE, capacidad, limite_segundos=1.0)
+
+    assert (paradas['Carga_kg'] <= capacidad + 1e-6).all()
+    assert (rutas['Carga_Max_kg'] <= capacidad + 1e-6).all()
+    # La carga al salir (todo lo que se entrega en la ruta) también cabe
+    assert (paradas.groupby('Ruta')['Entrega_kg'].sum() <= capacidad + 1e-6).all()
+
+    # Ninguna ruta repite tienda; entre directas y multiparada se entrega y recoge todo
+    assert not paradas.duplicated(['Ruta', 'Tienda']).any()
+    assert (paradas.groupby('Ruta')['Parada'].apply(lambda p: list(p) == list(range(1, len(p) + 1)))).all()
+    multiparada = paradas[paradas['Ruta'].isin(rutas.loc[rutas['Tipo'] == 'Multiparada', 'Ruta'])]
+    assert multiparada['Tienda'].is_unique
+    totales = paradas.groupby('Tienda')[['Entrega_kg', 'Recoge_kg']].sum().reindex(cargas.index, fill_value=0.0)
+    assert np.allclose(totales, cargas)
+    assert set(paradas['Tienda']) == set(cargas.index)
+
+
+@pytest.mark.parametrize("semilla", range(10))
+def test_dos_opt_nunca_alarga(semilla):
+    rng = np.random.default_rng(semilla)
+    n = 12
+    xy = rng.uniform(-10, 10, (n + 1, 2))
+    d = np.sqrt(((xy[:, None, :] - xy[None, :, :]) ** 2).sum(axis=2))
+    entrega = [0.0] + rng.uniform(0, 100, n).tolist()
+    recoge = [0.0] + rng.uniform(0, 100, n).tolist()
+    ruta = rng.permutation(np.arange(1, n + 1)).tolist()
+    for capacidad in (_carga_max(ruta, entrega, recoge), 10_000.0):
+        mejorada = _dos_opt(ruta, d, entrega, recoge, capacidad)
+        assert sorted(mejorada) == sorted(ruta)
+        assert _distancia(mejorada, d) <= _distancia(ruta, d) + 1e-9
+        assert _carga_max(mejorada, entrega, recoge) <= capacidad + 1e-9
+
+
+def test_sin_cargas():
+    cargas, distancias = _red(np.random.default_rng(0), n_tiendas=3)
+    paradas, rutas = planificar_rutas(cargas.iloc[:0], distancias, DEPOSITO_BASE, 1_500)
+    assert paradas.empty and rutas.empty
@@ -0,0 +1,73 @@
+"""Emparejamiento de traslados: topes por origen y destino, total por SKU y filas sin SKU."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from nexus.generador import generar_red_tiendas
+from nexus.traslados import COLUMNAS_LINEAS, emparejar_traslados, traslado_por_fila
+
+
+def _red_aleatoria(rng, n=300, n_skus=25):
+    """Filas con excedente o necesidad (nunca ambas), SKUs nulos e índice de etiquetas desordenadas."""
+    sku = rng.choice(np.array([f'S-{i}' for i in range(n_skus)] + [None], dtype=object), n)
+    cantidad = rng.integers(0, 40, n)
+    es_origen = rng.random(n) < 0.4
+    return pd.DataFrame({
+        'SKU': sku,
+        'Excedente_Trasladable': np.where(es_origen, cantidad, 0),
+        'Necesidad_Total': np.where(es_origen, 0, cantidad),
+    }, index=pd.Index(rng.permutation(n) * 10 + 7, name='fila'))
+
+
+def _verificar(df, lineas):
+    assert list(lineas.columns) == COLUMNAS_LINEAS
+    assert (lineas['Cantidad'] > 0).all()
+    assert (lineas['Origen'] != lineas['Destino']).all()
+
+    por_origen = lineas.groupby('Origen')['Cantidad'].sum()
+    por_destino = lineas.groupby('Destino')['Cantidad'].sum()
+    assert (por_origen <= df.loc[por_origen.index, 'Excedente_Trasladable']).all()
+    assert (por_destino <= df.loc[por_destino.index, 'Necesidad_Total']).all()
+
+    # Mismo SKU en los dos extremos y, por SKU, se traslada min(oferta, demanda)
+    sku_origen = df.loc[lineas['Origen'], 'SKU'].to_numpy()
+    sku_destino = df.loc[lineas['Destino'], 'SKU'].to_numpy()
+    assert (sku_origen == sku_destino).all()
+    assert not pd.isna(sku_destino).any()
+    totales = df.dropna(subset=['SKU']).groupby('SKU', observed=True)[['Excedente_Trasladable', 'Necesidad_Total']].sum()
+    esperado = np.minimum(totales['Excedente_Trasladable'], totales['Necesidad_Total'])
+    trasladado = lineas['Cantidad'].groupby(sku_destino).sum().reindex(totales.index, fill_value=0)
+    assert (trasladado == esperado).all()
+
+    recibido = traslado_por_fila(df, lineas)
+    assert (recibido <= df['Necesidad_Total'].to_numpy()).all()
+    assert (recibido[df['SKU'].isna().to_numpy()] == 0).all()
+
+
+@pytest.mark.parametrize("semilla", range(5))
+def test_invariantes_red_aleatoria(semilla):
+    df = _red_aleatoria(np.random.default_rng(semilla))
+    _verificar(df, emparejar_traslados(df))
+
+
+def test_invariantes_red_generada():
+    df = generar_red_tiendas(200, 6, np.random.default_rng(0))
+    lineas = emparejar_traslados(df)
+    assert len(lineas)
+    _verificar(df, lineas)
+
+
+def test_filas_sin_sku_no_participan():
+    df = pd.DataFrame({
+        'SKU': ['A', None, 'A', None, 'B'],
+        'Excedente_Trasladable': [10, 50, 0, 0, 5],
+        'Necesidad_Total': [0, 0, 30, 20, 0],
+    })
+    lineas = emparejar_traslados(df)
+    assert lineas.to_dict('records') == [{'Origen': 0, 'Destino': 2, 'Cantidad': 10}]
+
+
+def test_red_sin_traslados():
+    df = pd.DataFrame({'SKU': ['A', 'B'], 'Excedente_Trasladable': [0, 4], 'Necesidad_Total': [3, 0]})
+    assert emparejar_traslados(df).empty
+    assert emparejar_traslados(df.iloc[:0]).empty